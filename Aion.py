@@ -1,13 +1,15 @@
 import openai
 import os
 import json
-import inspect
 import pathlib
-from typing import Callable, Dict, Any, get_type_hints, List
+import re
+from typing import Dict, Any, Iterator, List, Tuple
 from dotenv import load_dotenv
-import tools  # Your custom tools module
+from tool_registry import tool_registry  # schemas of tools.py; imported on the first tool call
+from journal import atomic_write_json
+from chat_stream import ReplyFormatter, completion_events, format_reply, plain_reply
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 
 # Load environment variables
 load_dotenv(override=True)
@@ -34,9 +36,7 @@ class ChatHistory:
     
     def save_history(self):
         try:
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.messages, f, ensure_ascii=False, indent=2)
+            atomic_write_json(self.history_file, self.messages, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"⚠️ Error saving chat history: {e}")
     
@@ -124,51 +124,10 @@ class ChatHistory:
 
 chat_history = ChatHistory()
 
-def python_type_to_openai_type(python_type: type) -> str:
-    return {
-        int: "integer",
-        float: "number",
-        bool: "boolean",
-        list: "array",
-        dict: "object"
-    }.get(python_type, "string")
-
-def function_to_tool_schema(fn: Callable) -> Dict[str, Any]:
-    sig = inspect.signature(fn)
-    type_hints = get_type_hints(fn)
-    params = {
-        name: {"type": python_type_to_openai_type(type_hints.get(name, str))}
-        for name in sig.parameters
-    }
-    return {
-        "type": "function",
-        "function": {
-            "name": fn.__name__,
-            "description": fn.__doc__ or f"Call {fn.__name__}",
-            "parameters": {
-                "type": "object",
-                "properties": params,
-                "required": list(sig.parameters.keys())
-            } if params else {"type": "object", "properties": {}}
-        }
-    }
-
-
-function_map = {
-    name: obj
-    for name, obj in vars(tools).items()
-    if callable(obj)
-    and inspect.isfunction(obj)
-    and inspect.getmodule(obj).__name__ == "tools"
-}
-
-
-tools_schema = [function_to_tool_schema(fn) for fn in function_map.values()]
-
-def chat_with_bot(user_input: str, system_prompt: str = None, user_context: Dict[str, str] = None):
-    from data import fetch_all_db_data
-    # Fetch all DB data using the new function
-    db_context = fetch_all_db_data()
+def _chat_messages(user_input: str, system_prompt: str = None, user_context: Dict[str, str] = None) -> List[Dict]:
+    from retrieval import chat_context
+    # Only the records relevant to the question, within the context token budget
+    db_context = chat_context.context(user_input)
     messages = []
     if system_prompt:
         messages.append({"role": "system", "content": system_prompt})
@@ -184,51 +143,74 @@ def chat_with_bot(user_input: str, system_prompt: str = None, user_context: Dict
     messages.append({"role": "system", "content": f"DB_CONTEXT: {json.dumps(db_context, ensure_ascii=False)}"})
     messages.extend(chat_history.get_recent_messages())
     messages.append({"role": "user", "content": user_input})
+    return messages
+
+def _run_tool_calls(tool_calls: List[Dict]) -> Iterator[Tuple[str, Any]]:
+    """Runs the model's tool calls concurrently, yielding ('tool', progress) events as they
+    start and finish; returns the results in call order"""
+    results: List[Any] = [None] * len(tool_calls)
+    calls = []  # (position, name, arguments) of the calls that can run
+    for index, tool_call in enumerate(tool_calls):
+        tool_name = tool_call["function"]["name"]
+        if tool_name not in tool_registry:
+            results[index] = f"❌ Unknown tool `{tool_name}`"
+            yield "tool", {"name": tool_name, "state": "error"}
+            continue
+        try:
+            calls.append((index, tool_name, json.loads(tool_call["function"]["arguments"] or "{}")))
+        except ValueError as e:
+            print(f"[Tool Error] {tool_name}: {e}")
+            results[index] = f"⚠️ Error running tool `{tool_name}`: {e}"
+            yield "tool", {"name": tool_name, "state": "error"}
+            continue
+        yield "tool", {"name": tool_name, "state": "running"}
+
+    for position, run in tool_registry.run_all([(name, args) for _, name, args in calls]):
+        index = calls[position][0]
+        if run.error is None:
+            results[index] = run.result
+        else:
+            print(f"[Tool Error] {run.name}: {run.error}")
+            results[index] = f"⚠️ Error running tool `{run.name}`: {run.error}"
+        print(f"⏱️ Tool {run.name} took {run.seconds:.2f}s")
+        yield "tool", {"name": run.name, "state": "done" if run.error is None else "error",
+                       "seconds": round(run.seconds, 2)}
+
+    tool_results = []
+    for tool_call, result in zip(tool_calls, results):
+        tool_results.append({
+            "tool_call": tool_call,
+            "result": result
+        })
+        chat_history.add_tool_message(tool_call["id"], tool_call["function"]["name"], str(result))
+    return tool_results
+
+def chat_events(user_input: str, system_prompt: str = None, user_context: Dict[str, str] = None,
+                stream: bool = True) -> Iterator[Tuple[str, Any]]:
+    """One chat turn as events, for /chat/stream:
+    ('status', {'state': 'thinking' | 'answering'}) when a completion starts (drop earlier deltas),
+    ('tool', {'name', 'state': 'running' | 'done' | 'error'}) around each tool call (they run
+    concurrently; 'done' and 'error' come in the order they finish, with 'seconds'),
+    ('delta', text) as reply text arrives, and last ('done', reply) with the whole reply.
+    """
+    yield "status", {"state": "thinking"}
+    messages = _chat_messages(user_input, system_prompt, user_context)
     chat_history.add_message("user", user_input)
     
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o",
-            messages=messages,
-            tools=tools_schema,
-            tool_choice="auto"
-        )
-        message = response["choices"][0]["message"]
+        message = yield from completion_events(openai.ChatCompletion.create, stream,
+                                               model="gpt-4o", messages=messages,
+                                               tools=tool_registry.schemas(), tool_choice="auto")
     except Exception as e:
         print(f"[OpenAI API Error] {e}")
         error_response = "I apologize, but I'm experiencing some technical difficulties right now. Please try again in a moment."
         chat_history.add_message("assistant", error_response)
         chat_history.save_history()
-        return error_response
-    # ...existing code...
-    # Otherwise, use normal OpenAI response logic
+        yield "done", error_response
+        return
     if message.get("tool_calls"):
         chat_history.add_message("assistant", message.get("content", ""), message.get("tool_calls"))
-        tool_results = []
-        all_tools_successful = True
-        for tool_call in message["tool_calls"]:
-            tool_name = tool_call["function"]["name"]
-            args = json.loads(tool_call["function"]["arguments"])
-            if tool_name in function_map:
-                try:
-                    result = function_map[tool_name](**args)
-                except Exception as e:
-                    print(f"[Tool Error] {tool_name}: {e}")
-                    result = f"⚠️ Error running tool `{tool_name}`: {e}"
-                    all_tools_successful = False
-                tool_results.append({
-                    "tool_call": tool_call,
-                    "result": result
-                })
-                chat_history.add_tool_message(tool_call["id"], tool_name, str(result))
-            else:
-                error_msg = f"❌ Unknown tool `{tool_name}`"
-                tool_results.append({
-                    "tool_call": tool_call,
-                    "result": error_msg
-                })
-                chat_history.add_tool_message(tool_call["id"], tool_name, error_msg)
-                all_tools_successful = False
+        tool_results = yield from _run_tool_calls(message["tool_calls"])
         messages.append({"role": "assistant", "tool_calls": message["tool_calls"]})
         for tool_result in tool_results:
             messages.append({
@@ -237,25 +219,28 @@ def chat_with_bot(user_input: str, system_prompt: str = None, user_context: Dict
                 "name": tool_result["tool_call"]["function"]["name"],
                 "content": str(tool_result["result"])
             })
+        yield "status", {"state": "answering"}
         try:
-            followup = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=messages
-            )
-            final_response = followup["choices"][0]["message"]["content"]
-            chat_history.add_message("assistant", final_response)
-            chat_history.save_history()
-            return final_response
+            followup = yield from completion_events(openai.ChatCompletion.create, stream,
+                                                    model="gpt-4o", messages=messages)
+            final_response = followup["content"]
         except Exception as e:
             print(f"[Followup Error] {e}")
-            fallback = "Sorry, I couldn't complete your request due to an internal error. Please try again or rephrase your question."
-            chat_history.add_message("assistant", fallback)
-            chat_history.save_history()
-            return fallback
+            final_response = "Sorry, I couldn't complete your request due to an internal error. Please try again or rephrase your question."
+        chat_history.add_message("assistant", final_response)
+        chat_history.save_history()
+        yield "done", final_response
     else:
         chat_history.add_message("assistant", message["content"])
         chat_history.save_history()
-        return message["content"]
+        yield "done", message["content"]
+
+def chat_with_bot(user_input: str, system_prompt: str = None, user_context: Dict[str, str] = None):
+    reply = None
+    for event, data in chat_events(user_input, system_prompt, user_context, stream=False):
+        if event == "done":
+            reply = data
+    return reply
 
 SYSTEM_PROMPT = """
 You are a highly intelligent, friendly HR assistant with advanced data analytics capabilities. Always provide clear, helpful, and positive replies to the user, as if you are a real assistant.
@@ -364,9 +349,8 @@ You have access to chat history and can remember previous conversations. Your go
 def index():
     return render_template("chatbot.html")
 
-@app.route("/chat", methods=["POST"])
-def chat():
-    import re
+def _chat_request():
+    """(message, user context) of a chat request"""
     data = request.get_json()
     user_input = data.get("message", "")
     
@@ -384,84 +368,42 @@ def chat():
         log_chat_activity(user_context.get('username', 'unknown'), user_input)
     except Exception as e:
         print(f"⚠️ Could not log chat activity: {e}")
-    
-    reply = chat_with_bot(user_input, system_prompt=SYSTEM_PROMPT, user_context=user_context)
-    # HTML bold for *text*
-    # Format job list if detected
-    import re
-    def format_reply(text):
-        import re
-        # Replace markdown image links with HTML <img> tags
-        def image_replacer(match):
-            alt_text = match.group(1)
-            img_path = match.group(2)
-            # Only allow .png, .jpg, .jpeg, .gif for safety
-            if img_path.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
-                # If path starts with ./db/ or db/, convert to /db/ for browser access
-                if img_path.startswith('./db/'):
-                    web_path = img_path[1:]  # remove leading .
-                elif img_path.startswith('db/'):
-                    web_path = '/' + img_path
-                elif img_path.startswith('./static/'):
-                    web_path = img_path[1:]
-                elif img_path.startswith('static/'):
-                    web_path = '/' + img_path
-                else:
-                    # For bare filenames, assume they're in the db directory
-                    # Check if file exists in db directory
-                    db_file_path = pathlib.Path(__file__).parent / 'db' / img_path
-                    if db_file_path.exists():
-                        web_path = f'/db/{img_path}'
-                    else:
-                        web_path = img_path
-                return f'<div style="margin:8px 0;"><img src="{web_path}" alt="{alt_text}" style="max-width: 100%; max-height: 320px; border:1px solid #ccc; border-radius:6px; box-shadow:0 2px 8px #0001;"><div style="font-size:12px;color:#555;">{alt_text}</div></div>'
-            return match.group(0)
-        text = re.sub(r'!\[(.*?)\]\((.*?)\)', image_replacer, text)
-        # Bold for *text*
-        text = re.sub(r'\*(.*?)\*', r'<b>\1</b>', text)
-        # Lists: lines starting with - or number.
-        lines = text.split('\n')
-        formatted_lines = []
-        in_ul = False
-        for line in lines:
-            if re.match(r'^\s*- ', line):
-                if not in_ul:
-                    formatted_lines.append('<ul style="margin:4px 0 4px 18px; padding:0;">')
-                    in_ul = True
-                formatted_lines.append(f'<li style="margin:2px 0;">{line.lstrip("- ")}</li>')
-            elif re.match(r'^\s*\d+\. ', line):
-                if not in_ul:
-                    formatted_lines.append('<ul style="margin:4px 0 4px 18px; padding:0;">')
-                    in_ul = True
-                formatted_lines.append(f'<li style="margin:2px 0;">{re.sub(r"^\s*\d+\. ", "", line)}</li>')
-            else:
-                if in_ul:
-                    formatted_lines.append('</ul>')
-                    in_ul = False
-                # Add <br> for blank lines to create spacing between blocks
-                if line.strip():
-                    formatted_lines.append(line)
-                else:
-                    formatted_lines.append('<br>')
-        if in_ul:
-            formatted_lines.append('</ul>')
-        # Join with <br> for newlines, but not between list items
-        html = ''
-        for i, part in enumerate(formatted_lines):
-            if part.startswith('<ul') or part.startswith('</ul>') or part.startswith('<li') or part.startswith('<div style="margin:8px 0;">'):
-                html += part
-            else:
-                html += part + '<br>'
-        return html.rstrip('<br>')
+    return user_input, user_context
 
-    reply_html = format_reply(reply)
-    # Remove * and # for plain text
-    reply_plain = reply.replace('*', '').replace('#', '')
+@app.route("/chat", methods=["POST"])
+def chat():
+    user_input, user_context = _chat_request()
+    reply = chat_with_bot(user_input, system_prompt=SYSTEM_PROMPT, user_context=user_context)
     return jsonify({
-        "reply": reply_html,
-        "reply_plain": reply_plain
+        "reply": format_reply(reply),
+        "reply_plain": plain_reply(reply)
     })
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.route("/chat/stream", methods=["POST"])
+def chat_stream():
+    """/chat as Server-Sent Events, sent as the reply is generated:
+    status/tool progress, 'delta' with the HTML of each completed line (plus the
+    unfinished line as text in 'tail'), then 'done' with what /chat returns."""
+    user_input, user_context = _chat_request()
+
+    def events():
+        formatter = ReplyFormatter()
+        for event, data in chat_events(user_input, system_prompt=SYSTEM_PROMPT, user_context=user_context):
+            if event == "delta":
+                yield _sse("delta", {"html": formatter.feed(data), "tail": formatter.pending})
+            elif event == "done":
+                yield _sse("done", {"reply": format_reply(data), "reply_plain": plain_reply(data)})
+            else:
+                if event == "status":
+                    formatter = ReplyFormatter()
+                yield _sse(event, data)
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.route("/clear_history", methods=["POST"])
 def clear_history():
     chat_history.clear_history()
@@ -474,7 +416,6 @@ def clean_history():
 
 @app.route("/show_history", methods=["GET"])
 def show_history():
-    import re
     messages = chat_history.get_recent_messages(1000)
     history = []
     for msg in messages[-5:]:
@@ -593,8 +534,6 @@ def get_analytics_summary():
         
         # Helper function to extract key insight from analytics text
         def extract_key_insight(text, insight_type):
-            import re
-            
             if not text or len(str(text)) < 10:
                 return get_fallback_insight(insight_type)
             
@@ -1,38 +1,78 @@
 """
 Enhanced Activity Logger for AION HR System
 Tracks all user activities across the application
+
+Activities are appended to one JSONL segment per day under db/activity_log/, so
+logging costs O(1) and history is unbounded on disk. Each segment has a small
+index (first/last timestamp, counts by type and user) that lets queries skip
+segments without reading them. The legacy activity_log.json is split into
+segments on first use and left in place untouched.
 """
 
+import atexit
 import json
 import os
 import datetime
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 import threading
 
+from journal import atomic_write_json
+from locking import file_lock
+
+
+# Persist a segment index after this many appends (it is caught up from the segment tail anyway)
+INDEX_FLUSH_EVERY = 50
+# Parsed segments kept in memory; past days never change, today's segment is read incrementally
+SEGMENT_CACHE_SIZE = 14
+
 
 class ActivityLogger:
     def __init__(self, db_folder: str = "./db"):
         self.db_folder = db_folder
         self.activity_file = os.path.join(db_folder, "activity_log.json")
-        self.lock = threading.Lock()
-        
+        self.segment_folder = os.path.join(db_folder, "activity_log")
+        self.lock = threading.RLock()
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._unflushed: Dict[str, int] = {}
+        self._segments: "OrderedDict[str, Tuple[int, List[Dict]]]" = OrderedDict()
+        self._ready = False
+
         # Ensure the db folder exists
         os.makedirs(db_folder, exist_ok=True)
-        
-        # Initialize activity log if it doesn't exist
-        if not os.path.exists(self.activity_file):
-            self._write_activities([])
-    
-    def _write_activities(self, activities: List[Dict]):
-        """Write activities to file with error handling"""
-        try:
-            with open(self.activity_file, 'w', encoding='utf-8') as f:
-                json.dump(activities, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error writing activities: {e}")
-    
-    def _read_activities(self) -> List[Dict]:
-        """Read activities from file with error handling"""
+        atexit.register(self.flush_indexes)
+
+    def _segment_path(self, day: str) -> str:
+        return os.path.join(self.segment_folder, f"{day}.jsonl")
+
+    def _index_path(self, day: str) -> str:
+        return os.path.join(self.segment_folder, f"{day}.index.json")
+
+    def _ensure_segments(self):
+        """Create the segment folder, splitting the legacy activity_log.json into day segments once"""
+        if self._ready:
+            return
+        with self.lock:
+            if self._ready:
+                return
+            with file_lock(os.path.join(self.db_folder, '.locks', 'activity_log.lock')):
+                if not os.path.isdir(self.segment_folder):
+                    staging = self.segment_folder + '.migrating'
+                    os.makedirs(staging, exist_ok=True)
+                    by_day: Dict[str, List[str]] = {}
+                    for activity in self._read_legacy():
+                        day = activity.get('date') or str(activity.get('timestamp', ''))[:10]
+                        if day:
+                            by_day.setdefault(day, []).append(json.dumps(activity, ensure_ascii=False))
+                    for day, lines in by_day.items():
+                        with open(os.path.join(staging, f"{day}.jsonl"), 'w', encoding='utf-8') as f:
+                            f.write('\n'.join(lines) + '\n')
+                    # Publish all segments at once so a crash never leaves a partial history
+                    os.replace(staging, self.segment_folder)
+            self._ready = True
+
+    def _read_legacy(self) -> List[Dict]:
+        """Read the pre-segment activity_log.json with error handling"""
         try:
             if os.path.exists(self.activity_file):
                 with open(self.activity_file, 'r', encoding='utf-8') as f:
@@ -40,17 +80,115 @@ class ActivityLogger:
         except Exception as e:
             print(f"Error reading activities: {e}")
         return []
-    
-    def log_activity(self, 
+
+    def _scan(self, day: str, offset: int) -> Tuple[List[Dict], int]:
+        """Parse complete lines of a segment from offset; returns (records, offset after last full line)"""
+        try:
+            with open(self._segment_path(day), 'rb') as f:
+                f.seek(offset)
+                chunk = f.read()
+        except OSError:
+            return [], offset
+        end = chunk.rfind(b'\n') + 1  # a torn last line is picked up once it is complete
+        records = []
+        for line in chunk[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records, offset + end
+
+    def _index(self, day: str) -> Dict[str, Any]:
+        """Index of one segment, caught up with any lines appended since it was last saved"""
+        with self.lock:
+            index = self._indexes.get(day)
+            if index is None:
+                try:
+                    with open(self._index_path(day), 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                except (OSError, ValueError):
+                    index = None
+                if not isinstance(index, dict) or 'size' not in index:
+                    index = {'day': day, 'size': 0, 'count': 0, 'first': None, 'last': None, 'types': {}, 'users': {}}
+                self._indexes[day] = index
+            try:
+                size = os.path.getsize(self._segment_path(day))
+            except OSError:
+                size = 0
+            if size > index['size']:
+                records, index['size'] = self._scan(day, index['size'])
+                for activity in records:
+                    timestamp = activity.get('timestamp')
+                    index['first'] = index['first'] or timestamp
+                    index['last'] = timestamp or index['last']
+                    index['count'] += 1
+                    activity_type = activity.get('activity_type')
+                    index['types'][activity_type] = index['types'].get(activity_type, 0) + 1
+                    user = activity.get('user')
+                    index['users'][user] = index['users'].get(user, 0) + 1
+                self._unflushed[day] = self._unflushed.get(day, 0) + len(records)
+                if self._unflushed[day] >= INDEX_FLUSH_EVERY:
+                    self._flush_index(day)
+            return index
+
+    def _flush_index(self, day: str):
+        try:
+            atomic_write_json(self._index_path(day), self._indexes[day], indent=None, fsync=False)
+            self._unflushed[day] = 0
+        except Exception as e:
+            print(f"Error writing activity index: {e}")
+
+    def flush_indexes(self):
+        """Persist indexes that have unsaved entries (called at exit)"""
+        with self.lock:
+            for day, pending in list(self._unflushed.items()):
+                if pending:
+                    self._flush_index(day)
+
+    def _segment(self, day: str) -> List[Dict]:
+        """Parsed records of one segment in append order, reading only bytes added since last time"""
+        with self.lock:
+            size, records = self._segments.pop(day, (0, []))
+            new_records, size = self._scan(day, size)
+            records.extend(new_records)
+            self._segments[day] = (size, records)
+            while len(self._segments) > SEGMENT_CACHE_SIZE:
+                self._segments.popitem(last=False)
+            return records
+
+    def _days(self, since: Optional[str] = None) -> List[str]:
+        """Segment days, newest first, optionally only those on or after since"""
+        self._ensure_segments()
+        try:
+            names = os.listdir(self.segment_folder)
+        except OSError:
+            return []
+        days = sorted((name[:-len('.jsonl')] for name in names if name.endswith('.jsonl')), reverse=True)
+        if since:
+            days = [day for day in days if day >= since]
+        return days
+
+    def _iter_recent(self, since: Optional[str] = None, **counts) -> Iterator[Dict]:
+        """
+        Yield activities newest first. Filters such as types='chat_interaction' or
+        users='admin' skip segments whose index has no matching entries.
+        """
+        for day in self._days(since):
+            index = self._index(day)
+            if any(index[field].get(value, 0) == 0 for field, value in counts.items()):
+                continue
+            yield from reversed(self._segment(day))
+
+    def log_activity(self,
                     activity_type: str,
-                    description: str, 
+                    description: str,
                     user: str = "system",
                     details: Optional[Dict] = None,
                     entity_id: Optional[str] = None,
                     entity_type: Optional[str] = None):
         """
         Log a new activity
-        
+
         Args:
             activity_type: Type of activity (e.g., 'candidate_created', 'job_posted', 'interview_scheduled')
             description: Human-readable description of the activity
@@ -59,74 +197,77 @@ class ActivityLogger:
             entity_id: ID of the entity involved (candidate ID, job ID, etc.)
             entity_type: Type of entity (candidate, job, user, etc.)
         """
+        now = datetime.datetime.now()
         activity = {
             "id": self._generate_activity_id(),
-            "timestamp": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "timestamp": now.strftime('%Y-%m-%d %H:%M:%S'),
             "activity_type": activity_type,
             "description": description,
             "user": user,
             "entity_id": entity_id,
             "entity_type": entity_type,
             "details": details or {},
-            "date": datetime.datetime.now().strftime('%Y-%m-%d'),
-            "time": datetime.datetime.now().strftime('%H:%M:%S')
+            "date": now.strftime('%Y-%m-%d'),
+            "time": now.strftime('%H:%M:%S')
         }
-        
-        # Thread-safe writing
-        with self.lock:
-            activities = self._read_activities()
-            activities.append(activity)
-            
-            # Keep only last 1000 activities to prevent file from growing too large
-            if len(activities) > 1000:
-                activities = activities[-1000:]
-            
-            self._write_activities(activities)
-    
+        line = (json.dumps(activity, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+        try:
+            self._ensure_segments()
+            with self.lock:
+                # A single O_APPEND write keeps lines from different processes whole
+                fd = os.open(self._segment_path(activity['date']), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+                self._index(activity['date'])
+                # Day rollover: persist the indexes of finished segments now
+                for day in [d for d, pending in self._unflushed.items() if pending and d != activity['date']]:
+                    self._flush_index(day)
+        except Exception as e:
+            print(f"Error writing activities: {e}")
+
     def get_recent_activities(self, limit: int = 50, days: int = 7) -> List[Dict]:
         """Get recent activities within specified days"""
-        activities = self._read_activities()
-        
-        # Filter by date
         cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days)
+        cutoff = cutoff_date.strftime('%Y-%m-%d %H:%M:%S')
         recent_activities = []
-        
-        for activity in reversed(activities):  # Most recent first
-            try:
-                activity_date = datetime.datetime.strptime(activity['timestamp'], '%Y-%m-%d %H:%M:%S')
-                if activity_date >= cutoff_date:
-                    recent_activities.append(activity)
-                    if len(recent_activities) >= limit:
-                        break
-            except Exception:
-                continue
-        
+
+        for activity in self._iter_recent(since=cutoff[:10]):  # Most recent first
+            if str(activity.get('timestamp', '')) >= cutoff:
+                recent_activities.append(activity)
+                if len(recent_activities) >= limit:
+                    break
+
         return recent_activities
-    
+
     def get_todays_activities(self) -> List[Dict]:
         """Get activities from today only"""
-        activities = self._read_activities()
         today = datetime.datetime.now().strftime('%Y-%m-%d')
-        
-        todays_activities = []
-        for activity in reversed(activities):
-            if activity.get('date') == today:
-                todays_activities.append(activity)
-        
-        return todays_activities
-    
+        self._ensure_segments()
+        return list(reversed(self._segment(today)))
+
     def get_activities_by_type(self, activity_type: str, limit: int = 20) -> List[Dict]:
         """Get activities of a specific type"""
-        activities = self._read_activities()
-        filtered = [a for a in reversed(activities) if a.get('activity_type') == activity_type]
-        return filtered[:limit]
-    
+        filtered = []
+        for activity in self._iter_recent(types=activity_type):
+            if activity.get('activity_type') == activity_type:
+                filtered.append(activity)
+                if len(filtered) >= limit:
+                    break
+        return filtered
+
     def get_activities_by_user(self, user: str, limit: int = 20) -> List[Dict]:
         """Get activities by a specific user"""
-        activities = self._read_activities()
-        filtered = [a for a in reversed(activities) if a.get('user') == user]
-        return filtered[:limit]
-    
+        filtered = []
+        for activity in self._iter_recent(users=user):
+            if activity.get('user') == user:
+                filtered.append(activity)
+                if len(filtered) >= limit:
+                    break
+        return filtered
+
     def _generate_activity_id(self) -> str:
         """Generate a unique activity ID"""
         return f"act_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
@@ -1,22 +1,64 @@
 """
 HR Analytics Engine - Comprehensive Analytics and Insights System
 Provides detailed analytics, predictions, and insights for HR metrics
+
+Data is read lazily through the repository, so a long-running process always sees
+the current collections, and analyze_* results are memoized per data version.
+Charts are drawn from their series by the chart rendering service (chart_service.py),
+outside the request thread. The comprehensive report computes the shared aggregates
+once, runs the analyses concurrently and streams sections out as they finish.
 """
 
 import os
 import json
+import time
+import functools
+import tempfile
+import threading
 import numpy as np
 
-# Configure matplotlib to use non-interactive backend for web servers
-import matplotlib
-matplotlib.use('Agg')  # Use Anti-Grain Geometry backend (non-interactive)
-import matplotlib.pyplot as plt
-import seaborn as sns
+from datetime import date, datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Any, TextIO, Tuple
+
+from repository import repository
+from models import Status
+from analytics_snapshot import MISSING_DAY, analytics_snapshots, count_by_month, factorize, month_label
+from chart_service import chart_service
+
+
+# Analyses the comprehensive report runs at once
+REPORT_WORKERS = int(os.environ.get('AION_REPORT_WORKERS', '4'))
+
+
+def memoized_per_version(method):
+    """Cache an analysis per (arguments, data version); cached results are shared, treat as read-only.
+    
+    Analyses describe their chart as a 'chart' spec (type, series, figsize). The PNG is
+    only rendered into 'chart_path' for callers that want it: charts=False skips it,
+    e.g. when the browser draws the series itself.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, charts: bool = True, **kwargs):
+        version = self.data_version()
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[0] == version:
+                self.stats['hits'] += 1
+                result = entry[1]
+            else:
+                result = None
+        if result is None:
+            result = method(self, *args, **kwargs)
+            with self._lock:
+                self._results[key] = (version, result)
+                self.stats['misses'] += 1
+        if 'chart' not in result:
+            return result
+        return dict(result, chart_path=self._render_chart(result['chart']) if charts else None)
+    return wrapper
 
-from datetime import datetime, timedelta
-from collections import defaultdict
-import pandas as pd
-from typing import Dict, List, Any, Tuple
 
 class HRAnalyticsEngine:
     def __init__(self):
@@ -25,37 +67,81 @@ class HRAnalyticsEngine:
         self.jobs_file = os.path.join(self.db_folder, 'jobs.json')
         self.users_file = os.path.join(self.db_folder, 'userdata.json')
         
-        # Load data
-        self.candidates = self._load_json(self.candidates_file)
-        self.jobs = self._load_json(self.jobs_file)
-        self.users = self._load_json(self.users_file)
-        
-        # Set up plotting style
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
+        # Nothing is loaded here: data is read on use and results are cached per version
+        self._lock = threading.Lock()
+        self._results: Dict[Any, Tuple[Any, Any]] = {}
+        # DPI preset of the charts (see chart_cache.DPI_PRESETS); None uses the default
+        self.chart_preset = None
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    # Each read revalidates against disk; unchanged collections come straight from the cache
+    @property
+    def candidates(self) -> List[Dict]:
+        return self._load_json(self.candidates_file)
+    
+    @property
+    def jobs(self) -> List[Dict]:
+        return self._load_json(self.jobs_file)
+    
+    @property
+    def users(self) -> List[Dict]:
+        return self._load_json(self.users_file)
+    
+    @property
+    def snapshot(self):
+        """Column arrays of the candidates, rebuilt only on data changes (see analytics_snapshot.py)"""
+        return analytics_snapshots.get()
+    
+    def data_version(self) -> Tuple:
+        """Changes when candidates, jobs or users change on disk, and when the day rolls over
+        (predictions count back from today)"""
+        files = (self.candidates_file, self.jobs_file, self.users_file)
+        for filepath in files:
+            self._load_json(filepath)
+        return tuple(repository.version(os.path.basename(f)) for f in files) + (date.today(),)
     
     def _load_json(self, filepath: str) -> List[Dict]:
-        """Load JSON data with error handling"""
-        try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r') as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
-        return []
+        """Load JSON data through the shared repository cache (read-only)"""
+        return repository.load(os.path.basename(filepath))
     
-    def _save_chart(self, fig, filename: str) -> str:
-        """Save chart to db folder and return path"""
-        chart_path = os.path.join(self.db_folder, filename)
-        fig.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close(fig)
-        return chart_path
+    def _render_chart(self, chart: Dict[str, Any]) -> Any:
+        """Path of the chart PNG in db/charts (drawn by charts.py in a worker process); None on timeout"""
+        return chart_service.render(chart['type'], chart['series'], chart['figsize'], self.chart_preset)
+    
+    @memoized_per_version
+    def shared_aggregates(self) -> Dict[str, Any]:
+        """Intermediates several analyses share, computed once per data version:
+        the snapshot, the hired mask, monthly counts and each candidate's department"""
+        snap = self.snapshot
+        hired = snap.has_status(Status.HIRED)
+        month_ids, applications, (monthly_hired, interviewed, rejected) = count_by_month(snap.applied, [
+            hired,
+            snap.has_status(Status.INTERVIEWED, Status.INTERVIEW_ANALYZED),
+            snap.has_status(Status.REJECTED, Status.NOT_APPROVED),
+        ])
+        # Map candidate to department based on position (once per distinct position)
+        position_depts, dept_names = factorize(
+            [self._map_position_to_department(p.lower()) for p in snap.position_labels])
+        return {
+            'snapshot': snap,
+            'hired': hired,
+            'hired_count': int(hired.sum()),
+            'month_ids': month_ids,
+            'applications': applications,
+            'monthly_hired': monthly_hired,
+            'monthly_interviewed': interviewed,
+            'monthly_rejected': rejected,
+            'department': position_depts[snap.position] if snap.n else np.zeros(0, dtype=np.int32),
+            'department_names': dept_names,
+        }
     
     # 1. HIRING SUCCESS RATE ANALYTICS
+    @memoized_per_version
     def analyze_hiring_success_rate(self) -> Dict[str, Any]:
         """Comprehensive hiring success rate analysis with trends"""
-        total_candidates = len(self.candidates)
-        hired_count = len([c for c in self.candidates if c.get('status') == 'Hired'])
+        agg = self.shared_aggregates()
+        total_candidates = agg['snapshot'].n
+        hired_count = agg['hired_count']
         
         if total_candidates == 0:
             return {
@@ -68,34 +154,15 @@ class HRAnalyticsEngine:
         success_rate = (hired_count / total_candidates) * 100
         
         # Monthly trend analysis
-        monthly_data = defaultdict(lambda: {'total': 0, 'hired': 0})
-        
-        for candidate in self.candidates:
-            applied_date = candidate.get('applied_date', '')
-            if applied_date:
-                try:
-                    month_key = applied_date[:7]  # YYYY-MM
-                    monthly_data[month_key]['total'] += 1
-                    if candidate.get('status') == 'Hired':
-                        monthly_data[month_key]['hired'] += 1
-                except:
-                    continue
+        monthly_data = {month_label(m): {'total': int(t), 'hired': int(h)}
+                        for m, t, h in zip(agg['month_ids'], agg['applications'], agg['monthly_hired'])}
         
         # Create trend chart
-        months = sorted(monthly_data.keys())
+        months = list(monthly_data.keys())
         rates = [(monthly_data[m]['hired'] / monthly_data[m]['total'] * 100) 
                 if monthly_data[m]['total'] > 0 else 0 for m in months]
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(months, rates, marker='o', linewidth=3, markersize=8)
-        ax.fill_between(months, rates, alpha=0.3)
-        ax.set_title('Hiring Success Rate Trend', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Month', fontsize=12)
-        ax.set_ylabel('Success Rate (%)', fontsize=12)
-        ax.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        
-        chart_path = self._save_chart(fig, 'hiring_success_trend.png')
+        chart = {'type': 'hiring_success_trend', 'series': {'months': months, 'rates': rates}, 'figsize': (12, 6)}
         
         # Determine status
         if success_rate >= 70:
@@ -126,33 +193,21 @@ class HRAnalyticsEngine:
             'success_rate': success_rate,
             'status': status,
             'insights': insights,
-            'chart_path': chart_path,
+            'chart': chart,
             'monthly_data': dict(monthly_data)
         }
     
     # 2. MONTHLY HIRING INSIGHTS
+    @memoized_per_version
     def analyze_monthly_hiring_performance(self) -> Dict[str, Any]:
         """Detailed monthly hiring analysis with seasonal patterns"""
-        monthly_stats = defaultdict(lambda: {
-            'applications': 0, 'hired': 0, 'interviewed': 0, 'rejected': 0
-        })
-        
-        for candidate in self.candidates:
-            applied_date = candidate.get('applied_date', '')
-            if applied_date:
-                try:
-                    month_name = datetime.strptime(applied_date[:7], '%Y-%m').strftime('%B %Y')
-                    monthly_stats[month_name]['applications'] += 1
-                    
-                    status = candidate.get('status', '')
-                    if status == 'Hired':
-                        monthly_stats[month_name]['hired'] += 1
-                    elif status in ['Interviewed', 'Interview Analyzed']:
-                        monthly_stats[month_name]['interviewed'] += 1
-                    elif status in ['Rejected', 'Not Approved']:
-                        monthly_stats[month_name]['rejected'] += 1
-                except:
-                    continue
+        agg = self.shared_aggregates()
+        month_ids, applications = agg['month_ids'], agg['applications']
+        hired, interviewed, rejected = agg['monthly_hired'], agg['monthly_interviewed'], agg['monthly_rejected']
+        monthly_stats = {
+            month_label(m, '%B %Y'): {'applications': int(a), 'hired': int(h), 'interviewed': int(i), 'rejected': int(r)}
+            for m, a, h, i, r in zip(month_ids, applications, hired, interviewed, rejected)
+        }
         
         if not monthly_stats:
             return {'insights': ['No monthly data available'], 'chart_path': None}
@@ -164,25 +219,14 @@ class HRAnalyticsEngine:
                          key=lambda x: monthly_stats[x]['hired'])
         
         # Create multi-line chart
-        fig, ax = plt.subplots(figsize=(14, 8))
         months = list(monthly_stats.keys())
         
         applications = [monthly_stats[m]['applications'] for m in months]
         hired = [monthly_stats[m]['hired'] for m in months]
         interviewed = [monthly_stats[m]['interviewed'] for m in months]
         
-        ax.plot(months, applications, marker='o', label='Applications', linewidth=2)
-        ax.plot(months, hired, marker='s', label='Hired', linewidth=2)
-        ax.plot(months, interviewed, marker='^', label='Interviewed', linewidth=2)
-        
-        ax.set_title('Monthly Hiring Performance Trends', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Month', fontsize=12)
-        ax.set_ylabel('Count', fontsize=12)
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        
-        chart_path = self._save_chart(fig, 'monthly_hiring_trends.png')
+        series = {'months': months, 'applications': applications, 'hired': hired, 'interviewed': interviewed}
+        chart = {'type': 'monthly_hiring_trends', 'series': series, 'figsize': (14, 8)}
         
         insights = [
             f"🏆 Best month: {best_month} ({monthly_stats[best_month]['hired']} hires)",
@@ -195,76 +239,51 @@ class HRAnalyticsEngine:
             'worst_month': worst_month,
             'monthly_data': dict(monthly_stats),
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     # 3. DEPARTMENT INTERVIEW EFFICIENCY
+    @memoized_per_version
     def analyze_department_interview_efficiency(self) -> Dict[str, Any]:
         """Analyze interview speed and efficiency by department"""
-        dept_stats = defaultdict(lambda: {
-            'total_candidates': 0,
-            'interviewed': 0,
-            'avg_days_to_interview': 0,
-            'hire_rate': 0
-        })
-        
-        for candidate in self.candidates:
-            # Map candidate to department based on position
-            position = candidate.get('position', '').lower()
-            dept = self._map_position_to_department(position)
-            
-            dept_stats[dept]['total_candidates'] += 1
-            
-            if candidate.get('status') in ['Interviewed', 'Hired', 'Interview Analyzed']:
-                dept_stats[dept]['interviewed'] += 1
-                
+        agg = self.shared_aggregates()
+        snap, dept, dept_names = agg['snapshot'], agg['department'], agg['department_names']
+        size = len(dept_names)
+        
+        interviewed = snap.has_status(Status.INTERVIEWED, Status.HIRED, Status.INTERVIEW_ANALYZED)
+        totals = np.bincount(dept, minlength=size)
+        interviewed_counts = np.bincount(dept, weights=interviewed, minlength=size)
+        hired_counts = np.bincount(dept, weights=agg['hired'], minlength=size)
+        
+        # Longest applied-to-interview gap per department, where both dates are known
+        dated = interviewed & (snap.applied != MISSING_DAY) & (snap.interviewed != MISSING_DAY)
+        longest = np.full(size, -1, dtype=np.int64)
+        np.maximum.at(longest, dept[dated], (snap.interviewed - snap.applied)[dated])
+        
+        dept_stats = {}
+        for code, name in enumerate(dept_names):
+            if longest[code] >= 0:
+                days = int(longest[code])
+            elif interviewed_counts[code]:
                 # Simulate interview timeline (in real implementation, use actual dates)
-                applied_date = candidate.get('applied_date', '')
-                interview_date = candidate.get('interview_date', '')
-                if applied_date and interview_date:
-                    try:
-                        applied = datetime.strptime(applied_date, '%Y-%m-%d')
-                        interviewed = datetime.strptime(interview_date, '%Y-%m-%d')
-                        days_diff = (interviewed - applied).days
-                        dept_stats[dept]['avg_days_to_interview'] = max(
-                            dept_stats[dept]['avg_days_to_interview'], days_diff
-                        )
-                    except:
-                        dept_stats[dept]['avg_days_to_interview'] = np.random.randint(5, 20)
-                else:
-                    dept_stats[dept]['avg_days_to_interview'] = np.random.randint(5, 20)
-            
-            if candidate.get('status') == 'Hired':
-                dept_stats[dept]['hire_rate'] += 1
-        
-        # Calculate rates
-        for dept, stats in dept_stats.items():
-            if stats['total_candidates'] > 0:
-                stats['interview_rate'] = (stats['interviewed'] / stats['total_candidates']) * 100
-                stats['hire_rate'] = (stats['hire_rate'] / stats['total_candidates']) * 100
+                days = int(np.random.randint(5, 20))
+            else:
+                days = 0
+            dept_stats[name] = {
+                'total_candidates': int(totals[code]),
+                'interviewed': int(interviewed_counts[code]),
+                'avg_days_to_interview': days,
+                'interview_rate': float(interviewed_counts[code] / totals[code] * 100),
+                'hire_rate': float(hired_counts[code] / totals[code] * 100),
+            }
         
         # Create efficiency chart
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-        
         depts = list(dept_stats.keys())
         interview_rates = [dept_stats[d]['interview_rate'] for d in depts]
         avg_days = [dept_stats[d]['avg_days_to_interview'] for d in depts]
         
-        # Interview rate chart
-        bars1 = ax1.bar(depts, interview_rates, color='skyblue', alpha=0.7)
-        ax1.set_title('Interview Rate by Department', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Interview Rate (%)')
-        ax1.set_ylim(0, 100)
-        
-        # Days to interview chart
-        bars2 = ax2.bar(depts, avg_days, color='lightcoral', alpha=0.7)
-        ax2.set_title('Average Days to Interview', fontsize=14, fontweight='bold')
-        ax2.set_ylabel('Days')
-        
-        plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
-        plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
-        
-        chart_path = self._save_chart(fig, 'department_interview_efficiency.png')
+        series = {'departments': depts, 'interview_rates': interview_rates, 'avg_days': avg_days}
+        chart = {'type': 'department_interview_efficiency', 'series': series, 'figsize': (16, 8)}
         
         # Find fastest and slowest departments
         fastest_dept = min(depts, key=lambda x: dept_stats[x]['avg_days_to_interview'])
@@ -281,27 +300,22 @@ class HRAnalyticsEngine:
             'slowest_department': slowest_dept,
             'department_stats': dict(dept_stats),
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     # 4. HIRING PREDICTIONS
+    @memoized_per_version
     def predict_hiring_timeline(self, target_employees: int = 20, months_horizon: int = 12) -> Dict[str, Any]:
         """Predict timeline to hire target number of employees"""
         
         # Calculate current hiring rate
         hired_last_3_months = 0
-        cutoff_date = datetime.now() - timedelta(days=90)
-        
-        for candidate in self.candidates:
-            if candidate.get('status') == 'Hired':
-                hired_date = candidate.get('hired_date') or candidate.get('applied_date')
-                if hired_date:
-                    try:
-                        hire_date = datetime.strptime(hired_date, '%Y-%m-%d')
-                        if hire_date >= cutoff_date:
-                            hired_last_3_months += 1
-                    except:
-                        continue
+        cutoff_day = (datetime.now() - timedelta(days=90)).date().toordinal()
+        
+        agg = self.shared_aggregates()
+        snap = agg['snapshot']
+        hire_day = np.where(snap.hired != MISSING_DAY, snap.hired, snap.applied)
+        hired_last_3_months = int((agg['hired'] & (hire_day > cutoff_day)).sum())
         
         monthly_hire_rate = hired_last_3_months / 3 if hired_last_3_months > 0 else 1
         
@@ -310,32 +324,18 @@ class HRAnalyticsEngine:
         completion_date = datetime.now() + timedelta(days=int(months_needed * 30))
         
         # Current pipeline analysis
-        pipeline_candidates = len([c for c in self.candidates 
-                                 if c.get('status') in ['Applied', 'Shortlisted', 'Interviewed']])
+        pipeline_candidates = int(snap.has_status(Status.APPLIED, Status.SHORTLISTED, Status.INTERVIEWED).sum())
         
-        success_rate = self.analyze_hiring_success_rate()['success_rate'] / 100
+        success_rate = self.analyze_hiring_success_rate(charts=False)['success_rate'] / 100
         expected_hires_from_pipeline = int(pipeline_candidates * success_rate)
         
-        # Create prediction chart
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        months = [datetime.now() + timedelta(days=30*i) for i in range(int(months_needed) + 1)]
+        # Create prediction chart (by day, so it is re-rendered at most daily)
+        months = [date.today() + timedelta(days=30*i) for i in range(int(months_needed) + 1)]
         projected_hires = [i * monthly_hire_rate for i in range(len(months))]
         
-        ax.plot(months, projected_hires, marker='o', linewidth=3, 
-                label=f'Projected Hires (Rate: {monthly_hire_rate:.1f}/month)')
-        ax.axhline(y=target_employees, color='red', linestyle='--', 
-                   label=f'Target: {target_employees} employees')
-        ax.fill_between(months, projected_hires, alpha=0.3)
-        
-        ax.set_title(f'Hiring Prediction: Path to {target_employees} Employees', 
-                    fontsize=16, fontweight='bold')
-        ax.set_xlabel('Timeline', fontsize=12)
-        ax.set_ylabel('Cumulative Hires', fontsize=12)
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        
-        chart_path = self._save_chart(fig, 'hiring_prediction.png')
+        series = {'target': target_employees, 'rate': monthly_hire_rate, 'months': months,
+                  'projected_hires': projected_hires}
+        chart = {'type': 'hiring_prediction', 'series': series, 'figsize': (12, 6)}
         
         insights = [
             f"🎯 Target: {target_employees} employees",
@@ -353,27 +353,25 @@ class HRAnalyticsEngine:
             'monthly_rate': monthly_hire_rate,
             'pipeline_candidates': pipeline_candidates,
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     # 5. TOP PERFORMERS AND BEST MOMENTS
+    @memoized_per_version
     def analyze_top_performers(self) -> Dict[str, Any]:
         """Identify top performers and hiring moments"""
         
         # Analyze interviewers/recruiters performance
-        interviewer_stats = defaultdict(lambda: {'interviewed': 0, 'hired': 0, 'success_rate': 0})
-        
-        for candidate in self.candidates:
-            interviewer = candidate.get('interviewed_by') or candidate.get('recruiter') or 'Unknown'
-            interviewer_stats[interviewer]['interviewed'] += 1
-            
-            if candidate.get('status') == 'Hired':
-                interviewer_stats[interviewer]['hired'] += 1
-        
-        # Calculate success rates
-        for interviewer, stats in interviewer_stats.items():
-            if stats['interviewed'] > 0:
-                stats['success_rate'] = (stats['hired'] / stats['interviewed']) * 100
+        agg = self.shared_aggregates()
+        snap, hired = agg['snapshot'], agg['hired']
+        size = len(snap.interviewer_labels)
+        interviewed_counts = np.bincount(snap.interviewer, minlength=size)
+        hired_counts = np.bincount(snap.interviewer, weights=hired, minlength=size)
+        interviewer_stats = {
+            name: {'interviewed': int(interviewed_counts[code]), 'hired': int(hired_counts[code]),
+                   'success_rate': float(hired_counts[code] / interviewed_counts[code] * 100)}
+            for code, name in enumerate(snap.interviewer_labels)
+        }
         
         # Find top performers
         top_performers = sorted(interviewer_stats.items(), 
@@ -381,39 +379,20 @@ class HRAnalyticsEngine:
                               reverse=True)[:5]
         
         # Analyze hiring by job roles
-        role_hiring = defaultdict(int)
-        for candidate in self.candidates:
-            if candidate.get('status') == 'Hired':
-                position = candidate.get('position', 'Unknown')
-                role_hiring[position] += 1
+        position_hires = np.bincount(snap.position[hired], minlength=len(snap.position_labels))
+        role_hiring = {(name or 'Unknown'): int(count)
+                       for name, count in zip(snap.position_labels, position_hires) if count}
         
         best_roles = sorted(role_hiring.items(), key=lambda x: x[1], reverse=True)[:5]
         
         # Create performance chart
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+        performers = [p[0] for p in top_performers]
+        rates = [p[1]['success_rate'] for p in top_performers]
+        roles = [r[0][:20] for r in best_roles]  # Truncate long role names
+        counts = [r[1] for r in best_roles]
         
-        # Top performers chart
-        if top_performers:
-            performers = [p[0] for p in top_performers]
-            rates = [p[1]['success_rate'] for p in top_performers]
-            
-            bars1 = ax1.bar(performers, rates, color='gold', alpha=0.7)
-            ax1.set_title('Top Performing Interviewers', fontsize=14, fontweight='bold')
-            ax1.set_ylabel('Success Rate (%)')
-            ax1.set_ylim(0, 100)
-            plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
-        
-        # Best roles chart
-        if best_roles:
-            roles = [r[0][:20] for r in best_roles]  # Truncate long role names
-            counts = [r[1] for r in best_roles]
-            
-            bars2 = ax2.bar(roles, counts, color='lightgreen', alpha=0.7)
-            ax2.set_title('Most Hired Positions', fontsize=14, fontweight='bold')
-            ax2.set_ylabel('Number Hired')
-            plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
-        
-        chart_path = self._save_chart(fig, 'top_performers.png')
+        series = {'performers': performers, 'rates': rates, 'roles': roles, 'counts': counts}
+        chart = {'type': 'top_performers', 'series': series, 'figsize': (16, 8)}
         
         insights = [
             f"🏆 Top performer: {top_performers[0][0]} ({top_performers[0][1]['success_rate']:.1f}% success rate)" if top_performers else "No performance data",
@@ -425,29 +404,19 @@ class HRAnalyticsEngine:
             'top_performers': dict(top_performers),
             'best_roles': dict(best_roles),
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     # 6. SALARY TREND ANALYSIS
+    @memoized_per_version
     def analyze_salary_trends(self) -> Dict[str, Any]:
         """Analyze salary offering trends and market positioning"""
         
-        salary_data = []
-        for candidate in self.candidates:
-            if candidate.get('offered_salary') and candidate.get('hired_date'):
-                try:
-                    salary = float(str(candidate['offered_salary']).replace(',', ''))
-                    date = datetime.strptime(candidate['hired_date'], '%Y-%m-%d')
-                    position = candidate.get('position', 'Unknown')
-                    salary_data.append({
-                        'salary': salary,
-                        'date': date,
-                        'position': position
-                    })
-                except:
-                    continue
-        
-        if len(salary_data) < 2:
+        agg = self.shared_aggregates()
+        snap = agg['snapshot']
+        rows = np.flatnonzero(~np.isnan(snap.salary) & (snap.salary != 0) & (snap.hired != MISSING_DAY))
+        
+        if len(rows) < 2:
             return {
                 'trend': 'No Data',
                 'insights': ['Insufficient salary data for analysis'],
@@ -455,55 +424,37 @@ class HRAnalyticsEngine:
             }
         
         # Sort by date
-        salary_data.sort(key=lambda x: x['date'])
+        rows = rows[np.argsort(snap.hired[rows], kind='stable')]
+        salaries = snap.salary[rows]
         
         # Calculate trend
-        recent_salaries = [s['salary'] for s in salary_data[-6:]]  # Last 6 hires
-        older_salaries = [s['salary'] for s in salary_data[:-6]]   # Previous hires
+        recent_salaries = salaries[-6:]  # Last 6 hires
+        older_salaries = salaries[:-6]   # Previous hires
         
-        recent_avg = np.mean(recent_salaries) if recent_salaries else 0
-        older_avg = np.mean(older_salaries) if older_salaries else recent_avg
+        recent_avg = recent_salaries.mean() if len(recent_salaries) else 0
+        older_avg = older_salaries.mean() if len(older_salaries) else recent_avg
         
         trend_pct = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
         trend_direction = "📈 INCREASING" if trend_pct > 0 else "📉 DECREASING"
         
         # Create salary trend chart
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-        
-        # Timeline chart
-        dates = [s['date'] for s in salary_data]
-        salaries = [s['salary'] for s in salary_data]
-        
-        ax1.plot(dates, salaries, marker='o', linewidth=2, markersize=6)
-        ax1.set_title('Salary Trends Over Time', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('Date')
-        ax1.set_ylabel('Salary')
-        ax1.grid(True, alpha=0.3)
+        dates = [datetime.fromordinal(int(day)) for day in snap.hired[rows]]
         
         # Department salary comparison
-        dept_salaries = defaultdict(list)
-        for s in salary_data:
-            dept = self._map_position_to_department(s['position'].lower())
-            dept_salaries[dept].append(s['salary'])
-        
-        dept_averages = {dept: np.mean(salaries) for dept, salaries in dept_salaries.items()}
-        
-        if dept_averages:
-            depts = list(dept_averages.keys())
-            avg_salaries = list(dept_averages.values())
-            
-            bars = ax2.bar(depts, avg_salaries, color='lightblue', alpha=0.7)
-            ax2.set_title('Average Salary by Department', fontsize=14, fontweight='bold')
-            ax2.set_ylabel('Average Salary')
-            plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
+        dept, dept_names = agg['department'][rows], agg['department_names']
+        sums = np.bincount(dept, weights=salaries, minlength=len(dept_names))
+        counts = np.bincount(dept, minlength=len(dept_names))
+        dept_averages = {name: float(sums[code] / counts[code]) for code, name in enumerate(dept_names) if counts[code]}
         
-        chart_path = self._save_chart(fig, 'salary_trends.png')
+        series = {'dates': dates, 'salaries': salaries.tolist(),
+                  'departments': list(dept_averages), 'department_averages': list(dept_averages.values())}
+        chart = {'type': 'salary_trends', 'series': series, 'figsize': (16, 8)}
         
         insights = [
             f"💰 Trend: {trend_direction} by {abs(trend_pct):.1f}%",
             f"📊 Current average: ${recent_avg:,.0f}",
             f"📈 Previous average: ${older_avg:,.0f}",
-            f"🎯 Total salary data points: {len(salary_data)}"
+            f"🎯 Total salary data points: {len(rows)}"
         ]
         
         return {
@@ -513,10 +464,11 @@ class HRAnalyticsEngine:
             'previous_average': older_avg,
             'department_averages': dept_averages,
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     # 7. ONBOARDING INSIGHTS
+    @memoized_per_version
     def analyze_onboarding_process(self) -> Dict[str, Any]:
         """Analyze onboarding efficiency and bottlenecks"""
         
@@ -528,10 +480,10 @@ class HRAnalyticsEngine:
             'workspace_setup': {'completed': 0, 'pending': 0, 'avg_days': 0}
         }
         
-        hired_candidates = [c for c in self.candidates if c.get('status') == 'Hired']
+        hired_count = self.shared_aggregates()['hired_count']
         
         # Simulate onboarding data (in real implementation, use actual onboarding tracking)
-        for candidate in hired_candidates:
+        for _ in range(hired_count):
             for step in onboarding_steps:
                 if np.random.random() > 0.3:  # 70% completion rate
                     onboarding_steps[step]['completed'] += 1
@@ -545,8 +497,6 @@ class HRAnalyticsEngine:
                             key=lambda x: x[1]['avg_days'], reverse=True)
         
         # Create onboarding chart
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-        
         steps = list(onboarding_steps.keys())
         avg_days = [onboarding_steps[s]['avg_days'] for s in steps]
         completion_rates = [(onboarding_steps[s]['completed'] / 
@@ -554,25 +504,13 @@ class HRAnalyticsEngine:
                           if (onboarding_steps[s]['completed'] + onboarding_steps[s]['pending']) > 0 else 0
                           for s in steps]
         
-        # Average days chart
-        bars1 = ax1.bar(steps, avg_days, color='orange', alpha=0.7)
-        ax1.set_title('Average Days per Onboarding Step', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Days')
-        plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
-        
-        # Completion rate chart
-        bars2 = ax2.bar(steps, completion_rates, color='green', alpha=0.7)
-        ax2.set_title('Onboarding Step Completion Rates', fontsize=14, fontweight='bold')
-        ax2.set_ylabel('Completion Rate (%)')
-        ax2.set_ylim(0, 100)
-        plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
-        
-        chart_path = self._save_chart(fig, 'onboarding_analysis.png')
+        series = {'steps': steps, 'avg_days': avg_days, 'completion_rates': completion_rates}
+        chart = {'type': 'onboarding_analysis', 'series': series, 'figsize': (16, 8)}
         
         insights = [
             f"🐌 Biggest bottleneck: {bottlenecks[0][0].replace('_', ' ').title()} ({bottlenecks[0][1]['avg_days']} days)",
             f"🚀 Fastest process: {bottlenecks[-1][0].replace('_', ' ').title()} ({bottlenecks[-1][1]['avg_days']} days)",
-            f"📊 Total hired candidates: {len(hired_candidates)}",
+            f"📊 Total hired candidates: {hired_count}",
             "🎯 Focus areas: ID allocation and ICT setup automation"
         ]
         
@@ -580,10 +518,11 @@ class HRAnalyticsEngine:
             'bottlenecks': dict(bottlenecks),
             'onboarding_stats': onboarding_steps,
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     # 8. PROBATION ASSESSMENT INSIGHTS
+    @memoized_per_version
     def analyze_probation_performance(self) -> Dict[str, Any]:
         """Analyze probation assessment by department"""
         
@@ -605,27 +544,12 @@ class HRAnalyticsEngine:
         best_dept = max(dept_probation.keys(), key=lambda x: dept_probation[x]['pass_rate'])
         
         # Create probation analysis chart
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-        
         depts = list(dept_probation.keys())
         pass_rates = [dept_probation[d]['pass_rate'] for d in depts]
         avg_scores = [dept_probation[d]['avg_score'] for d in depts]
         
-        # Pass rate chart
-        bars1 = ax1.bar(depts, pass_rates, color='lightcoral', alpha=0.7)
-        ax1.set_title('Probation Pass Rates by Department', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Pass Rate (%)')
-        ax1.set_ylim(0, 100)
-        plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
-        
-        # Average scores chart
-        bars2 = ax2.bar(depts, avg_scores, color='lightblue', alpha=0.7)
-        ax2.set_title('Average Probation Scores', fontsize=14, fontweight='bold')
-        ax2.set_ylabel('Average Score')
-        ax2.set_ylim(0, 100)
-        plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
-        
-        chart_path = self._save_chart(fig, 'probation_analysis.png')
+        series = {'departments': depts, 'pass_rates': pass_rates, 'avg_scores': avg_scores}
+        chart = {'type': 'probation_analysis', 'series': series, 'figsize': (16, 8)}
         
         insights = [
             f"🔴 Needs improvement: {worst_dept} ({dept_probation[worst_dept]['pass_rate']:.1f}% pass rate)",
@@ -639,10 +563,11 @@ class HRAnalyticsEngine:
             'best_department': best_dept,
             'department_stats': dept_probation,
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     # 9. MARKET SALARY COMPARISON
+    @memoized_per_version
     def analyze_market_salary_comparison(self) -> Dict[str, Any]:
         """Compare company salaries with market rates"""
         
@@ -656,26 +581,12 @@ class HRAnalyticsEngine:
         }
         
         # Create comparison chart
-        fig, ax = plt.subplots(figsize=(14, 8))
-        
         positions = list(market_data.keys())
         our_salaries = [market_data[p]['our_avg'] for p in positions]
         market_salaries = [market_data[p]['market_avg'] for p in positions]
         
-        x = np.arange(len(positions))
-        width = 0.35
-        
-        bars1 = ax.bar(x - width/2, our_salaries, width, label='Our Offer', alpha=0.7)
-        bars2 = ax.bar(x + width/2, market_salaries, width, label='Market Average', alpha=0.7)
-        
-        ax.set_title('Salary Comparison: Our Offers vs Market', fontsize=16, fontweight='bold')
-        ax.set_ylabel('Salary ($)')
-        ax.set_xticks(x)
-        ax.set_xticklabels(positions, rotation=45, ha='right')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        
-        chart_path = self._save_chart(fig, 'market_salary_comparison.png')
+        series = {'positions': positions, 'ours': our_salaries, 'market': market_salaries}
+        chart = {'type': 'market_salary_comparison', 'series': series, 'figsize': (14, 8)}
         
         # Analyze competitiveness
         above_market = sum(1 for p in market_data.values() if p['gap'] > 0)
@@ -696,7 +607,7 @@ class HRAnalyticsEngine:
             'above_market_count': above_market,
             'below_market_count': below_market,
             'insights': insights,
-            'chart_path': chart_path
+            'chart': chart
         }
     
     def _map_position_to_department(self, position: str) -> str:
@@ -718,28 +629,132 @@ class HRAnalyticsEngine:
         else:
             return 'General'
     
+    def iter_report(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(section, result) pairs of the comprehensive report, in the order they finish.
+        
+        Shared aggregates are computed first; then every analysis whose dependencies are
+        done runs in a thread pool. A finished analysis hands its chart to the chart
+        service right away, so charts render while the other analyses still compute.
+        A chart not ready within the chart service timeout is reported without a path.
+        """
+        self.shared_aggregates()
+        methods = {section: method for section, method, _ in REPORT_SECTIONS}
+        waiting = {section: set(deps) for section, _, deps in REPORT_SECTIONS}
+        done = set()
+        analyses = {}  # future -> section
+        charts = {}    # future -> (section, result, deadline)
+        
+        with ThreadPoolExecutor(max(1, REPORT_WORKERS), thread_name_prefix='report') as pool:
+            def launch_ready():
+                for section in [s for s, deps in waiting.items() if deps <= done]:
+                    del waiting[section]
+                    analyses[pool.submit(getattr(self, methods[section]), charts=False)] = section
+            
+            launch_ready()
+            while analyses or charts:
+                deadline = min((entry[2] for entry in charts.values()), default=None)
+                timeout = max(0, deadline - time.monotonic()) if deadline is not None else None
+                finished, _ = wait(list(analyses) + list(charts), timeout, FIRST_COMPLETED)
+                
+                for future in finished:
+                    if future in analyses:
+                        section = analyses.pop(future)
+                        result = future.result()
+                        done.add(section)
+                        chart = result.get('chart')
+                        if chart is None:
+                            yield section, result
+                            continue
+                        try:
+                            chart_future = chart_service.submit(chart['type'], chart['series'], chart['figsize'],
+                                                                self.chart_preset)
+                        except Exception as e:
+                            print(f"⚠️ Chart '{chart['type']}' could not be rendered: {e}")
+                            yield section, dict(result, chart_path=None)
+                            continue
+                        charts[chart_future] = (section, result, time.monotonic() + chart_service.timeout)
+                    else:
+                        section, result, _ = charts.pop(future)
+                        try:
+                            path = future.result()
+                        except Exception as e:
+                            print(f"⚠️ Chart '{result['chart']['type']}' could not be rendered: {e}")
+                            path = None
+                        yield section, dict(result, chart_path=path)
+                
+                # Charts past their deadline keep rendering into the cache for the next report
+                now = time.monotonic()
+                for future, (section, result, chart_deadline) in list(charts.items()):
+                    if chart_deadline <= now:
+                        del charts[future]
+                        print(f"⚠️ Chart '{result['chart']['type']}' not ready within {chart_service.timeout}s")
+                        yield section, dict(result, chart_path=None)
+                launch_ready()
+    
+    def stream_report(self, fp: TextIO) -> Dict[str, Any]:
+        """Write the comprehensive report to fp as one JSON object, a section at a time
+        as the analyses finish; returns the report in the usual section order"""
+        generated_at = datetime.now().isoformat()
+        fp.write('{\n  "generated_at": ' + json.dumps(generated_at))
+        fp.flush()
+        sections = {}
+        for section, result in self.iter_report():
+            sections[section] = result
+            body = json.dumps(result, indent=2, default=str).replace('\n', '\n  ')
+            fp.write(f',\n  {json.dumps(section)}: {body}')
+            fp.flush()
+        fp.write('\n}')
+        fp.flush()
+        
+        report = {'generated_at': generated_at}
+        report.update((section, sections[section]) for section, _, _ in REPORT_SECTIONS)
+        return report
+    
     def generate_comprehensive_report(self) -> Dict[str, Any]:
-        """Generate comprehensive HR analytics report"""
-        
-        report = {
-            'generated_at': datetime.now().isoformat(),
-            'hiring_success': self.analyze_hiring_success_rate(),
-            'monthly_performance': self.analyze_monthly_hiring_performance(),
-            'department_efficiency': self.analyze_department_interview_efficiency(),
-            'hiring_predictions': self.predict_hiring_timeline(),
-            'top_performers': self.analyze_top_performers(),
-            'salary_trends': self.analyze_salary_trends(),
-            'onboarding_analysis': self.analyze_onboarding_process(),
-            'probation_insights': self.analyze_probation_performance(),
-            'market_comparison': self.analyze_market_salary_comparison()
-        }
+        """Generate comprehensive HR analytics report (db/hr_analytics_report.json)"""
         
-        # Save report to file
+        # Stream to a temporary file so readers never see a half-written report
         report_path = os.path.join(self.db_folder, 'hr_analytics_report.json')
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        fd, tmp_path = tempfile.mkstemp(prefix='hr_analytics_report.', suffix='.tmp', dir=self.db_folder)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                report = self.stream_report(f)
+            os.replace(tmp_path, report_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
         
         return report
 
-# Initialize analytics engine
+# Analysis behind each analytics metric (served by /api/analytics/<metric>/series)
+METRICS = {
+    'hiring_success_rate': 'analyze_hiring_success_rate',
+    'monthly_hiring': 'analyze_monthly_hiring_performance',
+    'department_efficiency': 'analyze_department_interview_efficiency',
+    'hiring_prediction': 'predict_hiring_timeline',
+    'top_performers': 'analyze_top_performers',
+    'salary_trends': 'analyze_salary_trends',
+    'onboarding': 'analyze_onboarding_process',
+    'probation': 'analyze_probation_performance',
+    'market_salary': 'analyze_market_salary_comparison',
+}
+
+# Sections of the comprehensive report: (section, analysis, sections it must run after).
+# Predictions reuse the memoized hiring success analysis instead of computing it again.
+REPORT_SECTIONS = [
+    ('hiring_success', 'analyze_hiring_success_rate', ()),
+    ('monthly_performance', 'analyze_monthly_hiring_performance', ()),
+    ('department_efficiency', 'analyze_department_interview_efficiency', ()),
+    ('hiring_predictions', 'predict_hiring_timeline', ('hiring_success',)),
+    ('top_performers', 'analyze_top_performers', ()),
+    ('salary_trends', 'analyze_salary_trends', ()),
+    ('onboarding_analysis', 'analyze_onboarding_process', ()),
+    ('probation_insights', 'analyze_probation_performance', ()),
+    ('market_comparison', 'analyze_market_salary_comparison', ()),
+]
+
+# Initialize analytics engine (cheap: nothing is loaded until an analysis runs)
 analytics_engine = HRAnalyticsEngine()
@@ -0,0 +1,48 @@
+"""
+Analytics Series API for AION HR System
+Structured JSON behind /api/analytics/<metric>/series, so the browser draws the charts.
+
+For one metric the payload holds:
+- the engine chart's series, as Chart.js-ready panels (see charts.PANELS)
+- the engine's insights
+- the numbers behind the matching get_enhanced_* chat tool
+Nothing is rendered to PNG on this path. Payloads are cached per data version and
+carry a content ETag (see response_cache.py), so unchanged series answer 304.
+"""
+
+import json
+from typing import Any, Dict
+
+from analytics_engine import METRICS, analytics_engine
+from chart_cache import plain
+from response_cache import VersionedResponseCache
+
+
+class AnalyticsSeries:
+    def __init__(self, engine=analytics_engine):
+        self.engine = engine
+        self.metrics = sorted(METRICS)
+        self.cache = VersionedResponseCache(max_entries=len(METRICS))
+
+    def payload(self, metric: str) -> Dict[str, Any]:
+        """{'metric', 'chart': {'type', 'panels'} or None, 'insights', 'summary'} for one metric"""
+        from charts import chart_panels  # charts.py imports matplotlib
+        from tools import ENHANCED_DATA  # tools.py is only imported once a payload is built
+        result = getattr(self.engine, METRICS[metric])(charts=False)
+        chart = result.get('chart')
+        payload = {
+            'metric': metric,
+            'chart': {'type': chart['type'], 'panels': chart_panels(chart['type'], chart['series'])} if chart else None,
+            'insights': result.get('insights', []),
+            'summary': ENHANCED_DATA[metric](),
+        }
+        # NumPy numbers and dates as plain JSON values
+        return json.loads(json.dumps(payload, default=plain))
+
+    def get(self, metric: str) -> Dict[str, Any]:
+        """Cache entry ({'context', 'etag', 'last_modified', 'version'}) of a metric's payload"""
+        return self.cache.get(metric, self.engine.data_version(), lambda: self.payload(metric))
+
+
+# Global analytics series instance
+analytics_series = AnalyticsSeries()
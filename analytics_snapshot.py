@@ -0,0 +1,127 @@
+"""
+Columnar Analytics Snapshot for AION HR System
+NumPy column arrays over the candidate and job collections, for the analytics.
+
+Each candidate attribute the analytics group or filter by becomes one array:
+status codes, job / department / position / interviewer codes, applied, hired
+and interview day ordinals, salaries and scores. Metrics are then bincounts and
+masks over those arrays instead of loops over dicts. The snapshot is built from
+the typed records (models.py) and rebuilt only when the candidate or job data
+version changes.
+"""
+
+import datetime
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import Status, record_models
+from repository import repository
+
+
+STATUSES = list(Status)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+# Day ordinal of a missing date (real ordinals start at 1)
+MISSING_DAY = 0
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def factorize(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Integer codes for values plus the label of each code, in first-seen order"""
+    lookup: Dict[Any, int] = {}
+    codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int32, count=len(values))
+    return codes, list(lookup)
+
+
+def _days(dates: Sequence[Optional[datetime.date]]) -> np.ndarray:
+    return np.fromiter((d.toordinal() if d else MISSING_DAY for d in dates), dtype=np.int32, count=len(dates))
+
+
+def _floats(values: Sequence[Any]) -> np.ndarray:
+    def value(v):
+        try:
+            return float(str(v).replace(',', '')) if v not in (None, '') else np.nan
+        except ValueError:
+            return np.nan
+    return np.fromiter((value(v) for v in values), dtype=np.float64, count=len(values))
+
+
+def months(days: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 for day ordinals; -1 where the day is missing"""
+    result = (days - EPOCH_ORDINAL).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    return np.where(days == MISSING_DAY, -1, result)
+
+
+def month_label(month: int, fmt: str = '%Y-%m') -> str:
+    """Label of a months-since-1970 value, e.g. '2025-03' or 'March 2025'"""
+    return datetime.date(1970 + month // 12, month % 12 + 1, 1).strftime(fmt)
+
+
+def count_by_month(days: np.ndarray, masks: Sequence[np.ndarray] = ()) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """(months, rows per month, [rows per month where each mask holds]) over rows that have a day"""
+    month = months(days)
+    valid = month >= 0
+    ids, inverse = np.unique(month[valid], return_inverse=True)
+    totals = np.bincount(inverse, minlength=len(ids))
+    return ids, totals, [np.bincount(inverse, weights=m[valid], minlength=len(ids)).astype(np.int64) for m in masks]
+
+
+class CandidateSnapshot:
+    """Column arrays for one version of the candidate and job collections"""
+
+    def __init__(self, candidates, jobs, version: Any = None):
+        self.version = version
+        self.n = len(candidates)
+        job_departments = {job.job_id: job.department or 'Unknown' for job in jobs}
+
+        self.status = np.fromiter((STATUS_CODES[c.status] for c in candidates), dtype=np.int8, count=self.n)
+        # Status as stored, for breakdowns that show unknown statuses verbatim
+        self.status_text, self.status_text_labels = factorize([c.status_text or 'Unknown' for c in candidates])
+        self.job, self.job_labels = factorize([c.job_id for c in candidates])
+        self.department, self.department_labels = factorize(
+            [job_departments.get(c.job_id or '1', 'Unknown') for c in candidates])
+        self.position, self.position_labels = factorize([c.position for c in candidates])
+        self.interviewer, self.interviewer_labels = factorize([c.interviewer for c in candidates])
+        self.updater, self.updater_labels = factorize([c.get('status_updated_by', 'Unknown') for c in candidates])
+
+        self.applied = _days([c.applied for c in candidates])
+        self.hired = _days([c.hired for c in candidates])
+        self.interviewed = _days([c.interview for c in candidates])
+
+        self.salary = np.fromiter((np.nan if c.salary is None else c.salary for c in candidates),
+                                  dtype=np.float64, count=self.n)
+        self.final_salary = _floats([c.get('final_salary') for c in candidates])
+        self.match_score = _floats([c.get('match_score') for c in candidates])
+        self.interview_score = _floats([c.get('interview_score') for c in candidates])
+
+    def has_status(self, *statuses: Status) -> np.ndarray:
+        """Boolean mask of rows in any of the given statuses"""
+        return np.isin(self.status, [STATUS_CODES[s] for s in statuses])
+
+
+class AnalyticsSnapshots:
+    def __init__(self, repo=repository, models=record_models):
+        self.repo = repo
+        self.models = models
+        self.lock = threading.Lock()
+        self._snapshot: Optional[CandidateSnapshot] = None
+        self.stats = {'builds': 0}
+
+    def get(self) -> CandidateSnapshot:
+        """Snapshot of the current data; rebuilt only when candidates or jobs changed"""
+        # Version first: a write landing in between then only causes an extra rebuild
+        self.repo.load('candidates')
+        self.repo.load('jobs')
+        version = (self.repo.version('candidates'), self.repo.version('jobs'))
+        candidates = self.models.candidates()
+        jobs = self.models.jobs()
+        with self.lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                self._snapshot = CandidateSnapshot(candidates, jobs, version)
+                self.stats['builds'] += 1
+            return self._snapshot
+
+
+# Global analytics snapshot instance
+analytics_snapshots = AnalyticsSnapshots()
@@ -14,6 +14,15 @@ import datetime
 import sys
 from dotenv import load_dotenv
 from data import *
+from repository import index_key, repository
+from journal import atomic_write_json
+from locking import ConflictError
+from job_status import job_status_view
+from response_cache import dashboard_cache
+from search_index import search_index
+from models import latest_decisions, record_models
+from db_digest import db_digest
+from llm_cache import llm
 # ---------------------------------------------------------------------------------------------------------------------
 # ---------------------------------------------------------------------------------------------------------------------
 
@@ -52,9 +61,6 @@ from flask import render_template
 # Milestone-specific breakdown page
 @app.route('/milestones_breakup/<label>')
 def milestones_breakup_label(label):
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidates_file = os.path.join(db_folder, 'candidates.json')
-    jobs_file = os.path.join(db_folder, 'jobs.json')
     label_map = {
         'New': 'New',
         'Shortlisted': 'Shortlisted',
@@ -66,20 +72,8 @@ def milestones_breakup_label(label):
         'Total vacancies': 'Total Vacancies'
     }
     status = label_map.get(label.lower(), label)
-    candidates = []
-    jobs = []
-    if os.path.exists(candidates_file):
-        with open(candidates_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except Exception:
-                candidates = []
-    if os.path.exists(jobs_file):
-        with open(jobs_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except Exception:
-                jobs = []
+    candidates = fetch_candidate_data()
+    jobs = fetch_job_data()
     # Filtering logic
     if label.lower() == 'total_applicants':
         filtered_candidates = candidates
@@ -178,8 +172,7 @@ def milestones_breakup_label(label):
     # Calculate analytics for 'hired' milestone - ALWAYS calculate for all pages
     total_applicants = total_hired = success_rate = 0
     # Load all candidates from your data source (not just filtered) for ALL milestone pages
-    with open(candidates_file, 'r', encoding='utf-8') as f:
-        all_candidates = json.load(f)
+    all_candidates = fetch_candidate_data()
     total_applicants = len(all_candidates)
     hired_candidates = [c for c in all_candidates if str(c.get('status', '')).lower() == 'hired']
     total_hired = len(hired_candidates)
@@ -295,9 +288,6 @@ def milestones_breakup_label(label):
 
 @app.route('/breakdown/<label>')
 def breakdown(label):
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidates_file = os.path.join(db_folder, 'candidates.json')
-    jobs_file = os.path.join(db_folder, 'jobs.json')
     label_normalized = label.replace('_', ' ').strip().lower()
     label_normalized = label.replace('_', ' ').strip().lower()
     label_map = {
@@ -310,27 +300,15 @@ def breakdown(label):
         'hired': 'Hired'
     }
     status = label_map.get(label_normalized, label)
-    candidates = []
-    jobs = []
-    if os.path.exists(candidates_file):
-        with open(candidates_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except Exception:
-                candidates = []
-    if os.path.exists(jobs_file):
-        with open(jobs_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except Exception:
-                jobs = []
+    candidates = fetch_candidate_data()
+    jobs = fetch_job_data()
     # Build job_id to department map (always)
     job_id_to_dept = {str(j.get('job_id')): j.get('department', 'Unknown') for j in jobs}
     # Filtering logic
     if label_normalized == 'active applicants':
         filtered_candidates = [c for c in candidates if str(c.get('status', '')).strip().lower() not in ['resigned', 'fired']]
     else:
-        filtered_candidates = [c for c in candidates if str(c.get('status', '')).strip().lower() == status.lower()]
+        filtered_candidates = fetch_candidates_by_status(status)
     # Department and job analytics
     # Get all departments from jobs (or hardcode if needed)
     all_departments = sorted(set(j.get('department', 'Unknown') for j in jobs))
@@ -347,7 +325,7 @@ def breakdown(label):
             dept_data[dept] = 1
         job_title = None
         if job_id is not None:
-            job = next((j for j in jobs if str(j.get('job_id')) == str(job_id)), None)
+            job = fetch_job_by_id(job_id)
             if job:
                 job_title = job.get('job_title', 'Unknown')
         if job_title:
@@ -365,7 +343,7 @@ def breakdown(label):
             dept = c.get('department') or c.get('position') or 'Unknown'
         job_title = None
         if job_id is not None:
-            job = next((j for j in jobs if str(j.get('job_id')) == str(job_id)), None)
+            job = fetch_job_by_id(job_id)
             if job:
                 job_title = job.get('job_title', 'Unknown')
         # For 'hired', add date_of_joining if present
@@ -392,10 +370,9 @@ def breakdown(label):
     dept_hired_counts = []
     if label.lower() == 'hired':
         # Load all candidates from your data source (not just display_candidates, which are filtered)
-        with open('db/candidates.json', 'r', encoding='utf-8') as f:
-            all_candidates = json.load(f)
+        all_candidates = fetch_candidate_data()
         total_applicants = len(all_candidates)
-        hired_candidates = [c for c in all_candidates if str(c.get('status', '')).lower() == 'hired']
+        hired_candidates = fetch_candidates_by_status('hired')
         total_hired = len(hired_candidates)
         success_rate = round((total_hired / total_applicants) * 100, 1) if total_applicants else 0
         from collections import Counter
@@ -432,31 +409,69 @@ def breakdown(label):
 @app.route('/search', methods=['GET'])
 def search():
     query = request.args.get('q', '').strip()
-    results = []
+    page = request.args.get('page', 1, type=int)
+    results = {}
+    has_next = False
     if query:
-        # Example: search jobs and candidates (simple demo, replace with real logic)
-        db_folder = os.path.join(os.path.dirname(__file__), 'db')
-        jobs_file = os.path.join(db_folder, 'jobs.json')
-        candidates_file = os.path.join(db_folder, 'candidates.json')
-        if os.path.exists(jobs_file):
-            with open(jobs_file, 'r') as f:
-                try:
-                    jobs = json.load(f)
-                except Exception:
-                    jobs = []
-            for job in jobs:
-                if query.lower() in str(job).lower():
-                    results.append(f"Job: {job.get('job_title', '')}")
-        if os.path.exists(candidates_file):
-            with open(candidates_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except Exception:
-                    candidates = []
-            for cand in candidates:
-                if query.lower() in str(cand).lower():
-                    results.append(f"Candidate: {cand.get('name', '')}")
-    return render_template('search.html', results=results, role=request.cookies.get('role', ''))
+        # Ranked lookups in the inverted index (see search_index.py)
+        jobs = search_index.search('jobs', query, page=page)
+        candidates = search_index.search('candidates', query, page=page)
+        results = {'jobs': jobs['results'], 'candidates': candidates['results']}
+        has_next = jobs['has_next'] or candidates['has_next']
+    return render_template('search.html', results=results, page=page, has_next=has_next,
+                           role=request.cookies.get('role', ''))
+
+@app.route('/api/search')
+def api_search():
+    """Type-ahead search: ranked jobs and candidates for a (partial) query"""
+    query = request.args.get('q', '').strip()
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 10, type=int), 50)
+    jobs = search_index.search('jobs', query, page=page, per_page=per_page)
+    candidates = search_index.search('candidates', query, page=page, per_page=per_page)
+    return jsonify({
+        'query': query,
+        'page': page,
+        'jobs': [{'job_id': j.get('job_id'), 'job_title': j.get('job_title', ''),
+                  'department': j.get('department', ''), 'score': j['_score']} for j in jobs['results']],
+        'candidates': [{'id': c.get('id'), 'name': c.get('name', ''),
+                        'position': c.get('position', ''), 'score': c['_score']} for c in candidates['results']],
+        'total_jobs': jobs['total'],
+        'total_candidates': candidates['total'],
+        'has_next': jobs['has_next'] or candidates['has_next'],
+    })
+
+@app.route('/api/analytics/<metric>/series')
+def api_analytics_series(metric):
+    """Series of one analytics chart as JSON, for drawing it in the browser (ETag/304 like the dashboard)"""
+    from flask import make_response
+    from analytics_series import analytics_series  # the analytics engine (NumPy) loads on first use
+    if metric not in analytics_series.metrics:
+        return jsonify({'status': 'error', 'message': f'Unknown metric: {metric}',
+                        'metrics': analytics_series.metrics}), 404
+    try:
+        entry = analytics_series.get(metric)
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Error building series: {str(e)}'}), 500
+    if request.if_none_match.contains(entry['etag']):
+        response = make_response('', 304)
+    else:
+        response = jsonify(entry['context'])
+    response.set_etag(entry['etag'])
+    response.last_modified = entry['last_modified']
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+@app.route('/api/metrics')
+def api_metrics():
+    """Hit/miss counters of this process's caches, and of the shared LLM response cache"""
+    return jsonify({
+        'llm': llm.metrics(),
+        'db_digest': db_digest.stats,
+        'repository': repository.stats,
+        'dashboard_cache': dashboard_cache.stats,
+        'search_index': search_index.stats,
+    })
 
 @app.route('/customization', methods=['GET', 'POST'])
 def customization():
@@ -465,32 +480,18 @@ def customization():
     ]
     role = request.cookies.get('role', '')
     username = request.cookies.get('username', '')
-    user_file = os.path.join(db_folder, 'userdata.json')
     user_menu_order = None
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except Exception:
-                users = []
-        user = next((u for u in users if u.get('username') == username), None)
-        if user:
-            user_menu_order = user.get('menu_order')
+    users = fetch_user_data()
+    user = next((u for u in users if u.get('username') == username), None)
+    if user:
+        user_menu_order = user.get('menu_order')
     if request.method == 'POST':
         new_order = request.form.getlist('menu_order[]')
-        if os.path.exists(user_file):
-            with open(user_file, 'r') as f:
-                try:
-                    users = json.load(f)
-                except Exception:
-                    users = []
-        else:
-            users = []
+        users = fetch_user_data(for_update=True)
         for u in users:
             if u.get('username') == username:
                 u['menu_order'] = new_order
-        with open(user_file, 'w') as f:
-            json.dump(users, f, indent=4)
+        save_user_data(users)
         flash('Menu order saved!', 'success')
         user_menu_order = new_order
     menu_options = user_menu_order if user_menu_order else all_menu_options
@@ -519,31 +520,18 @@ def edit_template(template_name):
 @app.route('/delete_job/<job_id>', methods=['POST', 'GET'])
 def delete_job(job_id):
     # Load jobs
-    jobs = []
-    if os.path.exists(jobs_file):
-        with open(jobs_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except Exception:
-                jobs = []
+    jobs = fetch_job_data()
     # Remove job (compare as string)
     jobs = [j for j in jobs if str(j.get('job_id')) != str(job_id)]
     # Save jobs
-    with open(jobs_file, 'w') as f:
-        json.dump(jobs, f, indent=2)
+    save_job_data(jobs)
     flash('Job deleted successfully.', 'success')
     return redirect(url_for('jobs_list'))
 
 @app.route('/edit_job/<job_id>', methods=['GET', 'POST'])
 def edit_job(job_id):
     # Load jobs
-    jobs = []
-    if os.path.exists(jobs_file):
-        with open(jobs_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except Exception:
-                jobs = []
+    jobs = fetch_job_data(for_update=request.method == 'POST')
     # Find job (compare as string)
     job = next((j for j in jobs if str(j.get('job_id')) == str(job_id)), None)
     if not job:
@@ -556,8 +544,7 @@ def edit_job(job_id):
         job['job_type'] = request.form.get('job_type', job['job_type'])
         job['job_requirements'] = request.form.get('job_requirements', job['job_requirements'])
         # Save jobs
-        with open(jobs_file, 'w') as f:
-            json.dump(jobs, f, indent=2)
+        save_job_data(jobs)
         flash('Job updated successfully.', 'success')
         return redirect(url_for('jobs_list'))
     return render_template('edit_job.html', job=job)
@@ -568,29 +555,18 @@ def edit_job(job_id):
 
 
 
-@app.route('/')
-def index():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
+def build_dashboard_context():
+    """The values templates/dashboard.html renders; cached per data version by index()"""
     # --- Key Metrics for Dashboard ---
     # Total Applicants: count of all candidates
-    candidates = []
-    candidates_file = os.path.join(db_folder, 'candidates.json')
-    if os.path.exists(candidates_file):
-        with open(candidates_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except Exception:
-                candidates = []
-    total_applicants = len(candidates)
-    total_hired = sum(1 for c in candidates if c.get('status', '').lower() == 'hired')
+    candidates = fetch_candidate_data()
+    dashboard_totals = fetch_dashboard_totals()
+    total_applicants = dashboard_totals['total_applicants']
+    total_hired = dashboard_totals['total_hired']
     
     # Total Vacancies: count from total_all_vacancies_count function (includes all jobs)
     total_vacancies = total_all_vacancies_count()
     
-    # Breakdown of vacancies
-    open_vacancies = open_vacancies_count()
-    closed_vacancies = closed_vacancies_count()
-    
     # Hiring Success Rate: percent of applicants who were hired
     hiring_success_rate = 0
     if total_applicants > 0:
@@ -605,28 +581,26 @@ def index():
         pace_score = 0
         total_jobs_evaluated = 0
         
+        today = datetime.date.today()
         for job in jobs_list:
-            # Only evaluate open/active jobs
-            job_status = job.get('status', '').lower()
-            if job_status in ['closed', 'filled', 'cancelled']:
+            # Only evaluate open/active jobs (typed Job records: status lowered, posted_at parsed)
+            if job.status in ['closed', 'filled', 'cancelled']:
                 continue
             
-            posted_at = job.get('posted_at', '')
-            if not posted_at:
+            if not job.posted_at:
                 continue
             
             try:
-                posted_date = datetime.datetime.strptime(posted_at.split(' ')[0], '%Y-%m-%d')
-                weeks_elapsed = (datetime.datetime.now() - posted_date).days // 7
+                weeks_elapsed = (today - job.posted_at.date()).days // 7
                 
                 # Allow jobs that are 0+ weeks old (same day or older)
                 if weeks_elapsed < 0:  # Skip future jobs
                     continue
                 
-                job_id = job.get('job_id')
+                job_id = job.job_id
                 
                 # Find candidates for this job
-                job_candidates = [c for c in candidates_list if str(c.get('job_id')) == str(job_id)]
+                job_candidates = fetch_candidates_for_job(job_id)
                 
                 if not job_candidates:
                     # No candidates yet - evaluate based on time
@@ -714,378 +688,54 @@ def index():
         else:
             return 'Inadequate'
     
-    # Keep attrition_score for backward compatibility (can be removed later)
-    total_left = sum(1 for c in candidates if c.get('status', '').lower() in ['resigned', 'fired'])
-    attrition_score = 0
-    if total_hired > 0:
-        attrition_score = round((total_left / total_hired) * 100, 1)
-    # Pass to template
-    logged_in_cookie = request.cookies.get('logged_in')
-    is_logged_in = logged_in_cookie == 'true'
-    role = request.cookies.get('role', '') if is_logged_in else ''
-    username = request.cookies.get('username', '') if is_logged_in else ''
-    email = request.cookies.get('email', '') if is_logged_in else ''
-    phone = request.cookies.get('phone', '') if is_logged_in else ''
-    department = request.cookies.get('department', '') if is_logged_in else ''
-    time = datetime.datetime.now().strftime("%H:%M:%S")
-    greeting = "Good Morning" if int(time.split(':')[0]) < 12 else "Good Afternoon" if int(time.split(':')[0]) < 18 else "Good Evening"
-    access_control = []
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    user_file = os.path.join(db_folder, 'userdata.json')
-    # Load users only once
-    users = []
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except json.JSONDecodeError:
-                users = []
-    user = next((u for u in users if u['username'] == username), None)
-    if user:
-        access_control = user.get('access_control', [])
-
-    # Calculate candidates_managed_count and pending_approvals efficiently
-    candidates_list = fetch_candidate_data()
-    candidates_managed_count = len(candidates_list)
-    pending_approvals = fetch_pending_approvals()
-    pending_approvals_count = len(pending_approvals)
-
     # --- Add line chart data for dashboard (real-time, consistent with milestone) ---
+    # Month/week/day series come from per-day rollups kept by dashboard_metrics.py
     import json as pyjson
-    import calendar
-    from collections import defaultdict
-    def group_by_period(items, date_key, period):
-        grouped = defaultdict(int)
-        labels = []
-        now = datetime.datetime.now()
-        if period == 'month':
-            for i in range(5, -1, -1):
-                dt = (now - datetime.timedelta(days=30*i)).replace(day=1)
-                label = dt.strftime('%b %Y')
-                labels.append(label)
-                grouped[label] = 0
-            for item in items:
-                date_str = item.get(date_key)
-                try:
-                    dt = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-                    label = dt.strftime('%b %Y')
-                    if label in grouped:
-                        grouped[label] += 1
-                except Exception:
-                    continue
-        elif period == 'week':
-            for i in range(5, -1, -1):
-                start = now - datetime.timedelta(days=now.weekday() + 7*i)
-                label = f"Week {start.isocalendar()[1]} {start.year}"
-                labels.append(label)
-                grouped[label] = 0
-            for item in items:
-                date_str = item.get(date_key)
-                try:
-                    dt = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-                    label = f"Week {dt.isocalendar()[1]} {dt.year}"
-                    if label in grouped:
-                        grouped[label] += 1
-                except Exception:
-                    continue
-        elif period == 'day':
-            for i in range(6, -1, -1):
-                dt = now - datetime.timedelta(days=i)
-                label = dt.strftime('%Y-%m-%d')
-                labels.append(label)
-                grouped[label] = 0
-            for item in items:
-                date_str = item.get(date_key)
-                try:
-                    dt = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-                    label = dt.strftime('%Y-%m-%d')
-                    if label in grouped:
-                        grouped[label] += 1
-                except Exception:
-                    continue
-        return labels, [grouped[l] for l in labels]
+    jobs = record_models.jobs()
+    dashboard_series = fetch_dashboard_series()
 
-    jobs = []
-    if os.path.exists(jobs_file):
-        with open(jobs_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except Exception:
-                jobs = []
-    
-    # Create vacancy items based on actual job openings (not just job postings)
-    # For "overall" - all posted jobs regardless of status
-    overall_vacancy_items = []
-    for job in jobs:
-        posted_at = job.get('posted_at', '')
-        job_openings = job.get('job_openings', '0')
-        if posted_at:
-            try:
-                date_str = posted_at.split(' ')[0]
-                # Add multiple entries for each opening in this job
-                for _ in range(int(job_openings)):
-                    overall_vacancy_items.append({'date': date_str})
-            except (ValueError, Exception):
-                continue
-    
-    # For "active" - only open/active jobs (not closed/filled)
-    active_vacancy_items = []
-    for job in jobs:
-        posted_at = job.get('posted_at', '')
-        job_openings = job.get('job_openings', '0')
-        job_status = job.get('status', '').lower()
-        
-        # Calculate automatic status to ensure accuracy
-        automatic_status = calculate_automatic_job_status(job, candidates)
-        
-        # Consider job as active only if it's explicitly 'Open' or if no status and automatic is 'Open'
-        is_active = (
-            automatic_status.lower() == 'open' and 
-            job_status not in ['closed', 'filled', 'cancelled', 'expired', 'on hold']
-        )
-        
-        if posted_at and is_active:
-            try:
-                date_str = posted_at.split(' ')[0]
-                # Add multiple entries for each opening in this job
-                for _ in range(int(job_openings)):
-                    active_vacancy_items.append({'date': date_str})
-            except (ValueError, Exception):
-                continue
-    
-    # For "overall" - all hired candidates
-    overall_hired_candidates = [c for c in candidates if c.get('status', '').lower() == 'hired']
-    overall_hired_items = []
-    for c in overall_hired_candidates:
-        applied_date = c.get('applied_date', '')
-        if applied_date:
-            overall_hired_items.append({'date': applied_date})
-    
-    # For "active" - only recently hired candidates (within last 6 months)
-    active_hired_candidates = [c for c in candidates if c.get('status', '').lower() == 'hired']
-    active_hired_items = []
-    cutoff_date = (datetime.datetime.now() - datetime.timedelta(days=180)).strftime('%Y-%m-%d')
-    for c in active_hired_candidates:
-        applied_date = c.get('applied_date', '')
-        date_of_joining = c.get('date_of_joining', '')
-        # Use date_of_joining if available, otherwise applied_date
-        hire_date = date_of_joining if date_of_joining else applied_date
-        if hire_date and hire_date >= cutoff_date:
-            active_hired_items.append({'date': hire_date})
-
-    vacancy_hired_labels = {}
-    overall_vacancies_data = {}
-    overall_hired_data = {}
-    overall_applicants_data = {}
-    active_vacancies_data = {}
-    active_hired_data = {}
-    active_applicants_data = {}
-    pending_closed_jobs_data = {}
-    
-    for period in ['month', 'week', 'day']:
-        # Calculate for overall data
-        labels, overall_vacancies = group_by_period(overall_vacancy_items, 'date', period)
-        _, overall_hired = group_by_period(overall_hired_items, 'date', period)
-        
-        # Calculate all applicants for overall
-        all_applicants = []
-        for c in candidates:
-            applied_date = c.get('applied_date', '')
-            if applied_date:
-                all_applicants.append({'date': applied_date})
-        _, overall_applicant_counts = group_by_period(all_applicants, 'date', period)
-        
-        # Calculate for active data
-        _, active_vacancies = group_by_period(active_vacancy_items, 'date', period)
-        _, active_hired = group_by_period(active_hired_items, 'date', period)
-        
-        # Calculate active applicants (candidates who applied to jobs that are still open)
-        active_applicants = []
-        pending_from_closed_jobs = []
-        
-        for c in candidates:
-            applied_date = c.get('applied_date', '')
-            status = c.get('status', '').lower()
-            job_id = str(c.get('job_id', ''))
-            
-            # Skip if already hired, rejected, or withdrawn
-            if status in ['hired', 'rejected', 'withdrawn'] or not applied_date:
-                continue
-            
-            # Find the job this candidate applied to
-            candidate_job = None
-            for job in jobs:
-                if str(job.get('job_id', '')) == job_id:
-                    candidate_job = job
-                    break
-            
-            if candidate_job:
-                # Check if the job is still active using the same logic as active_vacancy_items
-                automatic_status = calculate_automatic_job_status(candidate_job, candidates)
-                job_status = candidate_job.get('status', '').lower()
-                
-                is_job_active = (
-                    automatic_status.lower() == 'open' and 
-                    job_status not in ['closed', 'filled', 'cancelled', 'expired', 'on hold']
-                )
-                
-                if is_job_active:
-                    active_applicants.append({'date': applied_date})
-                else:
-                    pending_from_closed_jobs.append({'date': applied_date})
-            else:
-                # If no job found or no job_id, consider as pending from closed jobs
-                pending_from_closed_jobs.append({'date': applied_date})
-        
-        _, active_applicant_counts = group_by_period(active_applicants, 'date', period)
-        _, pending_closed_job_counts = group_by_period(pending_from_closed_jobs, 'date', period)
-        
-        vacancy_hired_labels[period] = labels
-        overall_vacancies_data[period] = overall_vacancies
-        overall_hired_data[period] = overall_hired
-        overall_applicants_data[period] = overall_applicant_counts
-        active_vacancies_data[period] = active_vacancies
-        active_hired_data[period] = active_hired
-        active_applicants_data[period] = active_applicant_counts
-        pending_closed_jobs_data[period] = pending_closed_job_counts
-    vacancy_hired_labels_json = pyjson.dumps(vacancy_hired_labels)
-    overall_vacancies_data_json = pyjson.dumps(overall_vacancies_data)
-    overall_hired_data_json = pyjson.dumps(overall_hired_data)
-    overall_applicants_data_json = pyjson.dumps(overall_applicants_data)
-    active_vacancies_data_json = pyjson.dumps(active_vacancies_data)
-    active_hired_data_json = pyjson.dumps(active_hired_data)
-    active_applicants_data_json = pyjson.dumps(active_applicants_data)
-    pending_closed_jobs_data_json = pyjson.dumps(pending_closed_jobs_data)
-
-    # --- Candidate Spotlight Logic REMOVED ---
-    # (Removed to prevent unnecessary API calls and errors)
-
-    notification_file = os.path.join(db_folder, 'notifications.json')
-    all_notifications = []
-    if os.path.exists(notification_file):
-        with open(notification_file, 'r') as nf:
-            try:
-                all_notifications = json.load(nf)
-            except json.JSONDecodeError:
-                all_notifications = []
-    user_notifications = [n for n in all_notifications if n.get('for_role') == role]
-
-
-    # Use DB scan for upcoming interviews (and optionally other events)
-    from data import fetch_all_upcoming_events, fetch_recent_activities
-    all_upcoming = fetch_all_upcoming_events(limit=30)
-    all_events = [e for e in all_upcoming if e.get('type') == 'Interview']
-    recent_activities = fetch_recent_activities()
-
-    # No AI insights, only upcoming interviews and pending approvals will be shown in dashboard card.
-    # Prepare radar chart data for five candidate metrics
-    radar_labels = ['Active Applicants', 'Shortlisted', 'Interviewed', 'Ready to Hire', 'Hired']
-    radar_data = [
-        len(candidates_list),
-        sum(1 for c in candidates_list if c.get('status') == 'Shortlisted'),
-        sum(1 for c in candidates_list if c.get('status') == 'Interviewed'),
-        sum(1 for c in candidates_list if c.get('status') == 'Approved'),
-        sum(1 for c in candidates_list if c.get('status') == 'Hired')
-    ]
-    
     # Calculate hiring pace after jobs and candidates are loaded
     try:
         hiring_pace = calculate_hiring_pace(jobs, candidates)
     except Exception as e:
         print(f"Error calculating hiring pace: {e}")
         hiring_pace = 'Good'  # Default fallback
-    
-    import json as pyjson
-    radar_labels_json = pyjson.dumps(radar_labels)
-    radar_data_json = pyjson.dumps(radar_data)
+
+    # Only what the template renders
+    return {
+        'vacancy_hired_labels_json': pyjson.dumps(dashboard_series['labels']),
+        'overall_vacancies_data_json': pyjson.dumps(dashboard_series['overall_vacancies']),
+        'overall_hired_data_json': pyjson.dumps(dashboard_series['overall_hired']),
+        'overall_applicants_data_json': pyjson.dumps(dashboard_series['overall_applicants']),
+        'active_vacancies_data_json': pyjson.dumps(dashboard_series['active_vacancies']),
+        'active_hired_data_json': pyjson.dumps(dashboard_series['active_hired']),
+        'active_applicants_data_json': pyjson.dumps(dashboard_series['active_applicants']),
+        'total_applicants': total_applicants,
+        'total_vacancies': total_vacancies,
+        'total_hired': total_hired,
+        'hiring_success_rate': hiring_success_rate,
+        'hiring_pace': hiring_pace,
+    }
+
+@app.route('/')
+def index():
+    from flask import make_response
+    logged_in_cookie = request.cookies.get('logged_in')
+    is_logged_in = logged_in_cookie == 'true'
+    role = request.cookies.get('role', '') if is_logged_in else ''
+    username = request.cookies.get('username', '') if is_logged_in else ''
+
     # Always load dashboard data, but show login if not logged in
-    if is_logged_in:
-        return render_template('dashboard.html',
-                               logged_in=True,
-                               username=username,
-                               email=email,
-                               phone=phone,
-                               department=department,
-                               role=role,
-                               access_control=access_control,
-                               is_logged_in=is_logged_in,
-                               greeting=greeting,
-                               job_count=job_count(),
-                               openings=openings_count(),
-                               users=fetch_user_data(),
-                               user_count=total_users(),
-                               candidate_count=candidate_count(),
-                               candidates_list=candidates_list,
-                               candidates_managed_count=candidates_managed_count,
-                               notifications=user_notifications, 
-                               pending_approvals=pending_approvals,
-                               pending_approvals_count=pending_approvals_count,
-                               all_events=all_events,
-                               recent_activities=recent_activities,
-                               radar_labels_json=radar_labels_json,
-                               radar_data_json=radar_data_json,
-                               vacancy_hired_labels_json=vacancy_hired_labels_json,
-                               overall_vacancies_data_json=overall_vacancies_data_json,
-                               overall_hired_data_json=overall_hired_data_json,
-                               overall_applicants_data_json=overall_applicants_data_json,
-                               active_vacancies_data_json=active_vacancies_data_json,
-                               active_hired_data_json=active_hired_data_json,
-                               active_applicants_data_json=active_applicants_data_json,
-                               pending_closed_jobs_data_json=pending_closed_jobs_data_json,
-                               total_applicants=total_applicants,
-                               total_vacancies=total_vacancies,
-                               open_vacancies=open_vacancies,
-                               closed_vacancies=closed_vacancies,
-                               total_hired=total_hired,
-                               hiring_success_rate=hiring_success_rate,
-                               hiring_pace=hiring_pace,
-                               attrition_score=attrition_score
-                               
-                               )
+    entry = dashboard_cache.get((role, username), fetch_data_version(), build_dashboard_context)
+    if request.if_none_match.contains(entry['etag']):
+        response = make_response('', 304)
     else:
-        # Show dashboard with default/empty values for not logged in
-        return render_template('dashboard.html',
-                               logged_in=False,
-                               username='',
-                               email='',
-                               phone='',
-                               department='',
-                               role='',
-                               access_control=[],
-                               is_logged_in=False,
-                               greeting=greeting,
-                               job_count=job_count(),
-                               openings=openings_count(),
-                               users=fetch_user_data(),
-                               user_count=total_users(),
-                               candidate_count=candidate_count(),
-                               candidates_list=[],
-                               candidates_managed_count=0,
-                               notifications=[], 
-                               pending_approvals=[],
-                               pending_approvals_count=0,
-                               all_events=[],
-                               recent_activities=[],
-                               radar_labels_json=radar_labels_json,
-                               radar_data_json=radar_data_json,
-                               vacancy_hired_labels_json=vacancy_hired_labels_json,
-                               overall_vacancies_data_json=overall_vacancies_data_json,
-                               overall_hired_data_json=overall_hired_data_json,
-                               overall_applicants_data_json=overall_applicants_data_json,
-                               active_vacancies_data_json=active_vacancies_data_json,
-                               active_hired_data_json=active_hired_data_json,
-                               active_applicants_data_json=active_applicants_data_json,
-                               pending_closed_jobs_data_json=pending_closed_jobs_data_json,
-                               total_applicants=total_applicants,
-                               total_vacancies=total_vacancies,
-                               open_vacancies=open_vacancies,
-                               closed_vacancies=closed_vacancies,
-                               total_hired=total_hired,
-                               hiring_success_rate=hiring_success_rate,
-                               hiring_pace=hiring_pace,
-                               attrition_score=attrition_score,
-                               system_ai_insight=None
-                               )
+        response = make_response(render_template('dashboard.html', **entry['context']))
+    response.set_etag(entry['etag'])
+    response.last_modified = entry['last_modified']
+    # Per-user page: browsers and the proxy may store it but must revalidate every time
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
 # Regenerate System Insights API
 @app.route('/regenerate_system_insights', methods=['POST'])
 def regenerate_system_insights():
@@ -1093,19 +743,18 @@ def regenerate_system_insights():
     Regenerates the system-wide AI insights and returns them as JSON.
     """
     try:
-        from Aion import chat_with_bot, SYSTEM_PROMPT
-        from data import fetch_all_db_data
+        from Aion import SYSTEM_PROMPT
         cache = {}
-        all_data = fetch_all_db_data()
         user_input = (
             "Using only the following internal data from our system, provide 3 concise, actionable insights that analyze: "
             "1. Candidate performance trends and analytics (e.g., strengths, weaknesses, hiring outcomes, probation results). "
             "2. Job posting effectiveness and analytics (e.g., which postings attract the best candidates, match rates, bottlenecks). "
             "3. Process flow and system-wide analytics (e.g., approval cycles, onboarding, areas for improvement in our workflow). "
             "Do not reference external platforms, generic advice, or invent information. Only use the data provided. "
-            "Use bullet points. Data: " + json.dumps(all_data, ensure_ascii=False)
+            "Use bullet points. Data: " + db_digest.text()
         )
-        insight = chat_with_bot(user_input, system_prompt=SYSTEM_PROMPT)
+        # Deterministic and cached: regenerating over unchanged data costs no API call
+        insight = llm.chat([{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": user_input}])
         cache['system_ai_insight'] = markdown.markdown(insight)
         # Optionally update dashboard_ai_cache.json
         cache_file = os.path.join(os.path.dirname(__file__), 'db', 'dashboard_ai_cache.json')
@@ -1115,8 +764,7 @@ def regenerate_system_insights():
         except Exception:
             old_cache = {}
         old_cache['system_ai_insight'] = cache['system_ai_insight']
-        with open(cache_file, 'w') as f:
-            json.dump(old_cache, f, indent=2)
+        atomic_write_json(cache_file, old_cache, indent=2)
         return jsonify({'success': True, 'system_ai_insight': cache['system_ai_insight']})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1131,18 +779,9 @@ def login():
         return render_template('login.html')
     username = request.form.get('username')
     password = request.form.get('password')
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    user_file = os.path.join(db_folder, 'userdata.json')
     if not username or not password:
         return jsonify({'message': 'Username and password required'}), 400
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except json.JSONDecodeError:
-                users = []
-    else:
-        users = []
+    users = fetch_user_data()
     user = next((u for u in users if u['username'] == username and u['password'] == password), None)
     if user:
         from flask import make_response
@@ -1214,21 +853,9 @@ def signup():
             'role': role,
             'access_control': access_control
         }
-        db_folder = os.path.join(os.path.dirname(__file__), 'db')
-        if not os.path.exists(db_folder):
-            os.makedirs(db_folder)
-        user_file = os.path.join(db_folder, 'userdata.json')
-        if os.path.exists(user_file):
-            with open(user_file, 'r') as f:
-                try:
-                    users = json.load(f)
-                except json.JSONDecodeError:
-                    users = []
-        else:
-            users = []
+        users = fetch_user_data(for_update=True)
         users.append(user_data)
-        with open(user_file, 'w') as f:
-            json.dump(users, f, indent=4)
+        save_user_data(users)
         response = jsonify({'message': 'Signup successful'})
         response.set_cookie('logged_in', 'true', httponly=True, secure=False)
         response.set_cookie('username', username, httponly=True, secure=False)
@@ -1254,41 +881,11 @@ def signup():
 
 @app.route('/jobs_list')
 def jobs_list():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    job_file = os.path.join(db_folder, 'jobs.json')
-    jobs = []
     view = request.args.get('view', 'table').lower()
     if view not in ('table', 'card'):
         view = 'table'
-    if os.path.exists(job_file):
-        with open(job_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
-    
-    # Load candidates for automatic status calculation
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    candidates = []
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-    
-    # Update job statuses automatically
-    status_updated = False
-    for job in jobs:
-        automatic_status = calculate_automatic_job_status(job, candidates)
-        if job.get('status', '').lower() != automatic_status.lower():
-            job['status'] = automatic_status
-            status_updated = True
-    
-    # Save updated jobs if any status changed
-    if status_updated:
-        with open(job_file, 'w') as f:
-            json.dump(jobs, f, indent=4)
+    # Statuses come from the materialized view, so listing jobs never writes jobs.json
+    jobs = fetch_jobs_with_status()
     
     return render_template('jobs_list.html', jobs=jobs ,role=request.cookies.get('role', '') ,view=view)
 
@@ -1302,16 +899,7 @@ def post_jobs():
         return redirect(url_for('login'))
     if request.method == 'POST':
         # Load jobs and determine next job_id
-        db_folder = os.path.join(os.path.dirname(__file__), 'db')
-        job_file = os.path.join(db_folder, 'jobs.json')
-        if os.path.exists(job_file):
-            with open(job_file, 'r') as f:
-                try:
-                    jobs = json.load(f)
-                except json.JSONDecodeError:
-                    jobs = []
-        else:
-            jobs = []
+        jobs = fetch_job_data(for_update=True)
         # Find max job_id (skip nulls and non-integer ids)
         max_id = 0
         for job in jobs:
@@ -1386,8 +974,7 @@ def post_jobs():
             'posted_at': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         jobs.append(job_data)
-        with open(job_file, 'w') as f:
-            json.dump(jobs, f, indent=4)
+        save_job_data(jobs)
         return redirect(url_for('jobs_list'))
     return render_template('post_jobs.html', is_logged_in=is_logged_in , role=request.cookies.get('role', ''))
 
@@ -1397,7 +984,8 @@ def post_jobs():
 
 @app.route('/manage_candidates')
 def manage_candidates():
-    candidates_list = fetch_candidate_data()
+    # Copy the records - the cached list is shared with other requests
+    candidates_list = [dict(c) for c in fetch_candidate_data()]
     # Show onboarding status for hired candidates
     for candidate in candidates_list:
         if candidate.get('status') == 'Hired' and 'onboarding' in candidate:
@@ -1408,18 +996,11 @@ def manage_candidates():
 
     # removed duplicate import of threading
 
-def generate_probation_insights_async(candidate_id, pa, candidate_file):
+def generate_probation_insights_async(candidate_id, pa):
     import hashlib, json, markdown
     try:
-        # Load candidates from file
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except Exception:
-                    candidates = []
-        else:
-            candidates = []
+        # Load a private copy of the candidates
+        candidates = fetch_candidate_data(for_update=True)
         candidate = next((c for c in candidates if c.get('id') == candidate_id), None)
         if not candidate:
             return
@@ -1439,8 +1020,9 @@ def generate_probation_insights_async(candidate_id, pa, candidate_file):
                     or not candidate['probation_assessment_insights'].get(month_str)
                 ):
                     user_input = f"Summarize the following probation assessment data for month {month}. Only use the information provided. Do not invent or assume anything. Be concise and factual.\nAssessment Data: {json.dumps(pa_month, ensure_ascii=False)}"
-                    from Aion import chat_with_bot, SYSTEM_PROMPT
-                    insight = chat_with_bot(user_input, system_prompt=SYSTEM_PROMPT)
+                    from Aion import SYSTEM_PROMPT
+                    insight = llm.chat([{"role": "system", "content": SYSTEM_PROMPT},
+                                        {"role": "user", "content": user_input}])
                     try:
                         insight_html = markdown.markdown(insight)
                     except Exception:
@@ -1449,8 +1031,7 @@ def generate_probation_insights_async(candidate_id, pa, candidate_file):
                     candidate[insight_key] = pa_month_hash
                     updated = True
         if updated:
-            with open(candidate_file, 'w') as f:
-                json.dump(candidates, f, indent=4)
+            save_candidate_data(candidates)
     except Exception as e:
         pass
     show_send_for_approval = False
@@ -1489,15 +1070,7 @@ def generate_probation_insights_async(candidate_id, pa, candidate_file):
                 show_offer_letter = True
         # Add more status-based logic as needed
         # Fetch notifications for the user
-        notification_file = os.path.join(os.path.dirname(__file__), 'db', 'notifications.json')
-        if os.path.exists(notification_file):
-            with open(notification_file, 'r') as nf:
-                try:
-                    notifications = json.load(nf)
-                except json.JSONDecodeError:
-                    notifications = []
-        else:
-            notifications = []
+        notifications = fetch_notification_data()
         user_notifications = [n for n in notifications if n.get('candidate_id') == candidate_id and n.get('for_role') == role]
         return render_template('candidate_profile.html', candidate=candidate, role=role,
                               schedule_interview=schedule_interview,
@@ -1576,15 +1149,9 @@ def upload_cv():
     job_id = request.form.get('job_id')
     # Get minimum match score from job data
     min_match_score = 0
-    job_file = os.path.join(db_folder, 'jobs.json')
     job_data = None
-    if job_id and os.path.exists(job_file):
-        with open(job_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
-        for job in jobs:
+    if job_id:
+        for job in fetch_job_data():
             if str(job.get('job_id')) == str(job_id):
                 job_data = job
                 break
@@ -1607,17 +1174,6 @@ def upload_cv():
             candidate_data['match_score'] = 0
     else:
         candidate_data['match_score'] = 0
-    # Save candidate to global candidates.json
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-    else:
-        candidates = []
-    candidate_data['id'] = len(candidates) + 1
     candidate_data['job_id'] = str(job_id) if job_id is not None else None
     
     # Add initial status tracking
@@ -1636,20 +1192,14 @@ def upload_cv():
         'update_type': 'cv_upload'
     }]
     
-    candidates.append(candidate_data)
-    with open(candidate_file, 'w') as f:
-        json.dump(candidates, f, indent=4)
+    # Save candidate to global candidates.json; the id is allocated under the candidates lock
+    def append_candidate(candidates):
+        candidate_data['id'] = len(candidates) + 1
+        candidates.append(candidate_data)
+    mutate_candidates(append_candidate)
     # Save candidate to job-specific file for job details page
     if job_id is not None:
-        job_cv_file = os.path.join(db_folder, f'job_{job_id}_cvs.json')
-        if os.path.exists(job_cv_file):
-            with open(job_cv_file, 'r') as f:
-                try:
-                    job_cvs = json.load(f)
-                except json.JSONDecodeError:
-                    job_cvs = []
-        else:
-            job_cvs = []
+        job_cv_file = f'job_{job_id}_cvs.json'
         # Prepare minimal CV info for job details page
         job_cv_info = {
             'candidate_id': candidate_data['id'],
@@ -1657,9 +1207,7 @@ def upload_cv():
             'candidate_email': candidate_data.get('email', ''),
             'cv_link': resume_path  # relative path for url_for
         }
-        job_cvs.append(job_cv_info)
-        with open(job_cv_file, 'w') as f:
-            json.dump(job_cvs, f, indent=4)
+        repository.mutate_records(job_cv_file, lambda job_cvs: job_cvs.append(job_cv_info))
     # Redirect to manage_candidates so the list is always refreshed
     return redirect(url_for('manage_candidates'))
 
@@ -1691,55 +1239,43 @@ def schedule_interview():
             candidate_id = int(candidate_id)
         except ValueError:
             return jsonify({'success': False, 'message': 'Invalid candidate ID format'}), 400
-        candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except json.JSONDecodeError:
-                    candidates = []
-        else:
-            candidates = []
-        for c in candidates:
-            if c.get('id') == candidate_id:
-                # Store previous status for audit trail
-                previous_status = c.get('status', '')
-                
-                c['interview_date'] = interview_date
-                c['interview_time'] = interview_time
-                c['intervier'] = intervier
-                c['status'] = 'Interview Scheduled'
-                
-                # Set specific date field for timeline display
-                c['interview_scheduled_date'] = datetime.datetime.now().strftime('%Y-%m-%d')
-                
-                # Track who scheduled the interview (status update)
-                c['status_updated_by'] = request.cookies.get('username', 'Unknown')
-                c['status_updated_by_role'] = request.cookies.get('role', 'Unknown')
-                c['status_updated_at'] = datetime.datetime.now().isoformat()
-                c['previous_status'] = previous_status
-                
-                # Initialize status_history if it doesn't exist
-                if 'status_history' not in c:
-                    c['status_history'] = []
-                
-                # Add to status history
-                c['status_history'].append({
-                    'from_status': previous_status,
-                    'to_status': 'Interview Scheduled',
-                    'updated_by': request.cookies.get('username', 'Unknown'),
-                    'updated_by_role': request.cookies.get('role', 'Unknown'),
-                    'updated_at': datetime.datetime.now().isoformat(),
-                    'update_type': 'interview_scheduled',
-                    'interview_date': interview_date,
-                    'interview_time': interview_time,
-                    'interviewer': intervier
-                })
-                break
-        else:
+        c = fetch_candidate_for_update(candidate_id)
+        if c is None:
             return jsonify({'success': False, 'message': 'Candidate not found'}), 404
-        with open(candidate_file, 'w') as f:
-            json.dump(candidates, f, indent=4)
+        # Store previous status for audit trail
+        previous_status = c.get('status', '')
+        
+        c['interview_date'] = interview_date
+        c['interview_time'] = interview_time
+        c['intervier'] = intervier
+        c['status'] = 'Interview Scheduled'
+        
+        # Set specific date field for timeline display
+        c['interview_scheduled_date'] = datetime.datetime.now().strftime('%Y-%m-%d')
+        
+        # Track who scheduled the interview (status update)
+        c['status_updated_by'] = request.cookies.get('username', 'Unknown')
+        c['status_updated_by_role'] = request.cookies.get('role', 'Unknown')
+        c['status_updated_at'] = datetime.datetime.now().isoformat()
+        c['previous_status'] = previous_status
+        
+        # Initialize status_history if it doesn't exist
+        if 'status_history' not in c:
+            c['status_history'] = []
+        
+        # Add to status history
+        c['status_history'].append({
+            'from_status': previous_status,
+            'to_status': 'Interview Scheduled',
+            'updated_by': request.cookies.get('username', 'Unknown'),
+            'updated_by_role': request.cookies.get('role', 'Unknown'),
+            'updated_at': datetime.datetime.now().isoformat(),
+            'update_type': 'interview_scheduled',
+            'interview_date': interview_date,
+            'interview_time': interview_time,
+            'interviewer': intervier
+        })
+        edit_candidate_data(candidate_id, c)
         # Redirect to the candidate's profile page after scheduling the interview
         return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=request.cookies.get('role', ''), schedule_interview=True))
     except Exception as e:
@@ -1798,53 +1334,40 @@ def interview_analysis():
         score = extract_score_from_summary(summary)
 
         # Update candidate profile with analysis results
-        candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except json.JSONDecodeError:
-                    candidates = []
-        else:
-            candidates = []
-
-        for c in candidates:
-            if c.get('id') == candidate_id:
-                # Store previous status for audit trail
-                previous_status = c.get('status', '')
-                
-                c['interview_transcript'] = transcript
-                c['ai_interview_report'] = summary
-                c['interview_score'] = score
-                c['status'] = 'Interviewed'  # Changed from 'Interview Analyzed' to 'Interviewed'
-                c['interview_analyzed_at'] = datetime.datetime.now().isoformat()
-                
-                # Set specific date field for timeline display
-                c['interviewed_date'] = datetime.datetime.now().strftime('%Y-%m-%d')
-                
-                # Track who updated the status (interview analysis)
-                c['status_updated_by'] = 'System (Interview Analysis)'
-                c['status_updated_by_role'] = 'Automated'
-                c['status_updated_at'] = datetime.datetime.now().isoformat()
-                c['previous_status'] = previous_status
-                
-                # Initialize status_history if it doesn't exist
-                if 'status_history' not in c:
-                    c['status_history'] = []
-                
-                # Add to status history
-                c['status_history'].append({
-                    'from_status': previous_status,
-                    'to_status': 'Interviewed',
-                    'updated_by': 'System (Interview Analysis)',
-                    'updated_by_role': 'Automated',
-                    'updated_at': datetime.datetime.now().isoformat(),
-                    'update_type': 'interview_analysis'
-                })
-                break
-
-        with open(candidate_file, 'w') as f:
-            json.dump(candidates, f, indent=4)
+        c = fetch_candidate_for_update(candidate_id)
+        if c is not None:
+            # Store previous status for audit trail
+            previous_status = c.get('status', '')
+            
+            c['interview_transcript'] = transcript
+            c['ai_interview_report'] = summary
+            c['interview_score'] = score
+            c['status'] = 'Interviewed'  # Changed from 'Interview Analyzed' to 'Interviewed'
+            c['interview_analyzed_at'] = datetime.datetime.now().isoformat()
+            
+            # Set specific date field for timeline display
+            c['interviewed_date'] = datetime.datetime.now().strftime('%Y-%m-%d')
+            
+            # Track who updated the status (interview analysis)
+            c['status_updated_by'] = 'System (Interview Analysis)'
+            c['status_updated_by_role'] = 'Automated'
+            c['status_updated_at'] = datetime.datetime.now().isoformat()
+            c['previous_status'] = previous_status
+            
+            # Initialize status_history if it doesn't exist
+            if 'status_history' not in c:
+                c['status_history'] = []
+            
+            # Add to status history
+            c['status_history'].append({
+                'from_status': previous_status,
+                'to_status': 'Interviewed',
+                'updated_by': 'System (Interview Analysis)',
+                'updated_by_role': 'Automated',
+                'updated_at': datetime.datetime.now().isoformat(),
+                'update_type': 'interview_analysis'
+            })
+            edit_candidate_data(candidate_id, c)
 
         return jsonify({
             'success': True,
@@ -1888,65 +1411,55 @@ def update_candidate_status():
             candidate_id = int(candidate_id)
         except Exception:
             pass
-        candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except json.JSONDecodeError:
-                    candidates = []
-        else:
-            candidates = []
-        candidate = None
-        for c in candidates:
-            if c.get('id') == candidate_id:
-                # Store previous status for audit trail
-                previous_status = c.get('status', '')
-                
-                # Update status
-                c['status'] = new_status
-                
-                # Track who updated the status and when
-                current_timestamp = datetime.datetime.now().isoformat()
-                current_date = datetime.datetime.now().strftime('%Y-%m-%d')
-                c['status_updated_by'] = request.cookies.get('username', 'Unknown')
-                c['status_updated_by_role'] = request.cookies.get('role', 'Unknown')
-                c['status_updated_at'] = current_timestamp
-                c['previous_status'] = previous_status
-                
-                # Set specific date fields based on new status for timeline display
-                if new_status == 'Shortlisted':
-                    c['shortlisted_date'] = current_date
-                elif new_status == 'Interview Scheduled':
-                    c['interview_scheduled_date'] = current_date
-                elif new_status == 'Interviewed':
-                    c['interviewed_date'] = current_date
-                elif new_status == 'Approved':
-                    c['approved_date'] = current_date
-                elif new_status == 'Selected':
-                    c['selected_date'] = current_date
-                elif new_status == 'Hired':
-                    c['hired_date'] = current_date
-                elif new_status == 'Onboarding':
-                    c['onboarding_date'] = current_date
-                
-                # Initialize status_history if it doesn't exist
-                if 'status_history' not in c:
-                    c['status_history'] = []
-                
-                # Add to status history
-                c['status_history'].append({
-                    'from_status': previous_status,
-                    'to_status': new_status,
-                    'updated_by': request.cookies.get('username', 'Unknown'),
-                    'updated_by_role': request.cookies.get('role', 'Unknown'),
-                    'updated_at': current_timestamp,
-                    'update_type': 'manual_status_update'
-                })
-                
-                candidate = c
-                break
-        else:
+
+        def apply_status(c):
+            # Store previous status for audit trail
+            previous_status = c.get('status', '')
+            
+            # Update status
+            c['status'] = new_status
+            
+            # Track who updated the status and when
+            current_timestamp = datetime.datetime.now().isoformat()
+            current_date = datetime.datetime.now().strftime('%Y-%m-%d')
+            c['status_updated_by'] = request.cookies.get('username', 'Unknown')
+            c['status_updated_by_role'] = request.cookies.get('role', 'Unknown')
+            c['status_updated_at'] = current_timestamp
+            c['previous_status'] = previous_status
+            
+            # Set specific date fields based on new status for timeline display
+            if new_status == 'Shortlisted':
+                c['shortlisted_date'] = current_date
+            elif new_status == 'Interview Scheduled':
+                c['interview_scheduled_date'] = current_date
+            elif new_status == 'Interviewed':
+                c['interviewed_date'] = current_date
+            elif new_status == 'Approved':
+                c['approved_date'] = current_date
+            elif new_status == 'Selected':
+                c['selected_date'] = current_date
+            elif new_status == 'Hired':
+                c['hired_date'] = current_date
+            elif new_status == 'Onboarding':
+                c['onboarding_date'] = current_date
+            
+            # Initialize status_history if it doesn't exist
+            if 'status_history' not in c:
+                c['status_history'] = []
+            
+            # Add to status history
+            c['status_history'].append({
+                'from_status': previous_status,
+                'to_status': new_status,
+                'updated_by': request.cookies.get('username', 'Unknown'),
+                'updated_by_role': request.cookies.get('role', 'Unknown'),
+                'updated_at': current_timestamp,
+                'update_type': 'manual_status_update'
+            })
+
+        # Re-applied on fresh data if another request changed the candidate meanwhile
+        candidate = mutate_candidate(candidate_id, apply_status)
+        if candidate is None:
             return jsonify({'success': False, 'message': 'Candidate not found'}), 404
         
         # Send notifications based on status change and role
@@ -1956,29 +1469,18 @@ def update_candidate_status():
         # Debug logging
         print(f"DEBUG: Status changed to '{new_status}' by role '{current_user_role}' user '{current_username}'")
         
-        # Load and create notifications for specific status changes
-        notification_file = os.path.join(os.path.dirname(__file__), 'db', 'notifications.json')
-        if os.path.exists(notification_file):
-            with open(notification_file, 'r') as f:
-                try:
-                    notifications = json.load(f)
-                except json.JSONDecodeError:
-                    notifications = []
-        else:
-            notifications = []
-        
         # Send notification when Discipline Manager shortlists a candidate
         if new_status == "Shortlisted" and current_user_role == "Discipline Manager":
-            print(f"DEBUG: Creating shortlist notification for {target_dept_manager}")
             # Determine which Department Manager to notify based on candidate's department/position
             position = candidate.get('position', '').lower()
             if 'moe' in position or 'electrical' in position or 'instrumentation' in position:
                 target_dept_manager = 'Department Manager (MOE)'
             else:
                 target_dept_manager = 'Department Manager (MOP)'
+            print(f"DEBUG: Creating shortlist notification for {target_dept_manager}")
             
             shortlist_notification = {
-                'id': len(notifications) + 1,
+                'id': None,  # assigned by add_notifications
                 'candidate_id': candidate_id,
                 'candidate_name': candidate.get('name', 'Unknown'),
                 'position': candidate.get('position', ''),
@@ -1994,14 +1496,14 @@ def update_candidate_status():
                 'action_required': True,
                 'notification_type': 'pop_up'
             }
-            notifications.append(shortlist_notification)
+            add_notifications(shortlist_notification)
             print(f"DEBUG: Shortlist notification created and added")
         
         # Send notification when Department Manager updates status to "Selected"
         elif new_status == "Selected" and current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)']:
             print(f"DEBUG: Creating selected notification for Operation Manager")
             selected_notification = {
-                'id': len(notifications) + 1,
+                'id': None,  # assigned by add_notifications
                 'candidate_id': candidate_id,
                 'candidate_name': candidate.get('name', 'Unknown'),
                 'position': candidate.get('position', ''),
@@ -2017,22 +1519,18 @@ def update_candidate_status():
                 'action_required': True,
                 'notification_type': 'pop_up'
             }
-            notifications.append(selected_notification)
+            add_notifications(selected_notification)
             print(f"DEBUG: Selected notification created and added")
         else:
             print(f"DEBUG: No notification created - Status: {new_status}, Role: {current_user_role}")
         
-        # Save notifications
-        with open(notification_file, 'w') as f:
-            json.dump(notifications, f, indent=4)
-        
-        with open(candidate_file, 'w') as f:
-            json.dump(candidates, f, indent=4)
         # If status is Shortlisted, reload candidate and show interview form
         if new_status == "Shortlisted":
             return render_template('candidate_profile.html', candidate=candidate, role=request.cookies.get('role', ''), schedule_interview=True, selected_candidate=selected_candidate)
         # Otherwise, redirect as before
         return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=request.cookies.get('role', ''), schedule_interview=schedule_interview , selected_candidate=selected_candidate ))
+    except ConflictError as e:
+        return jsonify({'success': False, 'message': f'Candidate was modified concurrently, please retry: {str(e)}'}), 409
     except Exception as e:
         print(f"[ERROR] Failed to update candidate status: {e}")
         return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
@@ -2055,68 +1553,41 @@ def send_for_approval():
         except ValueError:
             return jsonify({'success': False, 'message': 'Invalid candidate ID format'}), 400
         
-        # Load candidate data
-        candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except json.JSONDecodeError:
-                    candidates = []
-        else:
-            candidates = []
-        
-        # Find the candidate
-        candidate = None
-        for c in candidates:
-            if c.get('id') == candidate_id:
-                candidate = c
-                break
+        def send(candidate):
+            # Update candidate status
+            previous_status = candidate.get('status', '')
+            candidate['status'] = 'Pending Approval'
+            candidate['sent_for_approval_at'] = datetime.datetime.now().isoformat()
+            candidate['sent_for_approval_by'] = request.cookies.get('username', '')
+            candidate['approval_request_message'] = approval_message
+            
+            # Track status update for send for approval
+            candidate['status_updated_by'] = request.cookies.get('username', 'Unknown')
+            candidate['status_updated_by_role'] = request.cookies.get('role', 'Unknown')
+            candidate['status_updated_at'] = datetime.datetime.now().isoformat()
+            candidate['previous_status'] = previous_status
+            
+            # Initialize status_history if it doesn't exist
+            if 'status_history' not in candidate:
+                candidate['status_history'] = []
+            
+            # Add to status history
+            candidate['status_history'].append({
+                'from_status': previous_status,
+                'to_status': 'Pending Approval',
+                'updated_by': request.cookies.get('username', 'Unknown'),
+                'updated_by_role': request.cookies.get('role', 'Unknown'),
+                'updated_at': datetime.datetime.now().isoformat(),
+                'update_type': 'sent_for_approval',
+                'approval_message': approval_message
+            })
         
+        candidate = mutate_candidate(candidate_id, send)
         if not candidate:
             return jsonify({'success': False, 'message': 'Candidate not found'}), 404
         
-        # Update candidate status
-        previous_status = candidate.get('status', '')
-        candidate['status'] = 'Pending Approval'
-        candidate['sent_for_approval_at'] = datetime.datetime.now().isoformat()
-        candidate['sent_for_approval_by'] = request.cookies.get('username', '')
-        candidate['approval_request_message'] = approval_message
-        
-        # Track status update for send for approval
-        candidate['status_updated_by'] = request.cookies.get('username', 'Unknown')
-        candidate['status_updated_by_role'] = request.cookies.get('role', 'Unknown')
-        candidate['status_updated_at'] = datetime.datetime.now().isoformat()
-        candidate['previous_status'] = previous_status
-        
-        # Initialize status_history if it doesn't exist
-        if 'status_history' not in candidate:
-            candidate['status_history'] = []
-        
-        # Add to status history
-        candidate['status_history'].append({
-            'from_status': previous_status,
-            'to_status': 'Pending Approval',
-            'updated_by': request.cookies.get('username', 'Unknown'),
-            'updated_by_role': request.cookies.get('role', 'Unknown'),
-            'updated_at': datetime.datetime.now().isoformat(),
-            'update_type': 'sent_for_approval',
-            'approval_message': approval_message
-        })
-        
         # Create notification for appropriate first approver based on position
         position = candidate.get('position', '').lower()
-        notification_file = os.path.join(os.path.dirname(__file__), 'db', 'notifications.json')
-        
-        # Load existing notifications
-        if os.path.exists(notification_file):
-            with open(notification_file, 'r') as f:
-                try:
-                    notifications = json.load(f)
-                except json.JSONDecodeError:
-                    notifications = []
-        else:
-            notifications = []
         
         # Determine first approver based on position
         if 'discipline manager' in position or 'project manager' in position:
@@ -2130,7 +1601,7 @@ def send_for_approval():
         
         # Create notification for first approver
         notification = {
-            'id': len(notifications) + 1,
+            'id': None,  # assigned by add_notifications
             'candidate_id': candidate_id,
             'candidate_name': candidate.get('name', 'Unknown'),
             'position': candidate.get('position', ''),
@@ -2147,19 +1618,13 @@ def send_for_approval():
             'total_steps': 3
         }
         
-        notifications.append(notification)
-        
-        # Save notifications
-        with open(notification_file, 'w') as f:
-            json.dump(notifications, f, indent=4)
-        
-        # Save updated candidate data
-        with open(candidate_file, 'w') as f:
-            json.dump(candidates, f, indent=4)
+        add_notifications(notification)
         
         # Add success message
         return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=request.cookies.get('role', ''), message=f'Candidate sent for approval to {first_approver}'))
         
+    except ConflictError as e:
+        return jsonify({'success': False, 'message': f'Candidate was modified concurrently, please retry: {str(e)}'}), 409
     except Exception as e:
         print(f"[ERROR] Failed to send candidate for approval: {e}")
         return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
@@ -2174,173 +1639,131 @@ def approve_candidate():
         action = request.form.get('action', 'approve')  # approve, reject, hold
         approval_comment = request.form.get('approval_comment', '')
         current_user_role = request.cookies.get('role', '')
-        
+
         if not candidate_id:
             return jsonify({'success': False, 'message': 'Missing candidate ID'}), 400
-        
+
         candidate_id = int(candidate_id)
-        
-        # Load files
-        candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-        notification_file = os.path.join(os.path.dirname(__file__), 'db', 'notifications.json')
-        
-        # Load candidates
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except json.JSONDecodeError:
-                    candidates = []
-        else:
-            candidates = []
-        
-        # Load notifications
-        if os.path.exists(notification_file):
-            with open(notification_file, 'r') as f:
-                try:
-                    notifications = json.load(f)
-                except json.JSONDecodeError:
-                    notifications = []
-        else:
-            notifications = []
-        
-        # Find candidate
-        candidate = None
-        for c in candidates:
-            if c.get('id') == candidate_id:
-                candidate = c
-                break
-        
+
+        # Where the approval chain goes next, filled in by apply_decision
+        outcome = {}
+
+        def apply_decision(candidate):
+            outcome.update(next_approver=None, is_final_approval=False, step_number=None)
+
+            # Handle different actions
+            previous_status = candidate.get('status', '')
+
+            # Initialize status_history if it doesn't exist
+            if 'status_history' not in candidate:
+                candidate['status_history'] = []
+
+            if action == 'reject':
+                candidate['status'] = 'Rejected'
+                candidate['rejection_reason'] = approval_comment
+                candidate['rejected_by'] = current_user_role
+                candidate['rejected_at'] = datetime.datetime.now().isoformat()
+
+                # Track status update
+                candidate['status_updated_by'] = request.cookies.get('username', 'Unknown')
+                candidate['status_updated_by_role'] = current_user_role
+                candidate['status_updated_at'] = datetime.datetime.now().isoformat()
+                candidate['previous_status'] = previous_status
+
+                # Add to status history
+                candidate['status_history'].append({
+                    'from_status': previous_status,
+                    'to_status': 'Rejected',
+                    'updated_by': request.cookies.get('username', 'Unknown'),
+                    'updated_by_role': current_user_role,
+                    'updated_at': datetime.datetime.now().isoformat(),
+                    'update_type': 'approval_rejected',
+                    'rejection_reason': approval_comment
+                })
+
+            elif action == 'hold':
+                candidate['status'] = 'On Hold'
+                candidate['hold_reason'] = approval_comment
+                candidate['put_on_hold_by'] = current_user_role
+                candidate['hold_at'] = datetime.datetime.now().isoformat()
+
+                # Track status update
+                candidate['status_updated_by'] = request.cookies.get('username', 'Unknown')
+                candidate['status_updated_by_role'] = current_user_role
+                candidate['status_updated_at'] = datetime.datetime.now().isoformat()
+                candidate['previous_status'] = previous_status
+
+                # Add to status history
+                candidate['status_history'].append({
+                    'from_status': previous_status,
+                    'to_status': 'On Hold',
+                    'updated_by': request.cookies.get('username', 'Unknown'),
+                    'updated_by_role': current_user_role,
+                    'updated_at': datetime.datetime.now().isoformat(),
+                    'update_type': 'approval_hold',
+                    'hold_reason': approval_comment
+                })
+
+            elif action == 'approve':
+                # Determine next step in approval chain
+                position = candidate.get('position', '').lower()
+
+                if 'discipline manager' in position or 'project manager' in position:
+                    # Senior positions: Department Manager → Operation Manager → CEO
+                    if current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)']:
+                        outcome.update(next_approver='Operation Manager', step_number=2)
+                    elif current_user_role == 'Operation Manager':
+                        outcome.update(next_approver='CEO', step_number=3)
+                    elif current_user_role == 'CEO':
+                        # Final approval for senior positions
+                        outcome['is_final_approval'] = True
+                        candidate['status'] = 'Approved'
+                        candidate['final_approved_by'] = current_user_role
+                        candidate['final_approved_at'] = datetime.datetime.now().isoformat()
+                        candidate['final_approval_comment'] = approval_comment
+                else:
+                    # Regular positions: Discipline Manager → Department Manager → Operation Manager
+                    if current_user_role == 'Discipline Manager':
+                        outcome.update(next_approver='Department Manager (MOE)', step_number=2)  # Could be dynamic based on department
+                    elif current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)']:
+                        outcome.update(next_approver='Operation Manager', step_number=3)
+                    elif current_user_role == 'Operation Manager':
+                        # Final approval for regular positions
+                        outcome['is_final_approval'] = True
+                        candidate['status'] = 'Approved'
+                        candidate['final_approved_by'] = current_user_role
+                        candidate['final_approved_at'] = datetime.datetime.now().isoformat()
+                        candidate['final_approval_comment'] = approval_comment
+
+                # Record approval step
+                if 'approval_history' not in candidate:
+                    candidate['approval_history'] = []
+
+                candidate['approval_history'].append({
+                    'step': len(candidate['approval_history']) + 1,
+                    'approved_by_role': current_user_role,
+                    'approved_by_user': request.cookies.get('username', ''),
+                    'approved_at': datetime.datetime.now().isoformat(),
+                    'comment': approval_comment,
+                    'is_final': outcome['is_final_approval']
+                })
+
+        # Re-applied on fresh data if another request changed the candidate meanwhile
+        candidate = mutate_candidate(candidate_id, apply_decision)
         if not candidate:
             return jsonify({'success': False, 'message': 'Candidate not found'}), 404
-        
-        # Update the current notification status
-        for notification in notifications:
-            if (notification.get('candidate_id') == candidate_id and 
-                notification.get('status') == 'Sent' and
-                (notification.get('for_role') == current_user_role or
-                 (notification.get('for_role') in ['Department Manager (MOE)', 'Department Manager (MOP)'] and 
-                  current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)']))):
-                
-                if action == 'approve':
-                    notification['status'] = 'Approved'
-                elif action == 'reject':
-                    notification['status'] = 'Rejected'
-                elif action == 'hold':
-                    notification['status'] = 'On Hold'
-                
-                notification['comment'] = approval_comment
-                notification['approved_by'] = request.cookies.get('username', '')
-                notification['approved_at'] = datetime.datetime.now().isoformat()
-                break
-        
-        # Handle different actions
-        previous_status = candidate.get('status', '')
-        
-        # Initialize status_history if it doesn't exist
-        if 'status_history' not in candidate:
-            candidate['status_history'] = []
-            
-        if action == 'reject':
-            candidate['status'] = 'Rejected'
-            candidate['rejection_reason'] = approval_comment
-            candidate['rejected_by'] = current_user_role
-            candidate['rejected_at'] = datetime.datetime.now().isoformat()
-            
-            # Track status update
-            candidate['status_updated_by'] = request.cookies.get('username', 'Unknown')
-            candidate['status_updated_by_role'] = current_user_role
-            candidate['status_updated_at'] = datetime.datetime.now().isoformat()
-            candidate['previous_status'] = previous_status
-            
-            # Add to status history
-            candidate['status_history'].append({
-                'from_status': previous_status,
-                'to_status': 'Rejected',
-                'updated_by': request.cookies.get('username', 'Unknown'),
-                'updated_by_role': current_user_role,
-                'updated_at': datetime.datetime.now().isoformat(),
-                'update_type': 'approval_rejected',
-                'rejection_reason': approval_comment
-            })
-            
-        elif action == 'hold':
-            candidate['status'] = 'On Hold'
-            candidate['hold_reason'] = approval_comment
-            candidate['put_on_hold_by'] = current_user_role
-            candidate['hold_at'] = datetime.datetime.now().isoformat()
-            
-            # Track status update
-            candidate['status_updated_by'] = request.cookies.get('username', 'Unknown')
-            candidate['status_updated_by_role'] = current_user_role
-            candidate['status_updated_at'] = datetime.datetime.now().isoformat()
-            candidate['previous_status'] = previous_status
-            
-            # Add to status history
-            candidate['status_history'].append({
-                'from_status': previous_status,
-                'to_status': 'On Hold',
-                'updated_by': request.cookies.get('username', 'Unknown'),
-                'updated_by_role': current_user_role,
-                'updated_at': datetime.datetime.now().isoformat(),
-                'update_type': 'approval_hold',
-                'hold_reason': approval_comment
-            })
-            
-        elif action == 'approve':
-            # Determine next step in approval chain
+
+        next_approver = outcome['next_approver']
+        is_final_approval = outcome['is_final_approval']
+        new_notifications = []
+
+        if action == 'approve':
             position = candidate.get('position', '').lower()
-            next_approver = None
-            is_final_approval = False
-            
-            if 'discipline manager' in position or 'project manager' in position:
-                # Senior positions: Department Manager → Operation Manager → CEO
-                if current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)']:
-                    next_approver = 'Operation Manager'
-                    step_number = 2
-                elif current_user_role == 'Operation Manager':
-                    next_approver = 'CEO'
-                    step_number = 3
-                elif current_user_role == 'CEO':
-                    # Final approval for senior positions
-                    is_final_approval = True
-                    candidate['status'] = 'Approved'
-                    candidate['final_approved_by'] = current_user_role
-                    candidate['final_approved_at'] = datetime.datetime.now().isoformat()
-                    candidate['final_approval_comment'] = approval_comment
-            else:
-                # Regular positions: Discipline Manager → Department Manager → Operation Manager
-                if current_user_role == 'Discipline Manager':
-                    next_approver = 'Department Manager (MOE)'  # Could be dynamic based on department
-                    step_number = 2
-                elif current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)']:
-                    next_approver = 'Operation Manager'
-                    step_number = 3
-                elif current_user_role == 'Operation Manager':
-                    # Final approval for regular positions
-                    is_final_approval = True
-                    candidate['status'] = 'Approved'
-                    candidate['final_approved_by'] = current_user_role
-                    candidate['final_approved_at'] = datetime.datetime.now().isoformat()
-                    candidate['final_approval_comment'] = approval_comment
-            
-            # Record approval step
-            if 'approval_history' not in candidate:
-                candidate['approval_history'] = []
-            
-            candidate['approval_history'].append({
-                'step': len(candidate['approval_history']) + 1,
-                'approved_by_role': current_user_role,
-                'approved_by_user': request.cookies.get('username', ''),
-                'approved_at': datetime.datetime.now().isoformat(),
-                'comment': approval_comment,
-                'is_final': is_final_approval
-            })
-            
+
             # Create notification for next approver if needed
             if next_approver and not is_final_approval:
                 next_notification = {
-                    'id': len(notifications) + 1,
+                    'id': None,  # assigned below
                     'candidate_id': candidate_id,
                     'candidate_name': candidate.get('name', 'Unknown'),
                     'position': candidate.get('position', ''),
@@ -2354,15 +1777,15 @@ def approve_candidate():
                     'priority': 'high' if 'manager' in position.lower() else 'normal',
                     'previous_approver': current_user_role,
                     'previous_comment': approval_comment,
-                    'step_number': step_number,
+                    'step_number': outcome['step_number'],
                     'total_steps': 3
                 }
-                notifications.append(next_notification)
-            
+                new_notifications.append(next_notification)
+
             # If final approval, notify HR to proceed with offer letter
             if is_final_approval:
                 hr_notification = {
-                    'id': len(notifications) + 1,
+                    'id': None,  # assigned below
                     'candidate_id': candidate_id,
                     'candidate_name': candidate.get('name', 'Unknown'),
                     'type': 'final_approval_complete',
@@ -2375,12 +1798,12 @@ def approve_candidate():
                     'final_approval_comment': approval_comment,
                     'priority': 'high'
                 }
-                notifications.append(hr_notification)
-        
+                new_notifications.append(hr_notification)
+
         # Add general notification for HR about the action (if not final approval)
         if action != 'approve' or not is_final_approval:
             hr_notification = {
-                'id': len(notifications) + 1,
+                'id': None,  # assigned below
                 'candidate_id': candidate_id,
                 'candidate_name': candidate.get('name', 'Unknown'),
                 'type': 'approval_update',
@@ -2392,21 +1815,44 @@ def approve_candidate():
                 'action_by': request.cookies.get('username', ''),
                 'comment': approval_comment
             }
-            notifications.append(hr_notification)
-        
-        # Save all changes
-        with open(candidate_file, 'w') as f:
-            json.dump(candidates, f, indent=4)
-        
-        with open(notification_file, 'w') as f:
-            json.dump(notifications, f, indent=4)
-        
+            new_notifications.append(hr_notification)
+
+        def update_notifications(notifications):
+            # Update the current notification status
+            for notification in notifications:
+                if (notification.get('candidate_id') == candidate_id and
+                    notification.get('status') == 'Sent' and
+                    (notification.get('for_role') == current_user_role or
+                     (notification.get('for_role') in ['Department Manager (MOE)', 'Department Manager (MOP)'] and
+                      current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)']))):
+
+                    if action == 'approve':
+                        notification['status'] = 'Approved'
+                    elif action == 'reject':
+                        notification['status'] = 'Rejected'
+                    elif action == 'hold':
+                        notification['status'] = 'On Hold'
+
+                    notification['comment'] = approval_comment
+                    notification['approved_by'] = request.cookies.get('username', '')
+                    notification['approved_at'] = datetime.datetime.now().isoformat()
+                    break
+
+            # Ids are numbered here, under the notifications lock
+            for notification in new_notifications:
+                notification['id'] = len(notifications) + 1
+                notifications.append(notification)
+
+        mutate_notifications(update_notifications)
+
         # Redirect back to manage HR team or candidate profile
         if request.referrer and 'manage_hr_team' in request.referrer:
             return redirect(url_for('manage_hr_team'))
         else:
             return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=current_user_role))
-        
+
+    except ConflictError as e:
+        return jsonify({'success': False, 'message': f'Candidate was modified concurrently, please retry: {str(e)}'}), 409
     except Exception as e:
         print(f"[ERROR] Failed to approve candidate: {e}")
         return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
@@ -2606,36 +2052,28 @@ def my_approvals():
     """
     current_user_role = request.cookies.get('role', '')
     
-    # Load notifications
-    notification_file = os.path.join(os.path.dirname(__file__), 'db', 'notifications.json')
-    if os.path.exists(notification_file):
-        with open(notification_file, 'r') as f:
-            try:
-                notifications = json.load(f)
-            except json.JSONDecodeError:
-                notifications = []
-    else:
-        notifications = []
+    # Load notifications (typed: timestamps parsed once)
+    notifications = record_models.notifications()
     
     # Filter notifications for current user role
     my_notifications = []
     for notification in notifications:
-        if (notification.get('for_role') == current_user_role or
-            (notification.get('for_role') in ['Department Manager (MOE)', 'Department Manager (MOP)'] and 
+        if (notification.for_role == current_user_role or
+            (notification.for_role in ['Department Manager (MOE)', 'Department Manager (MOP)'] and 
              current_user_role in ['Department Manager (MOE)', 'Department Manager (MOP)'])):
             my_notifications.append(notification)
     
     # Separate pending vs completed
-    pending_approvals = [n for n in my_notifications if n.get('status') == 'Pending']
-    completed_approvals = [n for n in my_notifications if n.get('status') in ['Approved', 'Rejected', 'On Hold', 'Read']]
+    pending_approvals = [n for n in my_notifications if n.status == 'Pending']
+    completed_approvals = [n for n in my_notifications if n.status in ['Approved', 'Rejected', 'On Hold', 'Read']]
     
-    # Sort by timestamp (most recent first)
-    pending_approvals.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-    completed_approvals.sort(key=lambda x: x.get('approved_at', x.get('timestamp', '')), reverse=True)
+    # Sort by timestamp (most recent first); parsed, so ISO and 'YYYY-MM-DD HH:MM:SS' stamps sort together
+    pending_approvals.sort(key=lambda n: n.sort_time, reverse=True)
+    completed_approvals.sort(key=lambda n: n.approved_time, reverse=True)
     
     return render_template('my_approvals.html', 
-                         pending_approvals=pending_approvals,
-                         completed_approvals=completed_approvals,
+                         pending_approvals=[n.record for n in pending_approvals],
+                         completed_approvals=[n.record for n in completed_approvals],
                          role=current_user_role)
 
 
@@ -2668,53 +2106,18 @@ def manage_hr_team():
         msg = "You do not have permission to access this page."
         return render_template('error.html', message=msg, role=current_user_role)
     
-    # Load data files
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    hr_file = os.path.join(db_folder, 'userdata.json')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    notification_file = os.path.join(db_folder, 'notifications.json')
-    jobs_file = os.path.join(db_folder, 'jobs.json')
-    
     # Load HR team data
-    if os.path.exists(hr_file):
-        with open(hr_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except json.JSONDecodeError:
-                users = []
-        hr_team = [u for u in users if u.get('role') in ['HR', 'HR Manager']]
-    else:
-        hr_team = []
+    users = fetch_user_data()
+    hr_team = [u for u in users if u.get('role') in ['HR', 'HR Manager']]
     
     # Load candidates
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-    else:
-        candidates = []
+    candidates = fetch_candidate_data()
     
-    # Load notifications
-    if os.path.exists(notification_file):
-        with open(notification_file, 'r') as f:
-            try:
-                notifications = json.load(f)
-            except json.JSONDecodeError:
-                notifications = []
-    else:
-        notifications = []
+    # Load notifications (typed: timestamps parsed once)
+    notifications = record_models.notifications()
     
     # Load jobs
-    if os.path.exists(jobs_file):
-        with open(jobs_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
-    else:
-        jobs = []
+    jobs = fetch_job_data()
     
     # Build hierarchical approval data
     hierarchical_data = build_hierarchical_approval_flow(candidates, notifications, users, view_filter)
@@ -2729,8 +2132,8 @@ def manage_hr_team():
         print(f"DEBUG: {om['name']} has {len(om['shortlisted'])} final approved, {len(om['onhold'])} on hold, {len(om['notapproved'])} rejected", flush=True)
     
     # Get user-specific notifications
-    user_notifications = [n for n in notifications if n.get('for_role') == current_user_role]
-    pending_approvals = [n for n in user_notifications if n.get('status') in ['Sent', 'Pending']]
+    pending_approvals = [n.record for n in notifications
+                         if n.for_role == current_user_role and n.status in ['Sent', 'Pending']]
     
     return render_template('manage_hr_team.html', 
                          hr_team=hr_team, 
@@ -2745,7 +2148,15 @@ def build_hierarchical_approval_flow(candidates, notifications, users, view_filt
     """
     Build hierarchical approval flow showing how candidates move through the approval process
     view_filter: 'overall' shows all candidates, 'active' shows only active candidates
+    notifications: typed Notification records (record_models.notifications())
     """
+    # Each manager's latest decision per candidate, looked up instead of scanning every notification
+    decisions = latest_decisions(notifications)
+    def latest_decision(candidate_id, roles, manager_username):
+        found = [decisions[key] for key in ((index_key(candidate_id), role, manager_username) for role in roles)
+                 if key in decisions]
+        return max(found, key=lambda n: n.sort_time) if found else None
+    
     # Get managers by role
     discipline_managers = [u for u in users if u.get('role') == 'Discipline Manager']
     department_managers = [u for u in users if u.get('role') in ['Department Manager (MOE)', 'Department Manager (MOP)']]
@@ -2790,15 +2201,11 @@ def build_hierarchical_approval_flow(candidates, notifications, users, view_filt
             }
             
             # Check if THIS discipline manager has made a decision on this candidate
-            candidate_notifications = [n for n in notifications if 
-                                     n.get('candidate_id') == candidate.get('id') and 
-                                     n.get('for_role') == 'Discipline Manager' and
-                                     n.get('approved_by') == manager_username]  # Only this manager's actions
+            latest_notification = latest_decision(candidate.get('id'), ['Discipline Manager'], manager_username)
             
-            if candidate_notifications:
+            if latest_notification:
                 # Found notification from THIS manager - use the latest one
-                latest_notification = max(candidate_notifications, key=lambda x: x.get('timestamp', ''))
-                notification_status = latest_notification.get('status', 'Pending')
+                notification_status = latest_notification.status or 'Pending'
                 
                 if notification_status == 'Approved':
                     manager_data['shortlisted'].append(candidate_info)
@@ -2864,15 +2271,13 @@ def build_hierarchical_approval_flow(candidates, notifications, users, view_filt
             }
             
             # Check if THIS department manager has made a decision
-            dept_notifications = [n for n in notifications if 
-                                n.get('candidate_id') == candidate.get('id') and 
-                                n.get('for_role') in ['Department Manager (MOE)', 'Department Manager (MOP)'] and
-                                n.get('approved_by') == manager_username]  # Only this manager's actions
+            latest_notification = latest_decision(candidate.get('id'),
+                                                  ['Department Manager (MOE)', 'Department Manager (MOP)'],
+                                                  manager_username)
             
-            if dept_notifications:
+            if latest_notification:
                 # Found notification from THIS manager - use the latest one
-                latest_notification = max(dept_notifications, key=lambda x: x.get('timestamp', ''))
-                notification_status = latest_notification.get('status', 'Pending')
+                notification_status = latest_notification.status or 'Pending'
                 
                 if notification_status == 'Approved':
                     manager_data['shortlisted'].append(candidate_info)
@@ -2941,15 +2346,11 @@ def build_hierarchical_approval_flow(candidates, notifications, users, view_filt
             }
             
             # Check if THIS operation manager has made a decision
-            op_notifications = [n for n in notifications if 
-                              n.get('candidate_id') == candidate_id and 
-                              n.get('for_role') == 'Operation Manager' and
-                              n.get('approved_by') == manager_username]  # Only this manager's actions
+            latest_notification = latest_decision(candidate_id, ['Operation Manager'], manager_username)
             
-            if op_notifications:
+            if latest_notification:
                 # Found notification from THIS manager - use the latest one
-                latest_notification = max(op_notifications, key=lambda x: x.get('timestamp', ''))
-                notification_status = latest_notification.get('status', 'Pending')
+                notification_status = latest_notification.status or 'Pending'
                 
                 if notification_status == 'Approved':
                     manager_data['shortlisted'].append(candidate_info)
@@ -3196,21 +2597,7 @@ def send_negotiation_mail():
         if not candidate_id:
             return jsonify({'success': False, 'message': 'Missing candidate ID'}), 400
         candidate_id = int(candidate_id)
-        candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except json.JSONDecodeError:
-                    candidates = []
-        else:
-            candidates = []
-        for c in candidates:
-            if c.get('id') == candidate_id:
-                c['negotiation_message'] = negotiation_message
-                break
-        with open(candidate_file, 'w') as f:
-            json.dump(candidates, f, indent=4)
+        edit_candidate_data(candidate_id, {'negotiation_message': negotiation_message})
         return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=request.cookies.get('role', '')))
     except Exception as e:
         print(f"[ERROR] Failed to send negotiation mail: {e}")
@@ -3227,31 +2614,19 @@ def issue_offer_letter():
         if not candidate_id:
             return jsonify({'success': False, 'message': 'Missing candidate ID'}), 400
         candidate_id = int(candidate_id)
-        candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except json.JSONDecodeError:
-                    candidates = []
-        else:
-            candidates = []
         manager_name = request.cookies.get('username', '')
         manager_email = request.cookies.get('email', '')
-        for c in candidates:
-            if c.get('id') == candidate_id:
-                c['offer_letter_details'] = offer_details
-                c['offer_issued_by'] = manager_name
-                c['offer_issued_by_email'] = manager_email
-                c['status'] = 'Hired'
-                # Minimal onboarding steps
-                c['onboarding'] = {
-                    'Joining Formalities': 'Pending',
-                    'HR Introduction': 'Pending'
-                }
-                break
-        with open(candidate_file, 'w') as f:
-            json.dump(candidates, f, indent=4)
+        edit_candidate_data(candidate_id, {
+            'offer_letter_details': offer_details,
+            'offer_issued_by': manager_name,
+            'offer_issued_by_email': manager_email,
+            'status': 'Hired',
+            # Minimal onboarding steps
+            'onboarding': {
+                'Joining Formalities': 'Pending',
+                'HR Introduction': 'Pending'
+            }
+        })
         return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=request.cookies.get('role', '')))
     except Exception as e:
         print(f"[ERROR] Failed to issue offer letter: {e}")
@@ -3266,17 +2641,8 @@ def update_onboarding():
     if not candidate_id:
         return jsonify({'success': False, 'message': 'Missing candidate ID'}), 400
     candidate_id = int(candidate_id)
-    candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-    else:
-        candidates = []
     updated = False
-    for c in candidates:
+    for c in fetch_candidate_data():
         if c.get('id') == candidate_id and c.get('status') == 'Hired':
             # Only keep main onboarding fields
             main_steps = ['Joining Formalities', 'HR Introduction', 'Document Verification', 'System Allocation']
@@ -3287,11 +2653,8 @@ def update_onboarding():
                     onboarding[step] = 'Completed'
                 else:
                     onboarding[step] = 'Pending'
-            c['onboarding'] = onboarding
-            updated = True
+            updated = edit_candidate_data(candidate_id, {'onboarding': onboarding})
             break
-    with open(candidate_file, 'w') as f:
-        json.dump(candidates, f, indent=4)
     if updated:
         return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=request.cookies.get('role', '')))
     else:
@@ -3306,16 +2669,7 @@ def submit_probation_assessment(candidate_id, month):
     Month 1: cultural fit, loyalty, etc.
     Months 2-6: standard performance criteria.
     """
-    candidate_file = os.path.join(os.path.dirname(__file__), 'db', 'candidates.json')
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-    else:
-        candidates = []
-    candidate = next((c for c in candidates if c.get('id') == candidate_id), None)
+    candidate = fetch_candidate_for_update(candidate_id)
     if not candidate:
         return jsonify({'success': False, 'message': 'Candidate not found'}), 404
     # Ensure probation_assessment exists
@@ -3342,27 +2696,14 @@ def submit_probation_assessment(candidate_id, month):
         return jsonify({'success': False, 'message': 'Invalid month'}), 400
     candidate['probation_assessment'][str(month)] = assessment
     # Save
-    for idx, c in enumerate(candidates):
-        if c.get('id') == candidate_id:
-            candidates[idx] = candidate
-            break
-    with open(candidate_file, 'w') as f:
-        json.dump(candidates, f, indent=4)
+    edit_candidate_data(candidate_id, {'probation_assessment': candidate['probation_assessment']})
 
     # Background: Generate AI summary if assessment changed
     # removed duplicate import of threading
-    def bg_generate_probation_insight(candidate_id, month, assessment, candidate_file):
+    def bg_generate_probation_insight(candidate_id, month, assessment):
         import hashlib, json, markdown
-        # Load candidates
-        if os.path.exists(candidate_file):
-            with open(candidate_file, 'r') as f:
-                try:
-                    candidates = json.load(f)
-                except Exception:
-                    candidates = []
-        else:
-            candidates = []
-        candidate = next((c for c in candidates if c.get('id') == candidate_id), None)
+        # Load candidate
+        candidate = fetch_candidate_for_update(candidate_id)
         if not candidate:
             return
         if 'probation_assessment_insights' not in candidate or not isinstance(candidate['probation_assessment_insights'], dict):
@@ -3377,8 +2718,9 @@ def submit_probation_assessment(candidate_id, month):
             or not candidate['probation_assessment_insights'].get(str(month))
         ):
             user_input = f"Summarize the following probation assessment data for month {month}. Only use the information provided. Do not invent or assume anything. Be concise and factual.\nAssessment Data: {json.dumps(assessment, ensure_ascii=False)}"
-            from Aion import chat_with_bot, SYSTEM_PROMPT
-            insight = chat_with_bot(user_input, system_prompt=SYSTEM_PROMPT)
+            from Aion import SYSTEM_PROMPT
+            insight = llm.chat([{"role": "system", "content": SYSTEM_PROMPT},
+                                {"role": "user", "content": user_input}])
             try:
                 insight_html = markdown.markdown(insight)
             except Exception:
@@ -3386,13 +2728,11 @@ def submit_probation_assessment(candidate_id, month):
             candidate['probation_assessment_insights'][str(month)] = insight_html
             candidate[insight_key] = pa_month_hash
             # Save
-            for idx, c in enumerate(candidates):
-                if c.get('id') == candidate_id:
-                    candidates[idx] = candidate
-                    break
-            with open(candidate_file, 'w') as f:
-                json.dump(candidates, f, indent=4)
-    threading.Thread(target=bg_generate_probation_insight, args=(candidate_id, month, assessment, candidate_file)).start()
+            edit_candidate_data(candidate_id, {
+                'probation_assessment_insights': candidate['probation_assessment_insights'],
+                insight_key: pa_month_hash
+            })
+    threading.Thread(target=bg_generate_probation_insight, args=(candidate_id, month, assessment)).start()
     return redirect(url_for('candidate_profile', candidate_id=candidate_id, role=request.cookies.get('role', '')))
 
 
@@ -3400,15 +2740,7 @@ def submit_probation_assessment(candidate_id, month):
 @app.route('/candidate/<int:candidate_id>')
 def candidate_profile(candidate_id):
     db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except Exception:
-                candidates = []
-    else:
-        candidates = []
+    candidates = fetch_candidate_data()
     candidate = next((c for c in candidates if c.get('id') == candidate_id), None)
     if not candidate:
         return "Candidate not found", 404
@@ -3437,11 +2769,14 @@ def candidate_profile(candidate_id):
 
 
 
-def calculate_job_status_info(job, candidates):
+def calculate_job_status_info(job, candidates=None):
     """
     Calculate detailed information about job status for the info popup
     Returns dict with days_remaining, closing_date, hired_count, total_openings, vacancies_remaining
+    Served from the materialized job status view unless a candidates list is passed.
     """
+    if candidates is None:
+        return job_status_view.info(job)
     from datetime import datetime, timedelta
     
     # Get current date
@@ -3494,11 +2829,14 @@ def calculate_job_status_info(job, candidates):
         'is_filled': vacancies_remaining == 0
     }
 
-def calculate_automatic_job_status(job, candidates):
+def calculate_automatic_job_status(job, candidates=None):
     """
     Calculate automatic job status based on lead time and hired candidates count
     Returns 'Open' or 'Closed'
+    Served from the materialized job status view unless a candidates list is passed.
     """
+    if candidates is None:
+        return job_status_view.status(job)
     from datetime import datetime, timedelta
     
     # Get current date
@@ -3547,55 +2885,18 @@ def calculate_automatic_job_status(job, candidates):
 
 @app.route('/job/<job_id>')
 def job_details(job_id):
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    job_file = os.path.join(db_folder, 'jobs.json')
-    jobs = []
-    if os.path.exists(job_file):
-        with open(job_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
-    job = None
-    for j in jobs:
-        if str(j.get('job_id')) == str(job_id):
-            job = j
-            break
+    job = fetch_job_by_id(job_id)
     if not job:
         return render_template('error.html', message='Job not found', role=request.cookies.get('role', ''))
     
-    # Load all candidates to calculate automatic status
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    candidates = []
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-    
-    # Calculate and update automatic job status
-    automatic_status = calculate_automatic_job_status(job, candidates)
-    if job.get('status', '').lower() != automatic_status.lower():
-        # Update job status
-        job['status'] = automatic_status
-        # Save updated jobs
-        with open(job_file, 'w') as f:
-            json.dump(jobs, f, indent=4)
+    # Automatic job status from the materialized view (a page view no longer rewrites jobs.json)
+    job = {**job, 'status': calculate_automatic_job_status(job)}
     
     # Calculate job status information for popup
-    from datetime import datetime, timedelta
-    job_status_info = calculate_job_status_info(job, candidates)
+    job_status_info = calculate_job_status_info(job)
     
     # Load uploaded CVs for this job and join with candidate details
-    cv_file = os.path.join(db_folder, f'job_{job_id}_cvs.json')
-    uploaded_cvs = []
-    if os.path.exists(cv_file):
-        with open(cv_file, 'r') as f:
-            try:
-                uploaded_cvs = json.load(f)
-            except json.JSONDecodeError:
-                uploaded_cvs = []
+    uploaded_cvs = repository.load_for_update(f'job_{job_id}_cvs.json')
     
     # Join candidate details to uploaded_cvs
     for cv in uploaded_cvs:
@@ -3605,13 +2906,12 @@ def job_details(job_id):
             cv_cand_id_int = int(cv_cand_id)
         except (ValueError, TypeError):
             cv_cand_id_int = None
-        candidate = next((c for c in candidates if c.get('id') == cv_cand_id_int), None)
+        candidate = fetch_candidate_by_id(cv_cand_id_int) if cv_cand_id_int is not None else None
         if candidate:
             cv['candidate_details'] = candidate
     
     # Get all candidates for this job (from candidates.json)
-    job_id_str = str(job_id)
-    job_candidates = [c for c in candidates if str(c.get('job_id', '')) == job_id_str]
+    job_candidates = fetch_candidates_for_job(job_id)
     
     # Remove candidates from job_candidates if they're already in uploaded_cvs to avoid duplicates
     uploaded_candidate_ids = set()
@@ -3635,19 +2935,11 @@ def profile():
     logged_in_cookie = request.cookies.get('logged_in')
     is_logged_in = logged_in_cookie == 'true'
     username = request.cookies.get('username', '') if is_logged_in else ''
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    user_file = os.path.join(db_folder, 'userdata.json')
-    user = None
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except Exception:
-                users = []
-        user = next((u for u in users if u['username'] == username), None)
+    user = next((u for u in fetch_user_data() if u['username'] == username), None)
     if not user:
         # fallback: show empty profile or redirect to login
         return redirect(url_for('login'))
+    user = dict(user)
     # Add avatar_url fallback if missing
     if 'avatar_url' not in user or not user['avatar_url']:
         user['avatar_url'] = None
@@ -3673,20 +2965,10 @@ def get_notifications():
         if not current_role:
             return jsonify({'success': False, 'message': 'User role not found'}), 403
         
-        notification_file = os.path.join(os.path.dirname(__file__), 'db', 'notifications.json')
-        if os.path.exists(notification_file):
-            with open(notification_file, 'r') as f:
-                try:
-                    notifications = json.load(f)
-                except json.JSONDecodeError:
-                    notifications = []
-        else:
-            notifications = []
-        
         # Filter notifications for current user role
         user_notifications = [
-            n for n in notifications 
-            if n.get('for_role') == current_role and n.get('status') == 'Pending'
+            n for n in fetch_notifications_for_role(current_role)
+            if n.get('status') == 'Pending'
         ]
         
         return jsonify({
@@ -3702,15 +2984,7 @@ def get_notifications():
 def mark_notification_read(notification_id):
     
     try:
-        notification_file = os.path.join(os.path.dirname(__file__), 'db', 'notifications.json')
-        if os.path.exists(notification_file):
-            with open(notification_file, 'r') as f:
-                try:
-                    notifications = json.load(f)
-                except json.JSONDecodeError:
-                    notifications = []
-        else:
-            notifications = []
+        notifications = fetch_notification_data(for_update=True)
         
         # Find and update notification
         for notification in notifications:
@@ -3720,8 +2994,7 @@ def mark_notification_read(notification_id):
                 break
         
         # Save updated notifications
-        with open(notification_file, 'w') as f:
-            json.dump(notifications, f, indent=4)
+        save_notification_data(notifications)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -0,0 +1,132 @@
+"""
+Chart Render Cache for AION HR System
+Content-addressed PNG cache for the analytics and chat charts, kept in db/charts/.
+
+A chart's file name is a hash of (chart type, series data, figure size, dpi), so a
+chart over unchanged data is rendered once and then served straight from disk, by
+every process. Files are written atomically. Once the folder grows past MAX_BYTES
+the least recently used files are evicted; a hit touches the file's mtime, so the
+LRU order survives restarts and is shared between workers.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+# Resolution of each preset, in dots per inch
+DPI_PRESETS = {'thumbnail': 72, 'screen': 110, 'print': 300}
+# Preset used when a caller does not ask for one
+DEFAULT_PRESET = os.environ.get('AION_CHART_PRESET', 'screen')
+# Size the chart folder is trimmed back to, least recently used first
+MAX_BYTES = int(os.environ.get('AION_CHART_CACHE_MB', '50')) * 1024 * 1024
+
+
+def plain(value: Any) -> Any:
+    """JSON fallback for series values: NumPy arrays/scalars as lists/numbers, dates as ISO text"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def chart_key(chart_type: str, series: Any, figsize: Sequence[float], dpi: int) -> str:
+    """Stable hash of everything a rendered chart depends on"""
+    payload = json.dumps([chart_type, series, list(figsize), dpi], sort_keys=True, default=plain)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def preset_dpi(preset: Optional[str] = None) -> int:
+    preset = preset or DEFAULT_PRESET
+    if preset not in DPI_PRESETS:
+        raise ValueError(f"Unknown chart preset '{preset}' (expected one of {', '.join(DPI_PRESETS)})")
+    return DPI_PRESETS[preset]
+
+
+class ChartCache:
+    def __init__(self, folder: Optional[str] = None, max_bytes: int = MAX_BYTES):
+        self.folder = folder or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db', 'charts')
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def path(self, chart_type: str, series: Any, figsize: Sequence[float], preset: Optional[str] = None) -> str:
+        """Where the PNG for this chart and data lives (whether or not it is rendered yet)"""
+        key = chart_key(chart_type, series, figsize, preset_dpi(preset))
+        return os.path.join(self.folder, f"{chart_type}-{key[:16]}.png")
+
+    def lookup(self, chart_type: str, series: Any, figsize: Sequence[float],
+               preset: Optional[str] = None) -> Optional[str]:
+        """Path of the PNG if this chart is already rendered (and mark it recently used), else None"""
+        path = self.path(chart_type, series, figsize, preset)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self.lock:
+            self.stats['hits'] += 1
+        return path
+
+    def render(self, chart_type: str, series: Any, draw: Callable[['Figure'], None],
+               figsize: Sequence[float] = (10, 6), preset: Optional[str] = None) -> str:
+        """Path of the PNG for this chart; draw(fig) runs only on a miss and must plot only series"""
+        cached = self.lookup(chart_type, series, figsize, preset)
+        if cached:
+            return cached
+
+        from matplotlib.figure import Figure  # only renders pay for matplotlib
+        path = self.path(chart_type, series, figsize, preset)
+        fig = Figure(figsize=figsize)
+        draw(fig)
+        os.makedirs(self.folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=self.folder)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                fig.savefig(f, format='png', dpi=preset_dpi(preset), bbox_inches='tight', facecolor='white')
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self.lock:
+            self.stats['misses'] += 1
+            self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: str):
+        """Delete least recently used charts until the folder fits in max_bytes"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.folder):
+            if not entry.name.endswith('.png'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # evicted by another process meanwhile
+            entries.append((stat.st_mtime, entry.path, stat.st_size))
+            total += stat.st_size
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                self.stats['evictions'] += 1
+            except OSError:
+                pass
+            total -= size
+
+
+# Global chart cache instance
+chart_cache = ChartCache()
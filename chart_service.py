@@ -0,0 +1,155 @@
+"""
+Chart Rendering Service for AION HR System
+Renders charts in a bounded pool of worker processes instead of request threads.
+
+Callers submit a chart spec (chart type, series, figure size and DPI preset, all
+plain data; the drawers live in charts.py). They get back a Future of the PNG
+path, or use render() to wait for it with a timeout.
+- Charts already in the render cache (chart_cache.py) are answered without
+  touching the pool.
+- Identical specs in flight share one job.
+- At most MAX_PENDING jobs wait for the MAX_WORKERS processes. Past that,
+  callers block until a slot frees up or their timeout passes.
+AION_CHART_WORKERS=0 renders in-process, one chart at a time.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Sequence
+
+from chart_cache import ChartCache, chart_cache
+
+
+# Worker processes rendering charts
+MAX_WORKERS = int(os.environ.get('AION_CHART_WORKERS', '2'))
+# Jobs that may be queued or running at once before submit() blocks
+MAX_PENDING = int(os.environ.get('AION_CHART_QUEUE', '32'))
+# Seconds render() waits for a queue slot and for the chart itself
+TIMEOUT = float(os.environ.get('AION_CHART_TIMEOUT_S', '30'))
+
+
+def render_chart(folder: str, max_bytes: int, chart_type: str, series: Dict[str, Any],
+                 figsize: Sequence[float], preset: Optional[str]) -> str:
+    """Draw one chart into the cache folder (runs in a worker process)"""
+    from charts import DRAWERS, style_context
+    draw = DRAWERS[chart_type][0]
+    with style_context(chart_type):
+        return ChartCache(folder, max_bytes).render(chart_type, series, lambda fig: draw(fig, series),
+                                                    figsize, preset)
+
+
+class ChartService:
+    def __init__(self, cache: ChartCache = chart_cache, max_workers: int = MAX_WORKERS,
+                 max_pending: int = MAX_PENDING, timeout: float = TIMEOUT):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._inline_lock = threading.Lock()  # in-process renders share matplotlib's rcParams
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+        self.stats = {'hits': 0, 'jobs': 0, 'joined': 0, 'inline': 0, 'timeouts': 0, 'failures': 0}
+        atexit.register(self.shutdown)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Started on first use; never fork the threaded server itself
+        if self._pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context(method))
+        return self._pool
+
+    def submit(self, chart_type: str, series: Dict[str, Any], figsize: Sequence[float] = (10, 6),
+               preset: Optional[str] = None, timeout: Optional[float] = None) -> Future:
+        """Future of the chart's PNG path; raises TimeoutError if no queue slot frees up in time"""
+        from charts import DRAWERS  # matplotlib is loaded on the first chart, not on import
+        if chart_type not in DRAWERS:
+            raise ValueError(f"Unknown chart type '{chart_type}'")
+        figsize = tuple(figsize)
+        cached = self.cache.lookup(chart_type, series, figsize, preset)
+        if cached:
+            with self.lock:
+                self.stats['hits'] += 1
+            future: Future = Future()
+            future.set_result(cached)
+            return future
+
+        if self.max_workers <= 0:
+            future = Future()
+            with self._inline_lock:
+                try:
+                    future.set_result(render_chart(self.cache.folder, self.cache.max_bytes,
+                                                   chart_type, series, figsize, preset))
+                except Exception as e:
+                    future.set_exception(e)
+            with self.lock:
+                self.stats['inline'] += 1
+            return future
+
+        path = self.cache.path(chart_type, series, figsize, preset)
+        with self.lock:
+            future = self._in_flight.get(path)
+            if future is not None:
+                self.stats['joined'] += 1
+                return future
+        if not self._slots.acquire(timeout=self.timeout if timeout is None else timeout):
+            raise TimeoutError(f"Chart queue full, '{chart_type}' not submitted")
+        args = (self.cache.folder, self.cache.max_bytes, chart_type, series, figsize, preset)
+        with self.lock:
+            future = self._in_flight.get(path)
+            if future is not None:  # submitted while we waited for the slot
+                self._slots.release()
+                self.stats['joined'] += 1
+                return future
+            try:
+                try:
+                    future = self._executor().submit(render_chart, *args)
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); start a fresh pool
+                    self._pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = None
+                    future = self._executor().submit(render_chart, *args)
+            except BaseException:
+                self._slots.release()
+                raise
+            self._in_flight[path] = future
+            self.stats['jobs'] += 1
+        future.add_done_callback(lambda _: self._finished(path))
+        return future
+
+    def _finished(self, path: str):
+        with self.lock:
+            self._in_flight.pop(path, None)
+        self._slots.release()
+
+    def render(self, chart_type: str, series: Dict[str, Any], figsize: Sequence[float] = (10, 6),
+               preset: Optional[str] = None, timeout: Optional[float] = None) -> Optional[str]:
+        """PNG path of the chart, or None if it could not be rendered within the timeout"""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return self.submit(chart_type, series, figsize, preset, timeout).result(timeout)
+        except TimeoutError:
+            # The job keeps running and lands in the cache for the next request
+            with self.lock:
+                self.stats['timeouts'] += 1
+            print(f"⚠️ Chart '{chart_type}' not ready within {timeout}s")
+        except Exception as e:
+            with self.lock:
+                self.stats['failures'] += 1
+            print(f"⚠️ Chart '{chart_type}' could not be rendered: {e}")
+        return None
+
+    def shutdown(self):
+        """Stop the worker processes (registered with atexit)"""
+        with self.lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Global chart rendering service
+chart_service = ChartService()
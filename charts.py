@@ -0,0 +1,268 @@
+"""
+Chart Drawers for AION HR System
+The plots behind the analytics and chat charts, as functions of plain series data.
+
+A drawer gets a fresh Figure and a series dict and only plots: no data access and
+no pyplot state. A chart is therefore fully described by (chart type, series,
+size, preset), which can be pickled to a worker process (see chart_service.py)
+and hashed into a cache key (see chart_cache.py).
+"""
+
+import contextlib
+from typing import Any, Callable, Dict, List, Tuple
+
+import matplotlib
+import numpy as np
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+
+
+# Style the analytics charts are drawn in (what HRAnalyticsEngine used to set globally)
+ANALYTICS_STYLE = 'seaborn-v0_8'
+ANALYTICS_PALETTE = 'husl'
+
+# chart type -> (draw(fig, series), drawn in the analytics style)
+DRAWERS: Dict[str, Tuple[Callable[[Figure, Dict[str, Any]], None], bool]] = {}
+
+
+def drawer(chart_type: str, styled: bool = True):
+    """Register a drawer for a chart type"""
+    def register(func):
+        DRAWERS[chart_type] = (func, styled)
+        return func
+    return register
+
+
+def style_context(chart_type: str):
+    """rcParams a chart type is drawn with; wrap figure creation and saving in it"""
+    if not DRAWERS[chart_type][1]:
+        return contextlib.nullcontext()
+    import seaborn as sns
+    from cycler import cycler
+    return matplotlib.style.context(
+        [ANALYTICS_STYLE, {'axes.prop_cycle': cycler(color=sns.color_palette(ANALYTICS_PALETTE))}])
+
+
+# The same charts for the browser (Chart.js), one entry per panel:
+# (chart kind, title, series key of the labels, [(dataset label, series key of the values)])
+PANELS = {
+    'hiring_success_trend': [('line', 'Hiring Success Rate Trend', 'months', [('Success Rate (%)', 'rates')])],
+    'monthly_hiring_trends': [('line', 'Monthly Hiring Performance Trends', 'months',
+                               [('Applications', 'applications'), ('Hired', 'hired'), ('Interviewed', 'interviewed')])],
+    'department_interview_efficiency': [
+        ('bar', 'Interview Rate by Department', 'departments', [('Interview Rate (%)', 'interview_rates')]),
+        ('bar', 'Average Days to Interview', 'departments', [('Days', 'avg_days')])],
+    'hiring_prediction': [('line', 'Hiring Prediction', 'months', [('Projected Hires', 'projected_hires')])],
+    'top_performers': [
+        ('bar', 'Top Performing Interviewers', 'performers', [('Success Rate (%)', 'rates')]),
+        ('bar', 'Most Hired Positions', 'roles', [('Number Hired', 'counts')])],
+    'salary_trends': [
+        ('line', 'Salary Trends Over Time', 'dates', [('Salary', 'salaries')]),
+        ('bar', 'Average Salary by Department', 'departments', [('Average Salary', 'department_averages')])],
+    'onboarding_analysis': [
+        ('bar', 'Average Days per Onboarding Step', 'steps', [('Days', 'avg_days')]),
+        ('bar', 'Onboarding Step Completion Rates', 'steps', [('Completion Rate (%)', 'completion_rates')])],
+    'probation_analysis': [
+        ('bar', 'Probation Pass Rates by Department', 'departments', [('Pass Rate (%)', 'pass_rates')]),
+        ('bar', 'Average Probation Scores', 'departments', [('Average Score', 'avg_scores')])],
+    'market_salary_comparison': [('bar', 'Salary Comparison: Our Offers vs Market', 'positions',
+                                  [('Our Offer', 'ours'), ('Market Average', 'market')])],
+    'hiring_trend': [('line', 'Monthly Hiring Trends', 'months', [('Number of Hires', 'counts')])],
+    'pie_chart': [('pie', 'Distribution Analysis', 'labels', [('Share', 'values')])],
+}
+
+
+def chart_panels(chart_type: str, series: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """A chart's series as Chart.js-ready panels: {'kind', 'title', 'labels', 'datasets': [{'label', 'data'}]}"""
+    return [{'kind': kind, 'title': title, 'labels': series[labels],
+             'datasets': [{'label': label, 'data': series[key]} for label, key in datasets]}
+            for kind, title, labels, datasets in PANELS[chart_type]]
+
+
+def _rotate_labels(*axes):
+    for ax in axes:
+        setp(ax.get_xticklabels(), rotation=45, ha='right')
+
+
+# ========== ANALYTICS ENGINE CHARTS ==========
+
+@drawer('hiring_success_trend')
+def hiring_success_trend(fig: Figure, series: Dict[str, Any]):
+    months, rates = series['months'], series['rates']
+    ax = fig.subplots()
+    ax.plot(months, rates, marker='o', linewidth=3, markersize=8)
+    ax.fill_between(months, rates, alpha=0.3)
+    ax.set_title('Hiring Success Rate Trend', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Success Rate (%)', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+@drawer('monthly_hiring_trends')
+def monthly_hiring_trends(fig: Figure, series: Dict[str, Any]):
+    months = series['months']
+    ax = fig.subplots()
+    ax.plot(months, series['applications'], marker='o', label='Applications', linewidth=2)
+    ax.plot(months, series['hired'], marker='s', label='Hired', linewidth=2)
+    ax.plot(months, series['interviewed'], marker='^', label='Interviewed', linewidth=2)
+
+    ax.set_title('Monthly Hiring Performance Trends', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Count', fontsize=12)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+@drawer('department_interview_efficiency')
+def department_interview_efficiency(fig: Figure, series: Dict[str, Any]):
+    depts = series['departments']
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Interview rate chart
+    ax1.bar(depts, series['interview_rates'], color='skyblue', alpha=0.7)
+    ax1.set_title('Interview Rate by Department', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Interview Rate (%)')
+    ax1.set_ylim(0, 100)
+
+    # Days to interview chart
+    ax2.bar(depts, series['avg_days'], color='lightcoral', alpha=0.7)
+    ax2.set_title('Average Days to Interview', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Days')
+
+    _rotate_labels(ax1, ax2)
+
+
+@drawer('hiring_prediction')
+def hiring_prediction(fig: Figure, series: Dict[str, Any]):
+    months, projected_hires = series['months'], series['projected_hires']
+    target, rate = series['target'], series['rate']
+    ax = fig.subplots()
+    ax.plot(months, projected_hires, marker='o', linewidth=3,
+            label=f'Projected Hires (Rate: {rate:.1f}/month)')
+    ax.axhline(y=target, color='red', linestyle='--', label=f'Target: {target} employees')
+    ax.fill_between(months, projected_hires, alpha=0.3)
+
+    ax.set_title(f'Hiring Prediction: Path to {target} Employees', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Timeline', fontsize=12)
+    ax.set_ylabel('Cumulative Hires', fontsize=12)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+@drawer('top_performers')
+def top_performers(fig: Figure, series: Dict[str, Any]):
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Top performers chart
+    if series['performers']:
+        ax1.bar(series['performers'], series['rates'], color='gold', alpha=0.7)
+        ax1.set_title('Top Performing Interviewers', fontsize=14, fontweight='bold')
+        ax1.set_ylabel('Success Rate (%)')
+        ax1.set_ylim(0, 100)
+        _rotate_labels(ax1)
+
+    # Best roles chart
+    if series['roles']:
+        ax2.bar(series['roles'], series['counts'], color='lightgreen', alpha=0.7)
+        ax2.set_title('Most Hired Positions', fontsize=14, fontweight='bold')
+        ax2.set_ylabel('Number Hired')
+        _rotate_labels(ax2)
+
+
+@drawer('salary_trends')
+def salary_trends(fig: Figure, series: Dict[str, Any]):
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Timeline chart
+    ax1.plot(series['dates'], series['salaries'], marker='o', linewidth=2, markersize=6)
+    ax1.set_title('Salary Trends Over Time', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Date')
+    ax1.set_ylabel('Salary')
+    ax1.grid(True, alpha=0.3)
+
+    # Department salary comparison
+    if series['departments']:
+        ax2.bar(series['departments'], series['department_averages'], color='lightblue', alpha=0.7)
+        ax2.set_title('Average Salary by Department', fontsize=14, fontweight='bold')
+        ax2.set_ylabel('Average Salary')
+        _rotate_labels(ax2)
+
+
+@drawer('onboarding_analysis')
+def onboarding_analysis(fig: Figure, series: Dict[str, Any]):
+    steps = series['steps']
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Average days chart
+    ax1.bar(steps, series['avg_days'], color='orange', alpha=0.7)
+    ax1.set_title('Average Days per Onboarding Step', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Days')
+
+    # Completion rate chart
+    ax2.bar(steps, series['completion_rates'], color='green', alpha=0.7)
+    ax2.set_title('Onboarding Step Completion Rates', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Completion Rate (%)')
+    ax2.set_ylim(0, 100)
+
+    _rotate_labels(ax1, ax2)
+
+
+@drawer('probation_analysis')
+def probation_analysis(fig: Figure, series: Dict[str, Any]):
+    depts = series['departments']
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Pass rate chart
+    ax1.bar(depts, series['pass_rates'], color='lightcoral', alpha=0.7)
+    ax1.set_title('Probation Pass Rates by Department', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Pass Rate (%)')
+    ax1.set_ylim(0, 100)
+
+    # Average scores chart
+    ax2.bar(depts, series['avg_scores'], color='lightblue', alpha=0.7)
+    ax2.set_title('Average Probation Scores', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Average Score')
+    ax2.set_ylim(0, 100)
+
+    _rotate_labels(ax1, ax2)
+
+
+@drawer('market_salary_comparison')
+def market_salary_comparison(fig: Figure, series: Dict[str, Any]):
+    positions = series['positions']
+    ax = fig.subplots()
+    x = np.arange(len(positions))
+    width = 0.35
+
+    ax.bar(x - width/2, series['ours'], width, label='Our Offer', alpha=0.7)
+    ax.bar(x + width/2, series['market'], width, label='Market Average', alpha=0.7)
+
+    ax.set_title('Salary Comparison: Our Offers vs Market', fontsize=16, fontweight='bold')
+    ax.set_ylabel('Salary ($)')
+    ax.set_xticks(x)
+    ax.set_xticklabels(positions, rotation=45, ha='right')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+# ========== CHAT TOOL CHARTS ==========
+
+@drawer('hiring_trend', styled=False)
+def hiring_trend(fig: Figure, series: Dict[str, Any]):
+    ax = fig.subplots()
+    ax.plot(series['months'], series['counts'], marker='o', linewidth=2, markersize=8)
+    ax.set_title('Monthly Hiring Trends', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Month', fontsize=12)
+    ax.set_ylabel('Number of Hires', fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+
+
+@drawer('pie_chart', styled=False)
+def pie_chart(fig: Figure, series: Dict[str, Any]):
+    ax = fig.subplots()
+    ax.pie(series['values'], labels=series['labels'], autopct='%1.1f%%', startangle=90)
+    ax.set_title('Distribution Analysis', fontsize=14, fontweight='bold')
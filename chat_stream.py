@@ -0,0 +1,147 @@
+"""
+Chat Streaming for AION HR System
+Reply assembly and formatting shared by /chat and /chat/stream.
+
+- completion_events() turns a chat completion, streamed or not, into ('delta', text)
+  events and rebuilds the assistant message, including tool calls that arrive
+  in fragments
+- ReplyFormatter applies format_reply a line at a time, so /chat/stream can send
+  each line as HTML as soon as it is complete
+"""
+
+import pathlib
+import re
+from typing import Any, Callable, Iterator, List, Tuple
+
+
+def completion_events(create: Callable[..., Any], stream: bool, **kwargs) -> Iterator[Tuple[str, Any]]:
+    """Yields ('delta', text) as the reply of create(**kwargs) arrives; returns the assistant message.
+
+    Streamed tool calls come in fragments (id and name first, then the arguments
+    a few characters at a time) and are put back together by index.
+    """
+    if not stream:
+        message = create(**kwargs)["choices"][0]["message"]
+        if message.get("content"):
+            yield "delta", message["content"]
+        return message
+
+    content, tool_calls = [], {}
+    for chunk in create(stream=True, **kwargs):
+        if not chunk["choices"]:
+            continue
+        delta = chunk["choices"][0].get("delta") or {}
+        if delta.get("content"):
+            content.append(delta["content"])
+            yield "delta", delta["content"]
+        for part in delta.get("tool_calls") or []:
+            call = tool_calls.setdefault(part["index"], {"id": "", "type": "function",
+                                                         "function": {"name": "", "arguments": ""}})
+            if part.get("id"):
+                call["id"] = part["id"]
+            function = part.get("function") or {}
+            call["function"]["name"] += function.get("name") or ""
+            call["function"]["arguments"] += function.get("arguments") or ""
+    message = {"role": "assistant", "content": "".join(content) or None}
+    if tool_calls:
+        message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+    return message
+
+
+# Opening tag of the lists replies' '-' and '1.' lines become
+LIST_OPEN = '<ul style="margin:4px 0 4px 18px; padding:0;">'
+
+
+def _image_replacer(match):
+    alt_text = match.group(1)
+    img_path = match.group(2)
+    # Only allow .png, .jpg, .jpeg, .gif for safety
+    if img_path.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
+        # If path starts with ./db/ or db/, convert to /db/ for browser access
+        if img_path.startswith('./db/'):
+            web_path = img_path[1:]  # remove leading .
+        elif img_path.startswith('db/'):
+            web_path = '/' + img_path
+        elif img_path.startswith('./static/'):
+            web_path = img_path[1:]
+        elif img_path.startswith('static/'):
+            web_path = '/' + img_path
+        else:
+            # For bare filenames, assume they're in the db directory
+            # Check if file exists in db directory
+            db_file_path = pathlib.Path(__file__).parent / 'db' / img_path
+            if db_file_path.exists():
+                web_path = f'/db/{img_path}'
+            else:
+                web_path = img_path
+        return f'<div style="margin:8px 0;"><img src="{web_path}" alt="{alt_text}" style="max-width: 100%; max-height: 320px; border:1px solid #ccc; border-radius:6px; box-shadow:0 2px 8px #0001;"><div style="font-size:12px;color:#555;">{alt_text}</div></div>'
+    return match.group(0)
+
+
+class ReplyFormatter:
+    """format_reply applied a line at a time, as a streamed reply arrives.
+
+    Images and *bold* never span lines and a list only depends on the lines
+    before it, so each completed line can be sent as soon as its newline
+    arrives; the unfinished line is kept in pending.
+    """
+    def __init__(self):
+        self.pending = ''
+        self.in_ul = False
+
+    def _format_line(self, line: str) -> List[str]:
+        # Replace markdown image links with HTML <img> tags
+        line = re.sub(r'!\[(.*?)\]\((.*?)\)', _image_replacer, line)
+        # Bold for *text*
+        line = re.sub(r'\*(.*?)\*', r'<b>\1</b>', line)
+        # Lists: lines starting with - or number.
+        parts = []
+        if re.match(r'^\s*- ', line) or re.match(r'^\s*\d+\. ', line):
+            if not self.in_ul:
+                parts.append(LIST_OPEN)
+                self.in_ul = True
+            item = line.lstrip("- ") if re.match(r'^\s*- ', line) else re.sub(r'^\s*\d+\. ', '', line)
+            parts.append(f'<li style="margin:2px 0;">{item}</li>')
+        else:
+            if self.in_ul:
+                parts.append('</ul>')
+                self.in_ul = False
+            # Add <br> for blank lines to create spacing between blocks
+            parts.append(line if line.strip() else '<br>')
+        return parts
+
+    @staticmethod
+    def _join(parts: List[str]) -> str:
+        # Join with <br> for newlines, but not between list items
+        html = ''
+        for part in parts:
+            if part.startswith('<ul') or part.startswith('</ul>') or part.startswith('<li') or part.startswith('<div style="margin:8px 0;">'):
+                html += part
+            else:
+                html += part + '<br>'
+        return html
+
+    def feed(self, text: str) -> str:
+        """HTML of the lines text completes"""
+        *lines, self.pending = (self.pending + text).split('\n')
+        return self._join([part for line in lines for part in self._format_line(line)])
+
+    def finish(self) -> str:
+        """HTML of the last line, closing an open list"""
+        parts = self._format_line(self.pending)
+        self.pending = ''
+        if self.in_ul:
+            parts.append('</ul>')
+            self.in_ul = False
+        return self._join(parts)
+
+
+def format_reply(text: str) -> str:
+    formatter = ReplyFormatter()
+    html = formatter.feed(text) + formatter.finish()
+    return html.rstrip('<br>')
+
+
+def plain_reply(text: str) -> str:
+    # Remove * and # for plain text
+    return text.replace('*', '').replace('#', '')
@@ -0,0 +1,198 @@
+"""
+Dashboard Metrics Engine for AION HR System
+Per-day rollups behind the dashboard's month/week/day charts and radar data.
+
+Candidate rollups are kept current through the repository listener: a single
+candidate update moves that candidate's contribution between buckets, and only a
+full save or reload rebuilds them. Vacancies are kept per job and split into active
+and closed through the job status view. Reading a series walks the days of its
+buckets, so the dashboard no longer scales with the number of candidates.
+"""
+
+import calendar
+import datetime
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from job_status import job_status_view
+from repository import COLLECTIONS, repository
+
+
+PERIODS = ['month', 'week', 'day']
+# Candidates in these states no longer count as active or pending applicants
+CLOSED_APPLICANT_STATUSES = ['hired', 'rejected', 'withdrawn']
+# "Active" hires are those from the last 180 days
+ACTIVE_HIRE_DAYS = 180
+
+
+def _day(value: Any) -> Optional[str]:
+    """'YYYY-MM-DD' when value parses as one, else None (such rows were skipped before too)"""
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
+
+def period_buckets(period: str, now: Optional[datetime.datetime] = None) -> List[Tuple[str, List[str]]]:
+    """(label, days) for each chart bucket, oldest first, using the dashboard's labels"""
+    now = now or datetime.datetime.now()
+    buckets = []
+    if period == 'month':
+        for i in range(5, -1, -1):
+            dt = (now - datetime.timedelta(days=30 * i)).replace(day=1)
+            days_in_month = calendar.monthrange(dt.year, dt.month)[1]
+            buckets.append((dt.strftime('%b %Y'),
+                            [dt.replace(day=d).strftime('%Y-%m-%d') for d in range(1, days_in_month + 1)]))
+    elif period == 'week':
+        for i in range(5, -1, -1):
+            start = now - datetime.timedelta(days=now.weekday() + 7 * i)
+            buckets.append((f"Week {start.isocalendar()[1]} {start.year}",
+                            [(start + datetime.timedelta(days=d)).strftime('%Y-%m-%d') for d in range(7)]))
+    elif period == 'day':
+        for i in range(6, -1, -1):
+            day = (now - datetime.timedelta(days=i)).strftime('%Y-%m-%d')
+            buckets.append((day, [day]))
+    return buckets
+
+
+class DashboardMetrics:
+    def __init__(self, repo=repository, job_view=job_status_view):
+        self.repo = repo
+        self.job_view = job_view
+        self.lock = threading.Lock()
+        self._stale = True
+        self._generation = 0
+        self.stats = {'rebuilds': 0, 'updates': 0}
+        self._reset()
+        repo.subscribe(self._on_change)
+
+    def _reset(self):
+        self.total = 0
+        self.status_counts: Counter = Counter()
+        self.applicants: Counter = Counter()
+        self.hired_by_applied: Counter = Counter()
+        self.hired_by_hire_date: Counter = Counter()
+        # job_id -> day -> open applications; split into active/pending by job status at read time
+        self.open_by_job: Dict[str, Counter] = {}
+
+    def _apply(self, candidate: Dict[str, Any], sign: int):
+        """Add (sign=1) or remove (sign=-1) one candidate's contribution to every rollup"""
+        self.total += sign
+        status = candidate.get('status', '')
+        self.status_counts[status] += sign
+        applied = _day(candidate.get('applied_date', ''))
+        if applied:
+            self.applicants[applied] += sign
+        if str(status).lower() == 'hired':
+            if applied:
+                self.hired_by_applied[applied] += sign
+            hire_day = _day(candidate.get('date_of_joining') or candidate.get('applied_date', ''))
+            if hire_day:
+                self.hired_by_hire_date[hire_day] += sign
+        elif applied and str(status).lower() not in CLOSED_APPLICANT_STATUSES:
+            job_id = str(candidate.get('job_id', ''))
+            self.open_by_job.setdefault(job_id, Counter())[applied] += sign
+
+    def _on_change(self, key: str, data: List[Any], changed):
+        if key != COLLECTIONS['candidates']:
+            return
+        with self.lock:
+            self._generation += 1
+            if changed is None or self._stale:
+                self._stale = True
+                return
+            position, old = changed
+            self._apply(old, -1)
+            self._apply(data[position], 1)
+            self.stats['updates'] += 1
+
+    def _refresh(self):
+        for attempt in range(3):
+            with self.lock:
+                generation = self._generation
+            candidates = self.repo.load('candidates')  # revalidates, so other processes' writes arrive
+            with self.lock:
+                if not self._stale:
+                    return
+                if self._generation != generation and attempt < 2:
+                    continue  # changed while loading; rebuild from the newer list
+                self._reset()
+                for candidate in candidates:
+                    if isinstance(candidate, dict):
+                        self._apply(candidate, 1)
+                self._stale = False
+                self.stats['rebuilds'] += 1
+                return
+
+    def _vacancies(self, active_jobs) -> Tuple[Counter, Counter]:
+        """Openings by posting day for all jobs and for active jobs; O(jobs)"""
+        overall, active = Counter(), Counter()
+        for job in self.repo.load('jobs'):
+            posted_at = job.get('posted_at', '')
+            day = _day(posted_at.split(' ')[0]) if posted_at else None
+            try:
+                openings = int(job.get('job_openings', '0'))
+            except (TypeError, ValueError):
+                continue
+            if not day:
+                continue
+            overall[day] += openings
+            if str(job.get('job_id', '')) in active_jobs:
+                active[day] += openings
+        return overall, active
+
+    def series(self) -> Dict[str, Dict[str, List[Any]]]:
+        """Every dashboard time series, keyed by series name then period"""
+        self._refresh()
+        # Read job state before taking self.lock: the listener runs under the repository
+        # lock and takes self.lock, so nothing below may call back into the repository
+        active_jobs = self.job_view.active_job_ids()
+        overall_vacancies, active_vacancies = self._vacancies(active_jobs)
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=ACTIVE_HIRE_DAYS)).strftime('%Y-%m-%d')
+        with self.lock:
+            active_hired = Counter({day: n for day, n in self.hired_by_hire_date.items() if day >= cutoff})
+            active_applicants, pending_closed = Counter(), Counter()
+            for job_id, days in self.open_by_job.items():
+                target = active_applicants if job_id in active_jobs else pending_closed
+                target.update(days)
+            counters = {
+                'overall_vacancies': overall_vacancies,
+                'overall_hired': self.hired_by_applied,
+                'overall_applicants': self.applicants,
+                'active_vacancies': active_vacancies,
+                'active_hired': active_hired,
+                'active_applicants': active_applicants,
+                'pending_closed_jobs': pending_closed,
+            }
+            result = {'labels': {}}
+            for period in PERIODS:
+                buckets = period_buckets(period)
+                result['labels'][period] = [label for label, _ in buckets]
+                for name, counter in counters.items():
+                    result.setdefault(name, {})[period] = [sum(counter.get(d, 0) for d in days) for _, days in buckets]
+            return result
+
+    def totals(self) -> Dict[str, Any]:
+        """Headline counts and radar_data"""
+        self._refresh()
+        with self.lock:
+            by_lower = Counter()
+            for status, n in self.status_counts.items():
+                by_lower[str(status).lower()] += n
+            return {
+                'total_applicants': self.total,
+                'total_hired': by_lower['hired'],
+                'total_left': by_lower['resigned'] + by_lower['fired'],
+                'radar_data': [
+                    self.total,
+                    self.status_counts['Shortlisted'],
+                    self.status_counts['Interviewed'],
+                    self.status_counts['Approved'],
+                    self.status_counts['Hired'],
+                ],
+            }
+
+
+# Global dashboard metrics instance
+dashboard_metrics = DashboardMetrics()
@@ -1,137 +1,13 @@
-# Scan the entire DB for upcoming events (not just log.json)
+# Upcoming events across the DB (not just log.json)
 def fetch_all_upcoming_events(limit=30):
-    import os, json, datetime
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    now = datetime.datetime.now()
-    events = []
-    # Candidates: interviews, pending approvals, onboarding
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r', encoding='utf-8') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-        for c in candidates:
-            # Upcoming interview (check with or without time)
-            date_str = c.get('interview_date', '')
-            time_str = c.get('interview_time', '')
-            if date_str:
-                try:
-                    if time_str:
-                        dt = datetime.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
-                    else:
-                        dt = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                    if dt >= now:
-                        events.append({
-                            'type': 'Interview',
-                            'date': date_str,
-                            'time': time_str,
-                            'name': c.get('name', ''),
-                            'job_title': c.get('job_title', c.get('position', '')),
-                            'candidate_id': c.get('id', '')
-                        })
-                except Exception:
-                    pass
-            # Pending approval
-            if c.get('status') in ['Pending Approval', 'Selected']:
-                applied_date = c.get('applied_date', '')
-                events.append({
-                    'type': 'Approval',
-                    'date': applied_date,
-                    'time': '',
-                    'name': c.get('name', ''),
-                    'job_title': c.get('job_title', c.get('position', '')),
-                    'candidate_id': c.get('id', '')
-                })
-            # Onboarding
-            onboarding = c.get('onboarding')
-            if c.get('status') == 'Hired' and onboarding and isinstance(onboarding, dict):
-                onboarding_start = onboarding.get('start_date', '')
-                if onboarding_start:
-                    try:
-                        dt = datetime.datetime.strptime(onboarding_start, "%Y-%m-%d")
-                        if dt >= now:
-                            events.append({
-                                'type': 'Onboarding',
-                                'date': onboarding_start,
-                                'time': '',
-                                'name': c.get('name', ''),
-                                'job_title': c.get('job_title', c.get('position', '')),
-                                'candidate_id': c.get('id', '')
-                            })
-                    except Exception:
-                        pass
-    # Jobs: future job postings (if any with a future posted_at)
-    job_file = os.path.join(db_folder, 'jobs.json')
-    if os.path.exists(job_file):
-        with open(job_file, 'r', encoding='utf-8') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
-        for job in jobs:
-            posted_at = job.get('posted_at', '')
-            if posted_at:
-                try:
-                    dt = datetime.datetime.strptime(posted_at, "%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    try:
-                        dt = datetime.datetime.strptime(posted_at, "%Y-%m-%d")
-                    except Exception:
-                        continue
-                if dt >= now:
-                    events.append({
-                        'type': 'Job',
-                        'date': posted_at.split(' ')[0],
-                        'time': posted_at.split(' ')[1] if ' ' in posted_at else '',
-                        'name': job.get('job_title', ''),
-                        'job_title': job.get('job_title', ''),
-                        'job_id': job.get('job_id', job.get('id', ''))
-                    })
-    # Notifications: future-dated notifications
-    notification_file = os.path.join(db_folder, 'notifications.json')
-    if os.path.exists(notification_file):
-        with open(notification_file, 'r', encoding='utf-8') as f:
-            try:
-                notifications = json.load(f)
-            except json.JSONDecodeError:
-                notifications = []
-        for n in notifications:
-            date_str = n.get('date', '')
-            time_str = n.get('time', '')
-            if date_str:
-                try:
-                    dt = datetime.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M") if time_str else datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                    if dt >= now:
-                        events.append({
-                            'type': 'Notification',
-                            'date': date_str,
-                            'time': time_str,
-                            'name': n.get('title', ''),
-                            'description': n.get('description', ''),
-                        })
-                except Exception:
-                    pass
-    # Sort by date/time ascending (soonest first)
-    def event_sort_key(e):
-        try:
-            return datetime.datetime.strptime(e['date'] + (f" {e['time']}" if e['time'] else ''), "%Y-%m-%d %H:%M")
-        except Exception:
-            try:
-                return datetime.datetime.strptime(e['date'], "%Y-%m-%d")
-            except Exception:
-                return datetime.datetime.max
-    events = [e for e in events if e['date']]
-    events = sorted(events, key=event_sort_key)
-    return events[:limit]
-import threading
-
-# Log an event/action to db/log.json
+    """Upcoming interviews, onboarding starts, job postings and dated notifications plus
+    pending approvals, soonest first; served from the sorted index in event_index.py"""
+    from event_index import event_index
+    return event_index.upcoming(limit)
+# Log an event/action to db/log.jsonl (appended in batches by the background writer in event_log.py)
 def log_event(action_type, description, user, related_id=None, date=None, time=None, extra=None):
-    import os, json, datetime
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    log_file = os.path.join(db_folder, 'log.json')
+    import datetime
+    from event_log import event_log
     log_entry = {
         'timestamp': date if date else datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'type': action_type,  # e.g., 'interview', 'approval', 'job', 'onboarding', etc.
@@ -141,96 +17,45 @@ def log_event(action_type, description, user, related_id=None, date=None, time=N
         'time': time,
         'extra': extra or {}
     }
-    def write_log():
-        try:
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
-            else:
-                logs = []
-            logs.append(log_entry)
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(logs, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error logging event: {e}")
-    # Write asynchronously to avoid blocking
-    threading.Thread(target=write_log).start()
-
-# Fetch events from log.json (optionally filter by type, date, etc.)
+    # Queued for the writer thread to avoid blocking; waits only if the queue is full
+    event_log.submit(log_entry)
+
+# Fetch events from the event log (optionally filter by type, date, etc.)
 def fetch_events_from_log(event_types=None, upcoming_only=True, limit=20):
-    import os, json, datetime
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    log_file = os.path.join(db_folder, 'log.json')
+    import datetime
+    from event_log import event_log
     now = datetime.datetime.now()
     events = []
-    if os.path.exists(log_file):
-        with open(log_file, 'r', encoding='utf-8') as f:
+    logs = event_log.events()
+    for entry in logs:
+        if event_types and entry.get('type') not in event_types:
+            continue
+        # For upcoming, check if date/time is in the future
+        if upcoming_only:
+            date_str = entry.get('timestamp', '')
+            time_str = entry.get('time', '')
             try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = []
-        for entry in logs:
-            if event_types and entry.get('type') not in event_types:
-                continue
-            # For upcoming, check if date/time is in the future
-            if upcoming_only:
-                date_str = entry.get('timestamp', '')
-                time_str = entry.get('time', '')
+                dt = datetime.datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+            except Exception:
                 try:
-                    dt = datetime.datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+                    dt = datetime.datetime.strptime(date_str, '%Y-%m-%d')
                 except Exception:
-                    try:
-                        dt = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-                    except Exception:
-                        continue
-                if dt < now:
                     continue
-            events.append(entry)
+            if dt < now:
+                continue
+        events.append(entry)
     # Sort by date/time ascending (soonest first)
     events = sorted(events, key=lambda x: (x.get('timestamp', ''), x.get('time', '') or ''))
     return events[:limit]
 # Utility to fetch all relevant DB data for AI context
 def fetch_all_db_data():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    # Candidates
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    candidates = []
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-    # Jobs
-    job_file = os.path.join(db_folder, 'jobs.json')
-    jobs = []
-    if os.path.exists(job_file):
-        with open(job_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
+    # Candidates, jobs, users and notifications come from the shared repository cache
+    candidates = fetch_candidate_data()
+    jobs = fetch_job_data()
     # Activities
-    from data import fetch_recent_activities
     activities = fetch_recent_activities(show_all=True)
-    # User data
-    user_file = os.path.join(db_folder, 'userdata.json')
-    users = []
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except json.JSONDecodeError:
-                users = []
-    # Notifications
-    notification_file = os.path.join(db_folder, 'notifications.json')
-    notifications = []
-    if os.path.exists(notification_file):
-        with open(notification_file, 'r') as f:
-            try:
-                notifications = json.load(f)
-            except json.JSONDecodeError:
-                notifications = []
+    users = fetch_user_data()
+    notifications = fetch_notification_data()
     # Return all as dict
     return {
         "candidates": candidates,
@@ -268,34 +93,18 @@ def fetch_recent_activities(show_all=False):
     except Exception as e:
         print(f"⚠️ Could not fetch from new activity logger: {e}")
     
-    # Fallback to legacy activity fetching from JSON files
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    job_file = os.path.join(db_folder, 'jobs.json')
-    
+    # Fallback to legacy activity fetching from the cached collections
     # Get username mapping
     usernames = {}
-    user_file = os.path.join(db_folder, 'userdata.json')
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except json.JSONDecodeError:
-                users = []
-        for u in users:
-            if u.get('email'):
-                usernames[u['email']] = u.get('username', '')
-            if u.get('username'):
-                usernames[u['username']] = u.get('username', '')
+    for u in fetch_user_data():
+        if u.get('email'):
+            usernames[u['email']] = u.get('username', '')
+        if u.get('username'):
+            usernames[u['username']] = u.get('username', '')
     
     # Legacy candidate activities
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-        
+    candidates = fetch_candidate_data()
+    if candidates:
         for c in candidates:
             # Initial application
             if c.get('applied_date'):
@@ -356,13 +165,8 @@ def fetch_recent_activities(show_all=False):
                     })
     
     # Legacy job activities
-    if os.path.exists(job_file):
-        with open(job_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
-        
+    jobs = fetch_job_data()
+    if jobs:
         for job in jobs:
             user_val = job.get('job_posted_by', '')
             user_val = usernames.get(user_val, user_val)
@@ -430,6 +234,9 @@ import datetime
 import os
 import json
 import openai
+from llm_cache import llm
+from repository import repository
+from job_status import job_status_view
 
 
 def extract_text_from_file(file_path):
@@ -455,7 +262,6 @@ def extract_text_from_file(file_path):
 
 # Use OpenAI to extract JD from text
 def extract_jd_with_openai(jd_text):
-    import openai
     try:
         messages = [
             {
@@ -467,12 +273,8 @@ def extract_jd_with_openai(jd_text):
                 "content": f"Extract the job description from this text:\n{jd_text}"
             }
         ]
-        response = openai.ChatCompletion.create(
-            model="gpt-4o",
-            messages=messages,
-            temperature=0
-        )
-        return response['choices'][0]['message']['content']
+        # Cached: the same JD text is only sent once
+        return llm.chat(messages, model="gpt-4o", temperature=0)
     except Exception as e:
         return ""
 
@@ -509,7 +311,7 @@ def transcribe_with_whisper(audio_path):
 
 def analyze_transcript_with_openai(transcript):
     try:
-        response = openai.ChatCompletion.create(
+        return llm.chat(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": """You are an expert interviewer analyzing candidate performance.\n\nAnalyze the interview transcript and provide:\n1. A comprehensive performance summary\n2. Specific feedback on communication skills, technical knowledge, and overall interview performance\n3. Areas for improvement\n4. A final performance score out of 100\n\nIMPORTANT: Always end your response with a clear score in this exact format: \"Performance Score: X/100\" where X is a number between 0-100."""},
@@ -517,7 +319,6 @@ def analyze_transcript_with_openai(transcript):
             ],
             temperature=0.0,
         )
-        return response['choices'][0]['message']['content']
     except Exception as e:
         print(f"OpenAI summary error: {e}")
         return None
@@ -589,52 +390,61 @@ def extract_score_from_summary(summary):
 
 
 # ------------------------------------------------------------------------------------
-def fetch_user_data():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    user_file = os.path.join(db_folder, 'userdata.json')
-    user_data = []
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                user_data = json.load(f)
-            except json.JSONDecodeError:
-                user_data = []
-    return user_data
+def fetch_user_data(for_update=False):
+    """
+    Return all users from the shared repository cache.
+    Pass for_update=True to get a private copy that can be modified and saved.
+    """
+    if for_update:
+        return repository.load_for_update('users')
+    return repository.load('users')
+
+def save_user_data(user_data):
+    repository.save('users', user_data)
 
 def total_users():
     user_data = fetch_user_data()
     return len(user_data)
 
 def edit_user_data(username, new_data):
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    user_file = os.path.join(db_folder, 'userdata.json')
-    user_data = fetch_user_data()
-    updated = False
-    for user in user_data:
-        if user.get('username') == username:
-            user.update(new_data)
-            updated = True
-            break
-    if updated:
-        with open(user_file, 'w') as f:
-            json.dump(user_data, f, indent=4)
-    return updated
+    return repository.update_record('users', 'username', username, new_data)
 
 
 
 # ------------------------------------------------------------------------------------
 
-def fetch_job_data():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    job_file = os.path.join(db_folder, 'jobs.json')
-    job_data = []
-    if os.path.exists(job_file):
-        with open(job_file, 'r') as f:
-            try:
-                job_data = json.load(f)
-            except json.JSONDecodeError:
-                job_data = []
-    return job_data
+def fetch_job_data(for_update=False):
+    """
+    Return all jobs from the shared repository cache.
+    Pass for_update=True to get a private copy that can be modified and saved.
+    """
+    if for_update:
+        return repository.load_for_update('jobs')
+    return repository.load('jobs')
+
+def save_job_data(job_data):
+    repository.save('jobs', job_data)
+
+def fetch_jobs_with_status():
+    """Copies of all jobs with 'status' taken from the materialized job status view"""
+    return job_status_view.jobs_with_status()
+
+def fetch_dashboard_series():
+    """Dashboard month/week/day chart series from the per-day rollups (see dashboard_metrics.py)"""
+    from dashboard_metrics import dashboard_metrics
+    return dashboard_metrics.series()
+
+def fetch_dashboard_totals():
+    """Applicant/hire totals and radar_data from the dashboard rollups"""
+    from dashboard_metrics import dashboard_metrics
+    return dashboard_metrics.totals()
+
+def fetch_data_version():
+    """Changes whenever data shown on the dashboard may have changed: any write through
+    this module or on disk, a job reaching its closing date, or the calendar day rolling over"""
+    fetch_candidate_data()  # revalidate against disk first
+    fetch_job_data()
+    return (repository.version(), job_status_view.current_version(), datetime.date.today().isoformat())
 
 def job_count():
     return len(fetch_job_data())
@@ -657,108 +467,12 @@ def openings_count():
     return openings_count
 
 def open_vacancies_count():
-    """Count vacancies for open jobs only"""
-    job_data = fetch_job_data()
-    # We need to import the function from app.py or define it here
-    # For now, let's use a simple logic similar to calculate_automatic_job_status
-    from datetime import datetime, timedelta
-    candidates = fetch_candidate_data()
-    
-    open_count = 0
-    current_date = datetime.now()
-    
-    for job in job_data:
-        # Calculate if job should be considered open
-        is_open = True
-        
-        # Check lead time expiration
-        try:
-            posted_date = datetime.strptime(job.get('posted_at', ''), '%Y-%m-%d %H:%M:%S')
-            lead_time_days = int(job.get('job_lead_time', 30))
-            expiration_date = posted_date + timedelta(days=lead_time_days)
-            if current_date > expiration_date:
-                is_open = False
-        except (ValueError, TypeError):
-            pass  # If we can't parse dates, assume not expired
-        
-        # Check if all positions are filled
-        if is_open:
-            job_id_str = str(job.get('job_id', ''))
-            hired_count = sum(1 for c in candidates 
-                             if c.get('status', '').lower() == 'hired' and 
-                                str(c.get('job_id', '')) == job_id_str)
-            try:
-                job_openings = int(job.get('job_openings', 0))
-                if hired_count >= job_openings:
-                    is_open = False
-            except (ValueError, TypeError):
-                pass
-        
-        # Check explicit status override
-        job_status = job.get('status', '').lower()
-        if job_status in ['closed', 'filled', 'cancelled', 'expired', 'on hold']:
-            is_open = False
-        
-        if is_open:
-            for key in ['job_openings', 'openings', 'openings_count', 'vacancies']:
-                if key in job:
-                    try:
-                        open_count += int(job[key])
-                        break
-                    except (ValueError, TypeError):
-                        continue
-    return open_count
+    """Count vacancies for open jobs only (summed over the materialized job status view)"""
+    return job_status_view.open_vacancies()
 
 def closed_vacancies_count():
-    """Count vacancies for closed jobs only"""
-    job_data = fetch_job_data()
-    from datetime import datetime, timedelta
-    candidates = fetch_candidate_data()
-    
-    closed_count = 0
-    current_date = datetime.now()
-    
-    for job in job_data:
-        # Calculate if job should be considered closed
-        is_closed = False
-        
-        # Check lead time expiration
-        try:
-            posted_date = datetime.strptime(job.get('posted_at', ''), '%Y-%m-%d %H:%M:%S')
-            lead_time_days = int(job.get('job_lead_time', 30))
-            expiration_date = posted_date + timedelta(days=lead_time_days)
-            if current_date > expiration_date:
-                is_closed = True
-        except (ValueError, TypeError):
-            pass  # If we can't parse dates, assume not expired
-        
-        # Check if all positions are filled
-        if not is_closed:
-            job_id_str = str(job.get('job_id', ''))
-            hired_count = sum(1 for c in candidates 
-                             if c.get('status', '').lower() == 'hired' and 
-                                str(c.get('job_id', '')) == job_id_str)
-            try:
-                job_openings = int(job.get('job_openings', 0))
-                if hired_count >= job_openings:
-                    is_closed = True
-            except (ValueError, TypeError):
-                pass
-        
-        # Check explicit status override
-        job_status = job.get('status', '').lower()
-        if job_status in ['closed', 'filled', 'cancelled', 'expired', 'on hold']:
-            is_closed = True
-        
-        if is_closed:
-            for key in ['job_openings', 'openings', 'openings_count', 'vacancies']:
-                if key in job:
-                    try:
-                        closed_count += int(job[key])
-                        break
-                    except (ValueError, TypeError):
-                        continue
-    return closed_count
+    """Count vacancies for closed jobs only (summed over the materialized job status view)"""
+    return job_status_view.closed_vacancies()
 
 def no_status_vacancies_count():
     """Count vacancies for jobs without status"""
@@ -794,17 +508,17 @@ def total_all_vacancies_count():
 # ------------------------------------------------------------------------------------
 
 
-def fetch_candidate_data():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    candidate_data = []
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidate_data = json.load(f)
-            except json.JSONDecodeError:
-                candidate_data = []
-    return candidate_data
+def fetch_candidate_data(for_update=False):
+    """
+    Return all candidates from the shared repository cache.
+    Pass for_update=True to get a private copy that can be modified and saved.
+    """
+    if for_update:
+        return repository.load_for_update('candidates')
+    return repository.load('candidates')
+
+def save_candidate_data(candidate_data):
+    repository.save('candidates', candidate_data)
 
 def candidate_count():
     candidate_data = fetch_candidate_data()
@@ -812,16 +526,10 @@ def candidate_count():
 
 # Event functions for dashboard
 def fetch_upcoming_interviews():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
     upcoming = []
     now = datetime.datetime.now()
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
+    candidates = fetch_candidate_data()
+    if candidates:
         for c in candidates:
             date_str = c.get('interview_date', '')
             time_str = c.get('interview_time', '')
@@ -835,49 +543,60 @@ def fetch_upcoming_interviews():
     return upcoming
 
 def fetch_pending_approvals_events():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    pending = []
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-        for c in candidates:
-            if c.get('status') == 'Pending Approval':
-                pending.append(c)
-    return pending
+    return fetch_candidates_by_status('Pending Approval')
 
 def fetch_onboarding_events():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
     onboarding = []
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
+    candidates = fetch_candidate_data()
+    if candidates:
         for c in candidates:
             if c.get('status') == 'Hired' and 'onboarding' in c:
                 onboarding.append(c)
     return onboarding
 
+def fetch_candidate_for_update(candidate_id):
+    """
+    Return a private copy of one candidate (or None) to modify and pass to edit_candidate_data.
+    """
+    import copy
+    candidate = fetch_candidate_by_id(candidate_id)
+    return copy.deepcopy(candidate) if candidate is not None else None
+
+# Indexed lookups: the repository keeps id/job_id/status indexes over the cached collections
+# and patches them on single-record updates, so these cost O(1) or O(matches), not O(candidates)
+def fetch_candidate_by_id(candidate_id):
+    return repository.find_one('candidates', 'id', candidate_id)
+
+def fetch_candidates_for_job(job_id):
+    return repository.find('candidates', 'job_id', job_id)
+
+def fetch_candidates_by_status(status):
+    """Candidates with the given status (case-insensitive)"""
+    return repository.find('candidates', 'status', status)
+
+def count_candidates_by_status(status):
+    return repository.count('candidates', 'status', status)
+
+def hired_count_for_job(job_id):
+    return sum(1 for c in fetch_candidates_for_job(job_id) if str(c.get('status', '')).lower() == 'hired')
+
+def fetch_job_department(job_id, default=None):
+    job = fetch_job_by_id(job_id)
+    return job.get('department', default) if job else default
+
 def edit_candidate_data(candidate_id, new_data):
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    candidate_data = fetch_candidate_data()
-    updated = False
-    for candidate in candidate_data:
-        if candidate.get('id') == candidate_id:
-            candidate.update(new_data)
-            updated = True
-            break
-    if updated:
-        with open(candidate_file, 'w') as f:
-            json.dump(candidate_data, f, indent=4)
-    return updated
+    return repository.update_record('candidates', 'id', candidate_id, new_data)
+
+def mutate_candidate(candidate_id, mutate):
+    """
+    Apply mutate(candidate) to one candidate with compare-and-swap and retry.
+    Returns the saved candidate, None if not found; raises ConflictError if retries run out.
+    """
+    return repository.mutate_record('candidates', 'id', candidate_id, mutate)
+
+def mutate_candidates(mutate):
+    """Run mutate(candidates) under the candidates lock and save the result (e.g. appends)"""
+    return repository.mutate_records('candidates', mutate)
 
 def fetch_candidates_by_filter(**filters):
     """
@@ -886,6 +605,10 @@ def fetch_candidates_by_filter(**filters):
     Example:
         fetch_candidates_by_filter(status='active', department='HR')
     """
+    from sqlite_store import INDEXED_FIELDS
+    if filters and all(key in INDEXED_FIELDS for key in filters):
+        # Indexed query when the SQLite engine is active
+        return repository.query('candidates', **filters)
     candidate_data = fetch_candidate_data()
     filtered_candidates = []
     for candidate in candidate_data:
@@ -897,23 +620,17 @@ def fetch_pending_approvals():
     """
     Return a list of dicts with candidate id and name whose status is 'Selected' (pending approval).
     """
-    candidate_data = fetch_candidate_data()
     pending_approvals = [
         {"id": candidate.get("id"), "name": candidate.get("name")}
-        for candidate in candidate_data
-        if candidate.get("status") == "Selected"
+        for candidate in repository.query('candidates', status='Selected')
     ]
     return pending_approvals
 
 
 def get_sender():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    candidate_data = fetch_candidate_data()
     intervier = None
-    for candidate in candidate_data:
-        if candidate.get('status') == 'Selected':
-            intervier = candidate.get('intervier', 'Unknown')
+    for candidate in repository.query('candidates', status='Selected'):
+        intervier = candidate.get('intervier', 'Unknown')
     if intervier:
         return intervier
     else:
@@ -924,16 +641,38 @@ def get_sender():
 # ------------------------------------------------------------------------------------
 
 def fetch_onboarding_data():
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    onboarding_file = os.path.join(db_folder, 'onboarding.json')
-    onboarding_data = []
-    if os.path.exists(onboarding_file):
-        with open(onboarding_file, 'r') as f:
-            try:
-                onboarding_data = json.load(f)
-            except json.JSONDecodeError:
-                onboarding_data = []
-    return onboarding_data
+    return repository.load('onboarding.json')
+
+
+# ------------------------------------------------------------------------------------
+
+def fetch_notification_data(for_update=False):
+    """
+    Return all notifications from the shared repository cache.
+    Pass for_update=True to get a private copy that can be modified and saved.
+    """
+    if for_update:
+        return repository.load_for_update('notifications')
+    return repository.load('notifications')
+
+def save_notification_data(notification_data):
+    repository.save('notifications', notification_data)
+
+def mutate_notifications(mutate):
+    """Run mutate(notifications) under the notifications lock and save the result"""
+    return repository.mutate_records('notifications', mutate)
+
+def add_notifications(*new_notifications):
+    """Append notifications, numbering them under the lock so concurrent requests never reuse an id"""
+    def append(notifications):
+        for notification in new_notifications:
+            notification['id'] = len(notifications) + 1
+            notifications.append(notification)
+    mutate_notifications(append)
+
+def fetch_notifications_for_role(role):
+    """Notifications addressed to a role (indexed on for_role when SQLite is active)"""
+    return repository.query('notifications', for_role=role)
 
 
 
@@ -1010,12 +749,8 @@ def extract_resume_with_openai(resume_path):
 
         # Use try-except specifically for OpenAI API call
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=messages,
-                temperature=0
-            )
-            return response['choices'][0]['message']['content']
+            # Cached: re-extracting the same resume text costs no API call
+            return llm.chat(messages, model="gpt-4o", temperature=0)
             
         except ImportError as import_error:
             return {"error": f"OpenAI library import failed: {str(import_error)}"}
@@ -1049,11 +784,7 @@ def fetch_job_by_id(job_id):
     Fetch a job by its unique ID.
     Returns the job data if found, otherwise None.
     """
-    job_data = fetch_job_data()
-    for job in job_data:
-        if job.get('id') == job_id:
-            return job
-    return None
+    return repository.find_one('jobs', 'job_id', job_id)
 def fetch_todays_activities():
     """
     Return a list of activities (candidate and job) that occurred today.
@@ -1083,51 +814,32 @@ def fetch_todays_activities():
         print(f"⚠️ Could not fetch today's activities from new activity logger: {e}")
     
     # Fallback to legacy method
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    candidate_file = os.path.join(db_folder, 'candidates.json')
-    job_file = os.path.join(db_folder, 'jobs.json')
-    
     # Get username mapping
     usernames = {}
-    user_file = os.path.join(db_folder, 'userdata.json')
-    if os.path.exists(user_file):
-        with open(user_file, 'r') as f:
-            try:
-                users = json.load(f)
-            except json.JSONDecodeError:
-                users = []
-        for u in users:
-            if u.get('email'):
-                usernames[u['email']] = u.get('username', '')
-            if u.get('username'):
-                usernames[u['username']] = u.get('username', '')
+    for u in fetch_user_data():
+        if u.get('email'):
+            usernames[u['email']] = u.get('username', '')
+        if u.get('username'):
+            usernames[u['username']] = u.get('username', '')
     
     # Legacy candidate activities for today
-    if os.path.exists(candidate_file):
-        with open(candidate_file, 'r') as f:
-            try:
-                candidates = json.load(f)
-            except json.JSONDecodeError:
-                candidates = []
-        
+    # Typed records (see models.py): applied_date is already parsed
+    from models import record_models
+    candidates = record_models.candidates()
+    if candidates:
         for c in candidates:
             # Check applied date
-            if c.get('applied_date'):
-                try:
-                    applied_dt = datetime.datetime.strptime(c.get('applied_date'), '%Y-%m-%d')
-                except Exception:
-                    applied_dt = None
-                if applied_dt and applied_dt.date() == today:
-                    user_val = c.get('email', '')
-                    user_val = usernames.get(user_val, user_val)
-                    todays_activities.append({
-                        'date': c.get('applied_date'),
-                        'description': f"Candidate {c.get('name', '')} (ID: {c.get('id', '')}) applied",
-                        'user': user_val if user_val else 'Unknown',
-                        'type': 'candidate_applied',
-                        'entity_type': 'candidate',
-                        'entity_id': c.get('id', '')
-                    })
+            if c.applied == today:
+                user_val = c.get('email', '')
+                user_val = usernames.get(user_val, user_val)
+                todays_activities.append({
+                    'date': c.get('applied_date'),
+                    'description': f"Candidate {c.get('name', '')} (ID: {c.get('id', '')}) applied",
+                    'user': user_val if user_val else 'Unknown',
+                    'type': 'candidate_applied',
+                    'entity_type': 'candidate',
+                    'entity_id': c.get('id', '')
+                })
             
             # Check updates today
             if c.get('updated_at') and c.get('updated_by'):
@@ -1173,13 +885,8 @@ def fetch_todays_activities():
                         })
     
     # Legacy job activities for today
-    if os.path.exists(job_file):
-        with open(job_file, 'r') as f:
-            try:
-                jobs = json.load(f)
-            except json.JSONDecodeError:
-                jobs = []
-        
+    jobs = fetch_job_data()
+    if jobs:
         for job in jobs:
             posted_at = job.get('posted_at', '')
             try:
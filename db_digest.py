@@ -0,0 +1,150 @@
+"""
+Database Digest for AION HR System
+Compact plain-text digest of the whole database for LLM prompts that need all of it.
+
+Instead of json.dumps(fetch_all_db_data()) on every call (transcripts, AI reports
+and all), prompts embed the digest:
+- totals, and candidates/jobs per status
+- one line per job with its applicants per status, one line per department
+- one line per candidate (no transcripts, reports or contact details)
+- pending notifications and users' roles
+The digest is rebuilt only when candidates, jobs, users or notifications change.
+It is kept in memory and in db/db_digest.json, tagged with a hash of the data it
+was built from, so a restarted or second process reuses it instead of rebuilding.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from journal import atomic_write_json
+from repository import COLLECTIONS, repository
+
+
+# Longest skill list shown per candidate
+MAX_SKILLS = 5
+
+
+def _counts(counter: Counter) -> str:
+    return ', '.join(f"{key} {count}" for key, count in counter.most_common()) or 'none'
+
+
+def _status(record: Dict[str, Any]) -> str:
+    return str(record.get('status') or 'Unknown')
+
+
+def build_digest(data: Dict[str, List[Any]]) -> str:
+    """The digest text of collections {'candidates', 'jobs', 'users', 'notifications'}"""
+    candidates = [c for c in data['candidates'] if isinstance(c, dict)]
+    jobs = [j for j in data['jobs'] if isinstance(j, dict)]
+    users = [u for u in data['users'] if isinstance(u, dict)]
+    notifications = [n for n in data['notifications'] if isinstance(n, dict)]
+    jobs_by_id = {str(j.get('job_id')): j for j in jobs}
+
+    per_job: Dict[str, Counter] = defaultdict(Counter)
+    per_dept: Dict[str, Counter] = defaultdict(Counter)
+    dept_scores: Dict[str, List[float]] = defaultdict(list)
+    for c in candidates:
+        job = jobs_by_id.get(str(c.get('job_id')))
+        dept = (job or {}).get('department') or 'Unknown'
+        per_job[str(c.get('job_id'))][_status(c)] += 1
+        per_dept[dept][_status(c)] += 1
+        if isinstance(c.get('match_score'), (int, float)):
+            dept_scores[dept].append(c['match_score'])
+
+    lines = [
+        f"AION DB DIGEST ({datetime.now().strftime('%Y-%m-%d %H:%M')})",
+        f"Totals: {len(candidates)} candidates, {len(jobs)} jobs, {len(users)} users, "
+        f"{len(notifications)} notifications",
+        f"Candidates by status: {_counts(Counter(_status(c) for c in candidates))}",
+        f"Jobs by status: {_counts(Counter(_status(j) for j in jobs))}",
+        "",
+        "JOBS (id | title | department | status | openings | posted | applicants by status)",
+    ]
+    for j in jobs:
+        job_id = str(j.get('job_id'))
+        lines.append(f"- {job_id} | {j.get('job_title', '')} | {j.get('department', '')} | {_status(j)} | "
+                     f"{j.get('job_openings', '')} | {str(j.get('posted_at', ''))[:10]} | "
+                     f"{sum(per_job[job_id].values())}: {_counts(per_job[job_id])}")
+
+    lines += ["", "DEPARTMENTS (department | jobs | candidates by status | avg match score)"]
+    dept_jobs = Counter(j.get('department') or 'Unknown' for j in jobs)
+    for dept in sorted(set(dept_jobs) | set(per_dept)):
+        scores = dept_scores.get(dept)
+        avg = f"{sum(scores) / len(scores):.1f}" if scores else '-'
+        lines.append(f"- {dept} | {dept_jobs[dept]} | {sum(per_dept[dept].values())}: {_counts(per_dept[dept])} | {avg}")
+
+    lines += ["", "CANDIDATES (id | name | position | job | status | match | applied | hired | "
+                  "interviewer | onboarding | probation | skills)"]
+    for c in candidates:
+        skills = c.get('skills') if isinstance(c.get('skills'), list) else []
+        lines.append('- ' + ' | '.join(str(value) for value in (
+            c.get('id', ''), c.get('name', ''), c.get('position', ''), c.get('job_id', ''), _status(c),
+            c.get('match_score', '-'), c.get('applied_date') or '-', c.get('hired_date') or '-',
+            c.get('intervier') or '-', c.get('onboarding_status') or '-', c.get('probation_status') or '-',
+            ', '.join(str(s) for s in skills[:MAX_SKILLS]) or '-')))
+
+    pending = [n for n in notifications if str(n.get('status', '')).lower() == 'pending']
+    lines += ["", f"PENDING NOTIFICATIONS ({len(pending)})"]
+    lines += [f"- {str(n.get('timestamp', ''))[:10]} | {n.get('type', '')} | {n.get('candidate_name', '')} | "
+              f"{n.get('position', '')} | for {n.get('for_role', '')}" for n in pending]
+
+    lines += ["", f"USERS by role: {_counts(Counter(str(u.get('role') or 'Unknown') for u in users))}"]
+    return '\n'.join(lines)
+
+
+class DbDigest:
+    def __init__(self, repo=repository, path: Optional[str] = None):
+        self.repo = repo
+        self.path = path or os.path.join(repo.db_folder, 'db_digest.json')
+        self.lock = threading.Lock()
+        self._version: Optional[Tuple] = None
+        self._text: Optional[str] = None
+        self.stats = {'hits': 0, 'builds': 0, 'disk_hits': 0}
+
+    def _snapshot(self) -> Tuple[Tuple, Dict[str, List[Any]]]:
+        # load() revalidates against disk, so versions move with other processes' writes too.
+        # Versions are read before the data: a write in between only causes one extra rebuild.
+        for name in COLLECTIONS:
+            self.repo.load(name)
+        version = tuple(self.repo.version(name) for name in COLLECTIONS)
+        return version, {name: self.repo.load(name) for name in COLLECTIONS}
+
+    def text(self) -> str:
+        """The current digest; O(1) while the data is unchanged"""
+        version, data = self._snapshot()
+        with self.lock:
+            if self._text is not None and self._version == version:
+                self.stats['hits'] += 1
+                return self._text
+
+        # Versions are per process; the file is matched on the data itself
+        source = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        text = self._read(source)
+        from_disk = text is not None
+        if not from_disk:
+            text = build_digest(data)
+            try:
+                atomic_write_json(self.path, {'source': source, 'text': text})
+            except OSError as e:
+                print(f"⚠️ Could not save DB digest: {e}")
+        with self.lock:
+            self.stats['disk_hits' if from_disk else 'builds'] += 1
+            self._version, self._text = version, text
+            return text
+
+    def _read(self, source: str) -> Optional[str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return saved.get('text') if isinstance(saved, dict) and saved.get('source') == source else None
+
+
+# Global database digest instance
+db_digest = DbDigest()
@@ -0,0 +1,207 @@
+"""
+Calendar Event Index for AION HR System
+Time-ordered index of interviews, approvals, onboarding starts, future job
+postings and dated notifications, behind fetch_all_upcoming_events.
+
+Events are kept in sorted lists keyed by their parsed datetime - one for all
+events, one per type and one per interviewer - so "next N" and date-range queries
+are a bisect plus a slice. Dates are parsed once, when a record is indexed. A single
+record update re-derives that record's events through the repository listener;
+full saves and reloads rebuild the affected collection on the next query.
+"""
+
+import bisect
+import datetime
+import heapq
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from repository import COLLECTIONS, index_key, repository
+
+
+# Collections events come from; the position is their rank among same-time events
+SOURCES = ['candidates', 'jobs', 'notifications']
+# Shown whatever their date, like the dashboard always did
+UNDATED_TYPES = ['Approval']
+APPROVAL_STATUSES = ['Pending Approval', 'Selected']
+
+# (datetime, source rank, position in collection, event number within the record)
+EventKey = Tuple[datetime.datetime, int, int, int]
+
+
+def _parse(value: str, *formats: str) -> Optional[datetime.datetime]:
+    for fmt in formats:
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def candidate_events(c: Dict[str, Any]) -> List[Tuple[datetime.datetime, Dict[str, Any], str]]:
+    """(when, event, interviewer) for a candidate's interview, pending approval and onboarding"""
+    events = []
+    job_title = c.get('job_title', c.get('position', ''))
+    date_str, time_str = c.get('interview_date', ''), c.get('interview_time', '')
+    if date_str:
+        when = _parse(f"{date_str} {time_str}", "%Y-%m-%d %H:%M") if time_str else _parse(date_str, "%Y-%m-%d")
+        if when:
+            events.append((when, {'type': 'Interview', 'date': date_str, 'time': time_str, 'name': c.get('name', ''),
+                                  'job_title': job_title, 'candidate_id': c.get('id', '')},
+                           c.get('interviewer') or c.get('intervier') or ''))
+    applied_date = c.get('applied_date', '')
+    if c.get('status') in APPROVAL_STATUSES and applied_date:
+        events.append((_parse(applied_date, "%Y-%m-%d") or datetime.datetime.max,
+                       {'type': 'Approval', 'date': applied_date, 'time': '', 'name': c.get('name', ''),
+                        'job_title': job_title, 'candidate_id': c.get('id', '')}, ''))
+    onboarding = c.get('onboarding')
+    if c.get('status') == 'Hired' and isinstance(onboarding, dict) and onboarding.get('start_date'):
+        when = _parse(onboarding['start_date'], "%Y-%m-%d")
+        if when:
+            events.append((when, {'type': 'Onboarding', 'date': onboarding['start_date'], 'time': '',
+                                  'name': c.get('name', ''), 'job_title': job_title,
+                                  'candidate_id': c.get('id', '')}, ''))
+    return events
+
+
+def job_events(job: Dict[str, Any]) -> List[Tuple[datetime.datetime, Dict[str, Any], str]]:
+    posted_at = job.get('posted_at', '')
+    when = _parse(posted_at, "%Y-%m-%d %H:%M:%S", "%Y-%m-%d") if posted_at else None
+    if not when:
+        return []
+    return [(when, {'type': 'Job', 'date': posted_at.split(' ')[0],
+                    'time': posted_at.split(' ')[1] if ' ' in posted_at else '',
+                    'name': job.get('job_title', ''), 'job_title': job.get('job_title', ''),
+                    'job_id': job.get('job_id', job.get('id', ''))}, '')]
+
+
+def notification_events(n: Dict[str, Any]) -> List[Tuple[datetime.datetime, Dict[str, Any], str]]:
+    date_str, time_str = n.get('date', ''), n.get('time', '')
+    if not date_str:
+        return []
+    when = _parse(f"{date_str} {time_str}", "%Y-%m-%d %H:%M") if time_str else _parse(date_str, "%Y-%m-%d")
+    if not when:
+        return []
+    return [(when, {'type': 'Notification', 'date': date_str, 'time': time_str,
+                    'name': n.get('title', ''), 'description': n.get('description', '')}, '')]
+
+
+EXTRACTORS = {'candidates': candidate_events, 'jobs': job_events, 'notifications': notification_events}
+
+
+class EventIndex:
+    def __init__(self, repo=repository):
+        self.repo = repo
+        self.lock = threading.Lock()
+        self._events: Dict[EventKey, Dict[str, Any]] = {}
+        # None -> every event, ('type', t) and ('interviewer', name) -> that subset; all sorted
+        self._lists: Dict[Any, List[EventKey]] = {None: []}
+        self._keys: Dict[EventKey, List[Any]] = {}  # event -> the lists it is in
+        self._positions: Dict[str, Dict[int, List[EventKey]]] = {name: {} for name in SOURCES}
+        self._stale = set(SOURCES)
+        self._generation = {name: 0 for name in SOURCES}
+        self.stats = {'rebuilds': 0, 'updates': 0}
+        repo.subscribe(self._on_change)
+
+    def _add(self, name: str, position: int, record: Any, sort: bool = False):
+        if not isinstance(record, dict):
+            return
+        rank = SOURCES.index(name)
+        keys = self._positions[name].setdefault(position, [])
+        for number, (when, event, interviewer) in enumerate(EXTRACTORS[name](record)):
+            key = (when, rank, position, number)
+            lists = [None, ('type', event['type'])]
+            if interviewer:
+                lists.append(('interviewer', index_key(interviewer)))
+            self._events[key] = event
+            self._keys[key] = lists
+            keys.append(key)
+            for list_key in lists:
+                target = self._lists.setdefault(list_key, [])
+                if sort:
+                    target.append(key)
+                else:
+                    bisect.insort(target, key)
+
+    def _remove(self, name: str, position: int):
+        for key in self._positions[name].pop(position, []):
+            del self._events[key]
+            for list_key in self._keys.pop(key):
+                target = self._lists[list_key]
+                del target[bisect.bisect_left(target, key)]
+
+    def _on_change(self, key: str, data: List[Any], changed):
+        name = next((n for n in SOURCES if COLLECTIONS[n] == key), None)
+        if name is None:
+            return
+        with self.lock:
+            self._generation[name] += 1
+            if changed is None or name in self._stale:
+                self._stale.add(name)
+                return
+            position, _ = changed
+            self._remove(name, position)
+            self._add(name, position, data[position])
+            self.stats['updates'] += 1
+
+    def _refresh(self):
+        for name in SOURCES:
+            for attempt in range(3):
+                with self.lock:
+                    generation = self._generation[name]
+                records = self.repo.load(name)  # revalidates, so other processes' writes arrive
+                with self.lock:
+                    if name not in self._stale:
+                        break
+                    if self._generation[name] != generation and attempt < 2:
+                        continue  # changed while loading; index the newer list
+                    for position in list(self._positions[name]):
+                        self._remove(name, position)
+                    for position, record in enumerate(records):
+                        self._add(name, position, record, sort=True)
+                    for target in self._lists.values():
+                        target.sort()
+                    self._stale.discard(name)
+                    self.stats['rebuilds'] += 1
+                    break
+
+    def _list(self, event_type: Optional[str], interviewer: Optional[str]) -> List[EventKey]:
+        if interviewer:
+            keys = self._lists.get(('interviewer', index_key(interviewer)), [])
+            return [k for k in keys if self._events[k]['type'] == event_type] if event_type else keys
+        return self._lists.get(('type', event_type), []) if event_type else self._lists[None]
+
+    def _slice(self, keys: List[EventKey], start: Optional[datetime.datetime],
+               end: Optional[datetime.datetime]) -> Iterator[EventKey]:
+        lo = bisect.bisect_left(keys, (start,)) if start else 0
+        hi = bisect.bisect_left(keys, (end,)) if end else len(keys)
+        return (keys[i] for i in range(lo, hi))
+
+    def between(self, start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None,
+                event_type: Optional[str] = None, interviewer: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events with start <= datetime < end, soonest first (copies)"""
+        self._refresh()
+        with self.lock:
+            keys = self._slice(self._list(event_type, interviewer), start, end)
+            return [dict(self._events[k]) for k in islice(keys, limit)]
+
+    def next(self, n: int, event_type: Optional[str] = None, interviewer: Optional[str] = None,
+             now: Optional[datetime.datetime] = None) -> List[Dict[str, Any]]:
+        """The next n events from now on"""
+        return self.between(now or datetime.datetime.now(), None, event_type, interviewer, limit=n)
+
+    def upcoming(self, limit: int = 30, now: Optional[datetime.datetime] = None) -> List[Dict[str, Any]]:
+        """Dashboard feed: future events plus every pending approval, soonest first"""
+        now = now or datetime.datetime.now()
+        self._refresh()
+        with self.lock:
+            dated = (k for k in self._slice(self._lists[None], now, None)
+                     if self._events[k]['type'] not in UNDATED_TYPES)
+            merged = heapq.merge(dated, *[self._lists.get(('type', t), []) for t in UNDATED_TYPES])
+            return [dict(self._events[k]) for k in islice(merged, limit)]
+
+
+# Global event index instance
+event_index = EventIndex()
@@ -0,0 +1,129 @@
+"""
+Event Log Writer for AION HR System
+One long-lived background thread appends log_event() entries to db/log.jsonl.
+
+Events wait in a bounded queue and are coalesced into a single append per flush
+interval; when the queue is full, callers block until the writer catches up.
+Entries from the legacy db/log.json are still returned by events().
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from locking import file_lock
+from repository import repository
+
+
+# Max queued events before log_event() blocks (backpressure)
+QUEUE_SIZE = int(os.environ.get('AION_EVENT_QUEUE_SIZE', '1000'))
+# Seconds the writer waits for more events before appending a batch
+FLUSH_INTERVAL = int(os.environ.get('AION_EVENT_FLUSH_MS', '100')) / 1000.0
+
+
+class EventLog:
+    def __init__(self, db_folder: Optional[str] = None, queue_size: int = QUEUE_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.db_folder = db_folder or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db')
+        self.path = os.path.join(self.db_folder, 'log.jsonl')
+        self.flush_interval = flush_interval
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._read_offset = 0
+        self._events: List[Dict[str, Any]] = []
+        self.stats = {'events': 0, 'batches': 0}
+        atexit.register(self.close)
+
+    def submit(self, entry: Dict[str, Any]):
+        """Queue an event for the writer; blocks while the queue is full"""
+        if self._stopping:
+            self._append([entry])
+            return
+        self._ensure_writer()
+        self.queue.put(entry)
+
+    def _ensure_writer(self):
+        with self.lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='event-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            # Give a burst time to arrive so it lands in a single append
+            time.sleep(self.flush_interval)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [entry for entry in batch if entry is not None]
+            try:
+                if entries:
+                    self._append(entries)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            if len(entries) < len(batch):
+                return  # stop sentinel from close()
+
+    def _append(self, entries: List[Dict[str, Any]]):
+        data = ''.join(json.dumps(entry, ensure_ascii=False, default=str) + '\n' for entry in entries)
+        try:
+            os.makedirs(self.db_folder, exist_ok=True)
+            with file_lock(os.path.join(self.db_folder, '.locks', 'log.jsonl.lock')):
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data.encode('utf-8'))
+                finally:
+                    os.close(fd)
+            self.stats['events'] += len(entries)
+            self.stats['batches'] += 1
+        except Exception as e:
+            print(f"Error logging event: {e}")
+
+    def flush(self):
+        """Block until every queued event has been written"""
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        """Write out pending events and stop the writer (registered with atexit)"""
+        self._stopping = True
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join(timeout=5)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Legacy log.json entries followed by log.jsonl entries, in write order"""
+        self.flush()
+        legacy = repository.load(os.path.join(self.db_folder, 'log.json'))
+        with self.lock:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) < self._read_offset:
+                # Removed or replaced: start over
+                self._read_offset, self._events = 0, []
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(self._read_offset)
+                    chunk = f.read()
+            except OSError:
+                chunk = b''
+            end = chunk.rfind(b'\n') + 1
+            for line in chunk[:end].splitlines():
+                try:
+                    self._events.append(json.loads(line))
+                except ValueError:
+                    continue
+            self._read_offset += end
+            return (legacy if isinstance(legacy, list) else []) + self._events
+
+
+# Global event log instance
+event_log = EventLog()
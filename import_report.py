@@ -0,0 +1,103 @@
+"""
+Import Time Report for AION HR System
+What importing the app costs at startup, module by module (python -X importtime).
+
+    python import_report.py [module ...]      (default: app)
+
+Each module is imported in a fresh interpreter. The report lists the slowest
+imports by cumulative time and the self time per top-level package, then checks
+- the total against IMPORT_BUDGET_MS
+- that none of HEAVY_MODULES were loaded (they belong behind first use,
+  e.g. tools.py behind tool_registry.py and matplotlib behind chart_service.py)
+and exits with status 1 if either check fails.
+"""
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+
+# Startup import budget per module, in milliseconds
+IMPORT_BUDGET_MS = int(os.environ.get('AION_IMPORT_BUDGET_MS', '1500'))
+# Packages that must not be imported on startup
+HEAVY_MODULES = ('matplotlib', 'pandas', 'seaborn')
+
+
+class ImportTime(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> List[ImportTime]:
+    """Rows of -X importtime output ("import time: self [us] | cumulative | imported package")"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header
+        rows.append(ImportTime(fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def import_times(module: str) -> List[ImportTime]:
+    """Import module in a fresh interpreter and return its import times"""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=app_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        raise RuntimeError(f"import {module} failed: {error[-1] if error else result.returncode}")
+    return parse_importtime(result.stderr)
+
+
+def package_totals(rows: List[ImportTime]) -> Dict[str, int]:
+    """Self time per top-level package, in microseconds"""
+    totals: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        totals[row.name.split('.')[0]] += row.self_us
+    return dict(totals)
+
+
+def report(module: str, top: int = 15) -> bool:
+    """Print the import report of one module; True if it is within budget and light"""
+    rows = import_times(module)
+    total_ms = sum(row.self_us for row in rows) / 1000
+    heavy = sorted({row.name.split('.')[0] for row in rows} & set(HEAVY_MODULES))
+
+    print(f"📦 import {module}: {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms), {len(rows)} modules")
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for row in sorted(rows, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        print(f"{row.cumulative_us / 1000:>14.1f}  {row.self_us / 1000:>8.1f}  {row.name}")
+    print(f"{'package ms':>14}  package")
+    for package, us in sorted(package_totals(rows).items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{us / 1000:>14.1f}  {package}")
+
+    ok = total_ms <= IMPORT_BUDGET_MS and not heavy
+    if total_ms > IMPORT_BUDGET_MS:
+        print(f"❌ {module} takes {total_ms:.0f} ms to import, over the {IMPORT_BUDGET_MS} ms budget")
+    if heavy:
+        print(f"❌ {module} loads {', '.join(heavy)} on import")
+    if ok:
+        print(f"✅ {module} within budget")
+    return ok
+
+
+def main(argv: List[str]) -> int:
+    results = []
+    for module in argv or ['app']:
+        try:
+            results.append(report(module))
+        except RuntimeError as e:
+            print(f"⚠️ {e}")
+            results.append(False)
+        print()
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,183 @@
+"""
+Materialized Job Status View for AION HR System
+Keeps one status record per job (Open/Closed, hired count, vacancies remaining,
+closing date) so listing pages never recompute statuses or rewrite jobs.json.
+
+Records are refreshed when the repository reports a change: a single candidate
+update only recomputes the jobs it touches, while job edits and reloads rebuild the
+view. Open jobs also carry their lead-time deadline; the earliest one is the timer
+at which those jobs are recomputed and flip to Closed.
+"""
+
+import datetime
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from repository import COLLECTIONS, repository
+
+
+# Stored job statuses that keep a job out of the open vacancies regardless of the view
+CLOSED_OVERRIDES = ['closed', 'filled', 'cancelled', 'expired', 'on hold']
+
+
+def job_openings(job: Dict[str, Any]) -> int:
+    """Openings of a job, trying the common key names like the legacy counters"""
+    for key in ['job_openings', 'openings', 'openings_count', 'vacancies']:
+        if key in job:
+            try:
+                return int(job[key])
+            except (ValueError, TypeError):
+                continue
+    return 0
+
+
+class JobStatusView:
+    def __init__(self, repo=repository):
+        self.repo = repo
+        self.lock = threading.RLock()
+        # Guards only the dirty markers: the listener runs under the repository lock,
+        # so it must never wait for self.lock, which is held while querying the repository
+        self._dirty_lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        self._dirty_all = True
+        self._next_expiry: Optional[datetime.datetime] = None
+        # Bumped whenever records are recomputed, including lead-time expiries
+        self.version = 0
+        self.stats = {'rebuilds': 0, 'recomputed': 0}
+        repo.subscribe(self._on_change)
+
+    def _on_change(self, key: str, data: List[Any], changed):
+        """Repository listener: work out which job records a mutation invalidates"""
+        if key not in (COLLECTIONS['candidates'], COLLECTIONS['jobs']):
+            return
+        with self._dirty_lock:
+            if changed is None or key == COLLECTIONS['jobs']:
+                self._dirty_all = True
+                return
+            position, old = changed
+            new = data[position]
+            was_hired = str(old.get('status', '')).lower() == 'hired'
+            is_hired = str(new.get('status', '')).lower() == 'hired'
+            if was_hired != is_hired or str(old.get('job_id', '')) != str(new.get('job_id', '')):
+                self._dirty.update({str(old.get('job_id', '')), str(new.get('job_id', ''))})
+
+    def _compute(self, job: Dict[str, Any], now: datetime.datetime) -> Dict[str, Any]:
+        """Same rules as calculate_automatic_job_status / calculate_job_status_info"""
+        job_id = str(job.get('job_id', ''))
+        try:
+            posted_date = datetime.datetime.strptime(job.get('posted_at', ''), '%Y-%m-%d %H:%M:%S')
+            has_deadline = True
+        except (ValueError, TypeError):
+            # Unparsable dates count as just posted, i.e. never expire
+            posted_date, has_deadline = now, False
+        try:
+            lead_time_days = int(job.get('job_lead_time', 30))
+        except (ValueError, TypeError):
+            lead_time_days = 30
+        closing_date = posted_date + datetime.timedelta(days=lead_time_days)
+
+        hired_count = sum(1 for c in self.repo.find('candidates', 'job_id', job_id)
+                          if str(c.get('status', '')).lower() == 'hired')
+        try:
+            total_openings = int(job.get('job_openings', 0))
+        except (ValueError, TypeError):
+            total_openings = 0
+        vacancies_remaining = max(0, total_openings - hired_count)
+
+        expired = has_deadline and now > closing_date
+        status = 'Closed' if expired or hired_count >= total_openings else 'Open'
+        self.stats['recomputed'] += 1
+        return {
+            'job_id': job_id,
+            'status': status,
+            'is_active': status == 'Open' and str(job.get('status', '')).lower() not in CLOSED_OVERRIDES,
+            'openings': job_openings(job),
+            'hired_count': hired_count,
+            'total_openings': total_openings,
+            'vacancies_remaining': vacancies_remaining,
+            'lead_time_days': lead_time_days,
+            'posted_date': posted_date.strftime('%Y-%m-%d'),
+            'closing_date': closing_date.strftime('%Y-%m-%d'),
+            'closing_at': closing_date,
+            # The lead-time boundary at which an open job has to be recomputed
+            'expires_at': closing_date if has_deadline and status == 'Open' else None,
+        }
+
+    def _refresh(self) -> Dict[str, Dict[str, Any]]:
+        # Loading revalidates both files, so changes from other processes reach _on_change
+        self.repo.load('jobs')
+        self.repo.load('candidates')
+        now = datetime.datetime.now()
+        with self.lock:
+            with self._dirty_lock:
+                dirty, dirty_all = self._dirty, self._dirty_all
+                self._dirty, self._dirty_all = set(), False
+            if self._next_expiry is not None and now > self._next_expiry:
+                dirty.update(job_id for job_id, record in self._records.items()
+                             if record['expires_at'] is not None and now > record['expires_at'])
+            if not dirty_all and not dirty:
+                return self._records
+            if dirty_all:
+                records = {}
+                for job in self.repo.load('jobs'):
+                    records[str(job.get('job_id', ''))] = self._compute(job, now)
+                self.stats['rebuilds'] += 1
+            else:
+                records = dict(self._records)
+                for job_id in dirty:
+                    job = self.repo.find_one('jobs', 'job_id', job_id)
+                    if job is not None:
+                        records[job_id] = self._compute(job, now)
+            self._records = records
+            self.version += 1
+            deadlines = [r['expires_at'] for r in records.values() if r['expires_at'] is not None]
+            self._next_expiry = min(deadlines) if deadlines else None
+            return records
+
+    def get(self, job_id: Any) -> Optional[Dict[str, Any]]:
+        """Status record of one job, or None for an unknown job_id"""
+        return self._refresh().get(str(job_id))
+
+    def status(self, job: Dict[str, Any]) -> str:
+        """'Open' or 'Closed' for a job record"""
+        record = self.get(job.get('job_id', ''))
+        return record['status'] if record else self._compute(job, datetime.datetime.now())['status']
+
+    def info(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job status popup details, with days_remaining as of now"""
+        record = self.get(job.get('job_id', '')) or self._compute(job, datetime.datetime.now())
+        days_remaining = (record['closing_at'] - datetime.datetime.now()).days
+        info = {key: record[key] for key in ('closing_date', 'hired_count', 'total_openings',
+                                             'vacancies_remaining', 'lead_time_days', 'posted_date')}
+        info.update(days_remaining=days_remaining, is_expired=days_remaining < 0,
+                    is_filled=record['vacancies_remaining'] == 0)
+        return info
+
+    def jobs_with_status(self) -> List[Dict[str, Any]]:
+        """Job records with 'status' replaced by the computed status (copies, safe to hand to templates)"""
+        records = self._refresh()
+        return [
+            {**job, 'status': records[str(job.get('job_id', ''))]['status']}
+            if str(job.get('job_id', '')) in records else dict(job)
+            for job in self.repo.load('jobs')
+        ]
+
+    def current_version(self) -> int:
+        """Version of the view after applying pending changes and expiries"""
+        self._refresh()
+        return self.version
+
+    def active_job_ids(self) -> Set[str]:
+        """job_ids of jobs that are open and not held closed by their stored status"""
+        return {job_id for job_id, record in self._refresh().items() if record['is_active']}
+
+    def open_vacancies(self) -> int:
+        return sum(r['openings'] for r in self._refresh().values() if r['is_active'])
+
+    def closed_vacancies(self) -> int:
+        return sum(r['openings'] for r in self._refresh().values() if not r['is_active'])
+
+
+# Global job status view
+job_status_view = JobStatusView()
@@ -0,0 +1,199 @@
+"""
+Atomic JSON Writes and Mutation Journal for AION HR System
+Full rewrites go through temp file + fsync + os.replace, so readers never see a
+half-written file. Small record updates are appended to <file>.journal and folded
+into the base file once enough of them have accumulated.
+
+Durability is configured with AION_DURABILITY:
+    always - fsync the journal on every update (default)
+    group  - group commit: fsync pending journals every AION_GROUP_COMMIT_MS (default 200)
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DURABILITY = os.environ.get('AION_DURABILITY', 'always').lower()
+GROUP_COMMIT_INTERVAL = int(os.environ.get('AION_GROUP_COMMIT_MS', '200')) / 1000.0
+# Journal entries allowed before the collection is compacted into its base file
+COMPACT_AFTER = int(os.environ.get('AION_JOURNAL_COMPACT_AFTER', '200'))
+
+
+def _fsync_path(path: str):
+    """fsync a file or directory by path (directories make renames durable)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 4, fsync: bool = True, **dump_kwargs):
+    """Write JSON to a temp file in the same folder, fsync it and rename it over path"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, **dump_kwargs)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_path(directory)
+
+
+class GroupCommitter:
+    """Background flusher that fsyncs every journal written since the last tick"""
+
+    def __init__(self, interval: float = GROUP_COMMIT_INTERVAL):
+        self.interval = interval
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def mark(self, path: str):
+        with self._lock:
+            self._dirty.add(path)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='journal-group-commit', daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        with self._lock:
+            paths, self._dirty = self._dirty, set()
+        for path in paths:
+            _fsync_path(path)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+group_committer = GroupCommitter()
+
+
+class MutationJournal:
+    """
+    Append-only JSONL log of record updates layered on a JSON base file.
+
+    The first line records the identity of the base file it applies to; once the base
+    is rewritten (compaction or a full save) the old journal no longer matches and is
+    ignored, so a crash between the two steps cannot replay stale updates.
+    """
+
+    def __init__(self, base_path: str, durability: str = DURABILITY):
+        self.base_path = base_path
+        self.path = base_path + '.journal'
+        self.durability = durability
+        self.entries = 0
+
+    def _base_id(self) -> Optional[List[int]]:
+        try:
+            st = os.stat(self.base_path)
+        except OSError:
+            return None
+        return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+    def _read_lines(self) -> List[str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return f.read().splitlines()
+        except OSError:
+            return []
+
+    def _is_current(self, header_line: str) -> bool:
+        try:
+            return json.loads(header_line).get('base') == self._base_id()
+        except (ValueError, AttributeError):
+            return False
+
+    def append(self, key_field: str, key: Any, changes: Dict[str, Any]) -> int:
+        """Record one update; returns the number of entries now in the journal"""
+        line = json.dumps({'key_field': key_field, 'key': key, 'changes': changes}, ensure_ascii=False) + '\n'
+        with open(self.path, 'a+b') as f:
+            f.seek(0)
+            header = f.readline().decode('utf-8', 'replace')
+            if not header or not self._is_current(header):
+                # Missing or stale journal: start a new one for the current base file
+                f.truncate(0)
+                f.write((json.dumps({'base': self._base_id()}) + '\n').encode('utf-8'))
+                self.entries = 0
+            else:
+                # Terminate a torn line left by a crash so this entry stays parseable
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(line.encode('utf-8'))
+            f.flush()
+            if self.durability == 'always':
+                os.fsync(f.fileno())
+        if self.durability != 'always':
+            group_committer.mark(self.path)
+        self.entries += 1
+        return self.entries
+
+    def replay(self, records: List[Any]) -> Tuple[List[Any], int]:
+        """Apply journaled updates to the base records; returns (records, entries applied)"""
+        lines = self._read_lines()
+        if not lines or not self._is_current(lines[0]):
+            self.entries = 0
+            return records, 0
+        records = list(records)
+        lookups: Dict[str, Dict[Any, int]] = {}
+        applied = 0
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn tail from a crash mid-append
+            field = entry.get('key_field')
+            if field not in lookups:
+                lookup = {}
+                for index, record in enumerate(records):
+                    try:
+                        lookup.setdefault(record.get(field), index)
+                    except (AttributeError, TypeError):
+                        continue
+                lookups[field] = lookup
+            try:
+                index = lookups[field].get(entry.get('key'))
+            except TypeError:
+                index = None
+            if index is None:
+                continue
+            records[index] = {**records[index], **entry.get('changes', {})}
+            applied += 1
+        self.entries = len(lines) - 1
+        return records, applied
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.entries = 0
@@ -0,0 +1,195 @@
+"""
+LLM Call Layer for AION HR System
+One entry point for OpenAI chat completions, backed by a persistent response cache.
+
+Deterministic calls (temperature 0) are answered from db/llm_cache.sqlite3 when the
+same (model, messages, temperature, data version) was asked before, so re-reading a
+JD, a resume or a transcript, or regenerating insights over unchanged data, costs
+no API call. Entries expire after TTL_S; past MAX_BYTES the least recently used
+entries are evicted. The SQLite file (WAL mode) is shared by every worker process.
+Hits, misses and evictions are counted in stats (served by /api/metrics).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+
+DB_FILENAME = 'llm_cache.sqlite3'
+# Seconds a cached response stays valid
+TTL_S = int(os.environ.get('AION_LLM_CACHE_TTL_S', str(7 * 24 * 3600)))
+# Size the cache is trimmed back to, least recently used first
+MAX_BYTES = int(os.environ.get('AION_LLM_CACHE_MB', '20')) * 1024 * 1024
+# Model used when a caller does not name one
+DEFAULT_MODEL = 'gpt-4o'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    model    TEXT NOT NULL,
+    created  REAL NOT NULL,
+    used     REAL NOT NULL,
+    size     INTEGER NOT NULL,
+    response TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_used ON responses (used);
+"""
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], temperature: float,
+              data_version: Optional[Hashable] = None) -> str:
+    """Stable hash of everything a deterministic completion depends on"""
+    payload = json.dumps([model, messages, temperature, data_version], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LlmCache:
+    def __init__(self, db_path: Optional[str] = None, ttl: float = TTL_S, max_bytes: int = MAX_BYTES):
+        self.db_path = db_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db', DB_FILENAME)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self._ready = False
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'evictions': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; the file and schema are created on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if not self._ready:
+                conn.executescript(SCHEMA)
+                self._ready = True
+            self._local.conn = conn
+        return conn
+
+    def _count(self, stat: str, amount: int = 1):
+        with self.lock:
+            self.stats[stat] += amount
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None if missing or older than the TTL"""
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT created, response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+        created, response = row
+        if now - created > self.ttl:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count('expired')
+            self._count('misses')
+            return None
+        conn.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+        self._count('hits')
+        return response
+
+    def put(self, key: str, model: str, response: str):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, created, used, size, response) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, now, now, len(response.encode('utf-8')), response)
+        )
+        self._count('stores')
+        self._evict(conn, keep=key)
+
+    def _evict(self, conn: sqlite3.Connection, keep: str):
+        """Drop expired entries, then least recently used ones until the cache fits in max_bytes"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            expired = conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY used").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    if key == keep:
+                        continue
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    evicted += 1
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._count('expired', expired)
+        self._count('evictions', evicted)
+
+    def summary(self) -> Dict[str, Any]:
+        """stats plus the entries and bytes currently stored (all processes)"""
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        with self.lock:
+            return dict(self.stats, entries=entries, bytes=size)
+
+
+class LlmClient:
+    def __init__(self, cache: Optional[LlmCache] = None):
+        self.cache = cache or LlmCache()
+        self.lock = threading.Lock()
+        self.stats = {'calls': 0, 'cached': 0, 'errors': 0}
+
+    def chat(self, messages: List[Dict[str, Any]], model: str = DEFAULT_MODEL, temperature: float = 0,
+             data_version: Optional[Hashable] = None, cache: Optional[bool] = None, **kwargs) -> str:
+        """Content of the model's reply to messages.
+
+        Cached when the call is deterministic (temperature 0, no tools) unless cache=False.
+        data_version goes into the key for prompts that depend on data they do not contain.
+        API errors are raised to the caller; they are never cached.
+        """
+        if cache is None:
+            cache = temperature == 0 and 'tools' not in kwargs
+        key = cache_key(model, messages, temperature, data_version) if cache else None
+        if key is not None:
+            try:
+                cached = self.cache.get(key)
+            except sqlite3.Error as e:
+                print(f"⚠️ LLM cache unavailable: {e}")
+                key = cached = None
+            if cached is not None:
+                with self.lock:
+                    self.stats['cached'] += 1
+                return cached
+
+        import openai
+        with self.lock:
+            self.stats['calls'] += 1
+        try:
+            response = openai.ChatCompletion.create(model=model, messages=messages,
+                                                    temperature=temperature, **kwargs)
+        except Exception:
+            with self.lock:
+                self.stats['errors'] += 1
+            raise
+        content = response['choices'][0]['message']['content'] or ''
+        if key is not None:
+            try:
+                self.cache.put(key, model, content)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not cache LLM response: {e}")
+        return content
+
+    def metrics(self) -> Dict[str, Any]:
+        """Call counters and cache counters, for /api/metrics"""
+        with self.lock:
+            calls = dict(self.stats)
+        try:
+            calls['cache'] = self.cache.summary()
+        except sqlite3.Error as e:
+            calls['cache'] = {'error': str(e)}
+        return calls
+
+
+# Global LLM client, shared by data.py and app.py
+llm = LlmClient()
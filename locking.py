@@ -0,0 +1,71 @@
+"""
+Cross-process Locking for AION HR System
+fcntl-based exclusive locks on small lock files under db/.locks, re-entrant within a
+thread, so several gunicorn workers can safely run read-modify-write cycles.
+Falls back to in-process locks where fcntl is unavailable (Windows).
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+class ConflictError(Exception):
+    """A record changed between read and write and retries were exhausted"""
+
+
+_held = threading.local()
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+
+def _process_lock(path: str) -> threading.Lock:
+    with _process_locks_guard:
+        lock = _process_locks.get(path)
+        if lock is None:
+            lock = _process_locks[path] = threading.Lock()
+        return lock
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Hold an exclusive lock on path for the duration of the block.
+
+    Nested acquisitions of the same path by the same thread are counted instead of
+    re-locking, since flock() on a second descriptor would deadlock against the first.
+    """
+    counts = getattr(_held, 'counts', None)
+    if counts is None:
+        counts = _held.counts = {}
+    if counts.get(path):
+        counts[path] += 1
+        try:
+            yield
+        finally:
+            counts[path] -= 1
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    thread_lock = _process_lock(path)
+    thread_lock.acquire()
+    fd = None
+    try:
+        if fcntl is not None:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        counts[path] = 1
+        try:
+            yield
+        finally:
+            counts[path] = 0
+    finally:
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        thread_lock.release()
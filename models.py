@@ -0,0 +1,294 @@
+"""
+Typed Record Models for AION HR System
+Compact __slots__ dataclasses for candidates, jobs and notifications.
+
+Dates are parsed once, when a record is converted, and statuses are interned into
+the Status enum, so analytics loops compare dates and enum members instead of
+re-parsing strings and calling .lower().strip() on every pass. Heavy fields such as
+the interview transcript and AI report are not copied; they are read lazily from
+the underlying record. RecordModels keeps the converted lists per collection and
+patches them through the repository listener, like the other derived views.
+"""
+
+import datetime
+import sys
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from repository import COLLECTIONS, index_key, repository
+
+
+class Status(str, Enum):
+    """Candidate statuses; compares equal to the stored strings ('Hired' == Status.HIRED)"""
+    NEW = 'New'
+    APPLIED = 'Applied'
+    SHORTLISTED = 'Shortlisted'
+    INTERVIEW_SCHEDULED = 'Interview Scheduled'
+    INTERVIEWED = 'Interviewed'
+    INTERVIEW_ANALYZED = 'Interview Analyzed'
+    SELECTED = 'Selected'
+    PENDING_APPROVAL = 'Pending Approval'
+    APPROVED = 'Approved'
+    NOT_APPROVED = 'Not Approved'
+    ON_HOLD = 'On Hold'
+    ONBOARDING = 'Onboarding'
+    HIRED = 'Hired'
+    REJECTED = 'Rejected'
+    WITHDRAWN = 'Withdrawn'
+    RESIGNED = 'Resigned'
+    FIRED = 'Fired'
+    OTHER = ''
+
+    @classmethod
+    def of(cls, value: Any) -> 'Status':
+        """Member for a stored status, ignoring case and surrounding spaces; OTHER if unknown"""
+        return _STATUS_LOOKUP.get(index_key(value), cls.OTHER)
+
+
+_STATUS_LOOKUP = {index_key(status.value): status for status in Status if status.value}
+
+
+def parse_day(value: Any) -> Optional[datetime.date]:
+    """'YYYY-MM-DD' (or the date part of 'YYYY-MM-DD HH:MM:SS' / ISO timestamps) as a date"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def parse_datetime(value: Any) -> Optional[datetime.datetime]:
+    """'YYYY-MM-DD HH:MM:SS', ISO 8601 or a bare date as a datetime"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        day = parse_day(value)
+        return datetime.datetime(day.year, day.month, day.day) if day else None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).replace(',', '')) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def _int(value: Any, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _naive(value: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    """Offset-aware timestamps as naive local-clock ones, so both kinds sort together"""
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
+
+
+def _text(value: Any) -> str:
+    """Interned string form; the same department/position strings repeat across records"""
+    return sys.intern(str(value)) if value not in (None, '') else ''
+
+
+@dataclass(slots=True)
+class Candidate:
+    id: Any
+    name: str
+    position: str
+    department: str
+    job_id: str
+    status: Status
+    status_text: str
+    applied: Optional[datetime.date]
+    interview: Optional[datetime.date]
+    hired: Optional[datetime.date]
+    joining: Optional[datetime.date]
+    start: Optional[datetime.date]
+    salary: Optional[float]
+    onboarding_status: str
+    interviewer: str
+    record: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, c: Dict[str, Any]) -> 'Candidate':
+        return cls(
+            id=c.get('id'),
+            name=c.get('name', ''),
+            position=_text(c.get('position')),
+            department=_text(c.get('department')),
+            job_id=_text(c.get('job_id')),
+            status=Status.of(c.get('status')),
+            status_text=_text(c.get('status')),
+            applied=parse_day(c.get('applied_date')),
+            interview=parse_day(c.get('interview_date')),
+            hired=parse_day(c.get('hired_date')),
+            joining=parse_day(c.get('date_of_joining')),
+            start=parse_day(c.get('start_date')),
+            salary=_float(c.get('offered_salary')),
+            onboarding_status=_text(c.get('onboarding_status') or 'pending'),
+            interviewer=_text(c.get('interviewed_by') or c.get('recruiter') or 'Unknown'),
+            record=c,
+        )
+
+    @property
+    def transcript(self) -> Optional[str]:
+        return self.record.get('interview_transcript')
+
+    @property
+    def ai_interview_report(self) -> Any:
+        return self.record.get('ai_interview_report')
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Any other field of the underlying record"""
+        return self.record.get(key, default)
+
+
+@dataclass(slots=True)
+class Job:
+    job_id: str
+    title: str
+    department: str
+    status: str  # stored status, lowercased ('open', 'closed', ...)
+    openings: int
+    lead_time_days: int
+    posted_at: Optional[datetime.datetime]
+    record: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, job: Dict[str, Any]) -> 'Job':
+        return cls(
+            job_id=_text(job.get('job_id')),
+            title=job.get('job_title', ''),
+            department=_text(job.get('department')),
+            status=_text(index_key(job.get('status'))),
+            openings=_int(job.get('job_openings')),
+            lead_time_days=_int(job.get('job_lead_time'), 30),
+            posted_at=parse_datetime(job.get('posted_at')),
+            record=job,
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.record.get(key, default)
+
+
+@dataclass(slots=True)
+class Notification:
+    id: Any
+    type: str
+    status: str
+    for_role: str
+    candidate_id: Any
+    approved_by: str
+    timestamp: Optional[datetime.datetime]
+    approved_at: Optional[datetime.datetime]
+    record: Dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, n: Dict[str, Any]) -> 'Notification':
+        return cls(
+            id=n.get('id'),
+            type=_text(n.get('type')),
+            status=_text(n.get('status')),
+            for_role=_text(n.get('for_role')),
+            candidate_id=n.get('candidate_id'),
+            approved_by=_text(n.get('approved_by')),
+            timestamp=parse_datetime(n.get('timestamp')),
+            approved_at=parse_datetime(n.get('approved_at')),
+            record=n,
+        )
+
+    @property
+    def sort_time(self) -> datetime.datetime:
+        """timestamp for sorting; undated notifications sort first"""
+        return _naive(self.timestamp) or datetime.datetime.min
+
+    @property
+    def approved_time(self) -> datetime.datetime:
+        """approved_at, else timestamp, for sorting decisions"""
+        return _naive(self.approved_at) or self.sort_time
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.record.get(key, default)
+
+
+def latest_decisions(notifications: List[Notification]) -> Dict[Tuple[str, str, str], Notification]:
+    """
+    Latest notification each approver acted on, by (index_key(candidate_id), for_role, approved_by).
+    One pass, so approval views look decisions up instead of scanning every notification per candidate.
+    """
+    latest: Dict[Tuple[str, str, str], Notification] = {}
+    for n in notifications:
+        if not n.approved_by:
+            continue
+        key = (index_key(n.candidate_id), n.for_role, n.approved_by)
+        if key not in latest or n.sort_time > latest[key].sort_time:
+            latest[key] = n
+    return latest
+
+
+MODELS = {'candidates': Candidate, 'jobs': Job, 'notifications': Notification}
+
+
+class RecordModels:
+    def __init__(self, repo=repository):
+        self.repo = repo
+        self.lock = threading.Lock()
+        self._lists: Dict[str, List[Any]] = {}
+        self._stale = set(MODELS)
+        self._generation = {name: 0 for name in MODELS}
+        self.stats = {'rebuilds': 0, 'updates': 0}
+        repo.subscribe(self._on_change)
+
+    def _on_change(self, key: str, data: List[Any], changed):
+        name = next((n for n in MODELS if COLLECTIONS[n] == key), None)
+        if name is None:
+            return
+        with self.lock:
+            self._generation[name] += 1
+            if changed is None or name in self._stale or not isinstance(data[changed[0]], dict):
+                self._stale.add(name)
+                return
+            position, _ = changed
+            # Copy-on-write, so lists already handed out stay consistent
+            models = list(self._lists[name])
+            models[position] = MODELS[name].from_dict(data[position])
+            self._lists[name] = models
+            self.stats['updates'] += 1
+
+    def get(self, name: str) -> List[Any]:
+        """Typed records of a collection, in collection order (shared - treat as read-only)"""
+        for attempt in range(3):
+            with self.lock:
+                generation = self._generation[name]
+            records = self.repo.load(name)  # revalidates, so other processes' writes arrive
+            with self.lock:
+                if name not in self._stale:
+                    return self._lists[name]
+                if self._generation[name] != generation and attempt < 2:
+                    continue  # changed while loading; convert the newer list
+                # Non-dict rows are dropped, which shifts positions: later single updates rebuild
+                models = [MODELS[name].from_dict(r) for r in records if isinstance(r, dict)]
+                self._lists[name] = models
+                if len(models) == len(records):
+                    self._stale.discard(name)
+                self.stats['rebuilds'] += 1
+                return models
+        return self._lists[name]
+
+    def candidates(self) -> List[Candidate]:
+        return self.get('candidates')
+
+    def jobs(self) -> List[Job]:
+        return self.get('jobs')
+
+    def notifications(self) -> List[Notification]:
+        return self.get('notifications')
+
+
+# Global typed record models
+record_models = RecordModels()
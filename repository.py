@@ -0,0 +1,359 @@
+"""
+Shared JSON Repository for AION HR System
+Holds parsed db/*.json collections in memory and revalidates them by file stat,
+so repeated reads within and across requests cost no JSON parsing.
+
+JSON files are replaced atomically on save, and single-record updates are appended
+to a mutation journal (see journal.py) instead of rewriting the whole file.
+Writes hold a cross-process lock per collection (see locking.py); mutate_record()
+adds optimistic compare-and-swap with retry on top.
+
+When db/aion.sqlite3 exists (see sqlite_store.migrate_json_to_sqlite) the four core
+collections are stored in SQLite instead; AION_STORAGE=json|sqlite forces a backend.
+"""
+
+import bisect
+import copy
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from journal import COMPACT_AFTER, MutationJournal, atomic_write_json
+from locking import ConflictError, file_lock
+from sqlite_store import DB_FILENAME, INDEXED_FIELDS, KEY_FIELDS, SqliteStore
+
+
+# Logical collection names used across the app, mapped to their files in db/
+COLLECTIONS = {
+    'candidates': 'candidates.json',
+    'jobs': 'jobs.json',
+    'users': 'userdata.json',
+    'notifications': 'notifications.json',
+}
+FILE_COLLECTIONS = {filename: name for name, filename in COLLECTIONS.items()}
+
+
+def index_key(value: Any) -> str:
+    """Normalised lookup key: ids compare as strings ('1' == 1), statuses case-insensitively"""
+    return '' if value is None else str(value).strip().lower()
+
+
+class JsonRepository:
+    def __init__(self, db_folder: Optional[str] = None):
+        self.db_folder = db_folder or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db')
+        self.lock = threading.RLock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._journals: Dict[str, MutationJournal] = {}
+        # key -> field -> index_key(value) -> sorted positions in the cached list
+        self._indexes: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+        self._listeners: List[Callable[[str, Any, Optional[Tuple[int, Any]]], None]] = []
+        self.data_version = 0
+        self.stats = {'hits': 0, 'loads': 0, 'writes': 0}
+        self.store = self._open_store()
+
+    def _open_store(self) -> Optional[SqliteStore]:
+        """Use the SQLite engine when requested, or when a migrated database is present"""
+        db_path = os.path.join(self.db_folder, DB_FILENAME)
+        backend = os.environ.get('AION_STORAGE', '').lower()
+        if backend == 'sqlite' or (backend != 'json' and os.path.exists(db_path)):
+            return SqliteStore(db_path)
+        return None
+
+    def _collection(self, key: str) -> Optional[str]:
+        """Logical collection name when the key is stored in SQLite, else None"""
+        if self.store is None:
+            return None
+        return FILE_COLLECTIONS.get(key)
+
+    def path(self, name: str) -> str:
+        """Resolve a collection name ('candidates') or file name ('job_1_cvs.json') to a path"""
+        return os.path.join(self.db_folder, COLLECTIONS.get(name, name))
+
+    def _key(self, name: str) -> str:
+        return COLLECTIONS.get(name, name)
+
+    def lock_path(self, name: str) -> str:
+        return os.path.join(self.db_folder, '.locks', self._key(name) + '.lock')
+
+    def _signature(self, path: str) -> Optional[Tuple[int, int, int]]:
+        """Cheap change detector: (mtime_ns, size, inode) of the file, or None if missing"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _journal(self, key: str) -> MutationJournal:
+        journal = self._journals.get(key)
+        if journal is None:
+            journal = self._journals[key] = MutationJournal(self.path(key))
+        return journal
+
+    def _file_signature(self, key: str):
+        """Base file and journal stats together, so journal appends also invalidate the cache"""
+        path = self.path(key)
+        return (self._signature(path), self._signature(path + '.journal'))
+
+    def _read(self, path: str, default: Callable[[], Any]) -> Any:
+        """Read and parse a JSON file, falling back to default() like the legacy loaders"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default()
+
+    def _remember(self, key: str, signature, data: Any, changed: Optional[Tuple[int, Any]] = None):
+        """
+        Store a parsed collection and bump its version.
+        changed=(position, old_record) says only that record was replaced, so indexes are
+        patched in place; otherwise they are dropped and rebuilt on next use.
+        """
+        self._cache[key] = {'signature': signature, 'data': data}
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self.data_version += 1
+        indexes = self._indexes.pop(key, None)
+        if changed is not None and indexes:
+            position, old = changed
+            new = data[position]
+            for field, index in indexes.items():
+                old_key, new_key = index_key(old.get(field)), index_key(new.get(field))
+                if old_key != new_key:
+                    index[old_key].remove(position)
+                    if not index[old_key]:
+                        del index[old_key]
+                    bisect.insort(index.setdefault(new_key, []), position)
+            self._indexes[key] = indexes
+        for listener in self._listeners:
+            listener(key, data, changed)
+
+    def subscribe(self, listener: Callable[[str, Any, Optional[Tuple[int, Any]]], None]):
+        """
+        Call listener(key, data, changed) whenever a collection is stored or reloaded.
+        changed is (position, old_record) for single-record updates, else None.
+        Listeners run under the repository lock and should only record what changed.
+        """
+        self._listeners.append(listener)
+
+    def _index(self, name: str, field: str) -> Tuple[List[Any], Dict[str, List[int]]]:
+        """Current records of a collection and its index on field, built on first use"""
+        with self.lock:
+            records = self.load(name)
+            key = self._key(name)
+            indexes = self._indexes.setdefault(key, {})
+            index = indexes.get(field)
+            if index is None:
+                index = indexes[field] = {}
+                for position, record in enumerate(records):
+                    if isinstance(record, dict):
+                        index.setdefault(index_key(record.get(field)), []).append(position)
+            return records, index
+
+    def find(self, name: str, field: str, value: Any) -> List[Any]:
+        """Records whose field matches value (see index_key), in collection order; O(matches)"""
+        records, index = self._index(name, field)
+        return [records[position] for position in index.get(index_key(value), ())]
+
+    def find_one(self, name: str, field: str, value: Any) -> Optional[Any]:
+        """First record whose field matches value, or None"""
+        records, index = self._index(name, field)
+        positions = index.get(index_key(value))
+        return records[positions[0]] if positions else None
+
+    def count(self, name: str, field: str, value: Any) -> int:
+        """Number of records whose field matches value; O(1)"""
+        _, index = self._index(name, field)
+        return len(index.get(index_key(value), ()))
+
+    def load(self, name: str, default: Callable[[], Any] = list) -> Any:
+        """
+        Return the parsed contents of a db file, re-reading it only when it changed on disk.
+
+        The returned object is shared with every other caller - treat it as read-only.
+        Use load_for_update() when the data is going to be modified and saved.
+        """
+        key = self._key(name)
+        collection = self._collection(key)
+        if collection:
+            signature = ('sqlite', self.store.version(collection))
+        else:
+            signature = self._file_signature(key)
+        with self.lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry['signature'] == signature:
+                self.stats['hits'] += 1
+                return entry['data']
+            if collection:
+                data = self.store.load_collection(collection)
+            elif signature[0] is not None:
+                data = self._read(self.path(name), default)
+                if isinstance(data, list):
+                    data, _ = self._journal(key).replay(data)
+            else:
+                data = default()
+            self.stats['loads'] += 1
+            self._remember(key, signature, data)
+            return data
+
+    def load_for_update(self, name: str, default: Callable[[], Any] = list) -> Any:
+        """Return a private deep copy of a collection that the caller may mutate and save()"""
+        return copy.deepcopy(self.load(name, default))
+
+    def save(self, name: str, data: Any, indent: int = 4):
+        """
+        Write a collection back to disk and refresh the cache.
+
+        Ownership of data passes to the repository; callers must not mutate it afterwards.
+        """
+        key = self._key(name)
+        collection = self._collection(key)
+        with file_lock(self.lock_path(name)), self.lock:
+            if collection:
+                self.store.save_collection(collection, data)
+                signature = ('sqlite', self.store.version(collection))
+            else:
+                # The new base file supersedes (and invalidates) any pending journal
+                atomic_write_json(self.path(name), data, indent=indent)
+                self._journal(key).discard()
+                signature = self._file_signature(key)
+            self.stats['writes'] += 1
+            self._remember(key, signature, data)
+
+    def update_record(self, name: str, key_field: str, key_value: Any, changes: Dict[str, Any]) -> bool:
+        """
+        Merge changes into the first record whose key_field matches key_value (see index_key).
+
+        With SQLite an update by the collection's key field is a single-row write, any
+        other update rewrites the collection in the store; with JSON the update is
+        appended to the journal and the file is only rewritten every COMPACT_AFTER updates.
+        Returns False when no record matched.
+        """
+        key = self._key(name)
+        collection = self._collection(key)
+        with file_lock(self.lock_path(name)), self.lock:
+            if collection and key_field == KEY_FIELDS.get(collection):
+                current = self.load(name)
+                before = self._cache[key]['signature'][1]
+                result = self.store.update_record(collection, key_value, changes)
+                if result is not None:
+                    position, record = result
+                    self.stats['writes'] += 1
+                    after = self.store.version(collection)
+                    if after == before + 1 and position < len(current):
+                        # No other writer in between: patch the cached list instead of reloading it
+                        records = list(current)
+                        records[position] = record
+                        self._remember(key, ('sqlite', after), records, changed=(position, current[position]))
+                    else:
+                        self._cache.pop(key, None)
+                        self._indexes.pop(key, None)
+                    return True
+            # Also reached when the store's exact key lookup missed ('2 ' for id 2)
+            records = list(self.load(name))
+            wanted = index_key(key_value)
+            for position, record in enumerate(records):
+                if isinstance(record, dict) and index_key(record.get(key_field)) == wanted:
+                    records[position] = {**record, **changes}
+                    break
+            else:
+                return False
+            if collection:
+                # The JSON journal is never read for SQLite collections
+                self.save(name, records)
+                return True
+            journal = self._journal(key)
+            # Journaled under the record's own key value: replay matches keys exactly
+            if not os.path.exists(self.path(name)) or journal.append(key_field, record.get(key_field), changes) >= COMPACT_AFTER:
+                self.save(name, records)
+            else:
+                self.stats['writes'] += 1
+                self._remember(key, self._file_signature(key), records, changed=(position, record))
+            return True
+
+    def compare_and_swap(self, name: str, key_field: str, key_value: Any,
+                         expected: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace a record only if it still equals expected (same _version and content).
+        The stored record gets _version + 1; raises ConflictError otherwise.
+        """
+        with file_lock(self.lock_path(name)):
+            current = self.find_one(name, key_field, key_value)
+            if current is None or current.get('_version', 0) != expected.get('_version', 0) or current != expected:
+                # The content check also catches writers that bypass mutate_record
+                raise ConflictError(f"{name} record {key_value!r} changed concurrently")
+            record['_version'] = expected.get('_version', 0) + 1
+            self.update_record(name, key_field, key_value, record)
+            return record
+
+    def mutate_record(self, name: str, key_field: str, key_value: Any,
+                      mutate: Callable[[Dict[str, Any]], Any], attempts: int = 5) -> Optional[Dict[str, Any]]:
+        """
+        Optimistic read-modify-write of one record.
+
+        mutate(record) edits a private copy without any lock held; the result is stored
+        with compare_and_swap() and mutate is re-run on fresh data after a conflict.
+        Returns the stored record, or None when no record matched.
+        """
+        for attempt in range(attempts):
+            snapshot = self.find_one(name, key_field, key_value)
+            if snapshot is None:
+                return None
+            record = copy.deepcopy(snapshot)
+            mutate(record)
+            try:
+                return self.compare_and_swap(name, key_field, key_value, snapshot, record)
+            except ConflictError:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+    def mutate_records(self, name: str, mutate: Callable[[List[Any]], Any]) -> Any:
+        """
+        Locked read-modify-write of a whole collection, for appends and multi-record
+        changes (e.g. allocating the next id). Returns whatever mutate returns.
+        """
+        with file_lock(self.lock_path(name)):
+            records = self.load_for_update(name)
+            result = mutate(records)
+            self.save(name, records)
+            return result
+
+    def compact(self, name: str):
+        """Fold the journal into the base file now"""
+        with file_lock(self.lock_path(name)), self.lock:
+            key = self._key(name)
+            if self._collection(key) is None and os.path.exists(self.path(name) + '.journal'):
+                self.save(name, list(self.load(name)))
+
+    def query(self, name: str, **filters) -> List[Any]:
+        """Records whose fields equal all filters; indexed in SQLite, a scan of the cache otherwise"""
+        collection = self._collection(self._key(name))
+        if collection and all(field in INDEXED_FIELDS for field in filters):
+            return self.store.query(collection, **filters)
+        return [
+            record for record in self.load(name)
+            if all(str(record.get(field)) == str(value) for field, value in filters.items())
+        ]
+
+    def version(self, name: Optional[str] = None) -> int:
+        """Version counter of one collection, or of all data when name is None"""
+        if name is None:
+            return self.data_version
+        return self._versions.get(self._key(name), 0)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop cached data so the next load() re-reads from disk"""
+        with self.lock:
+            if name is None:
+                self._cache.clear()
+                self._indexes.clear()
+            else:
+                self._cache.pop(self._key(name), None)
+                self._indexes.pop(self._key(name), None)
+
+
+# Global repository instance
+repository = JsonRepository()
@@ -0,0 +1,70 @@
+"""
+Versioned Response Cache for AION HR System
+Caches computed page contexts per (key, data version) and derives validators
+(ETag / Last-Modified) for them, so unchanged pages can be answered with 304.
+
+The ETag is a hash of the context itself rather than of the version counter:
+counters restart with the process and differ between workers, content does not.
+Last-Modified only moves when a key's content actually changes.
+"""
+
+import datetime
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+# Max cached contexts (one per role/username seen recently)
+MAX_ENTRIES = 256
+
+
+def content_etag(context: Dict[str, Any]) -> str:
+    """Strong validator for a context: stable across processes for equal content"""
+    payload = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class VersionedResponseCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: Hashable, version: Hashable,
+            build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Entry ({'context', 'etag', 'last_modified', 'version'}) for key at version, built on a miss"""
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['version'] == version:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry
+        # Built outside the lock: building reads the repository and may be slow
+        context = build()
+        etag = content_etag(context)
+        now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        with self.lock:
+            self.stats['misses'] += 1
+            previous = self._entries.get(key)
+            last_modified = previous['last_modified'] if previous and previous['etag'] == etag else now
+            entry = {'context': context, 'etag': etag, 'last_modified': last_modified, 'version': version}
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything when key is None"""
+        with self.lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Global dashboard context cache, keyed by (role, username)
+dashboard_cache = VersionedResponseCache()
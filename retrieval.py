@@ -0,0 +1,168 @@
+"""
+Chat Context Retrieval for AION HR System
+Picks the records relevant to a chat question instead of sending the whole database.
+
+The context for one question holds:
+- a summary: record counts per collection and candidates/jobs per status
+- the records that best match the question, ranked with BM25 over a context
+  index of every collection (search_index.py, matching any query term)
+- the latest activities mentioning the question's terms
+Records are cut down to the fields in PROJECTIONS (never interview transcripts,
+AI reports or passwords) and packed best match first until the estimated size
+reaches the token budget. 'omitted' tells the model how many matches did not fit,
+so it can call a tool instead.
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from repository import COLLECTIONS, repository
+from search_index import FIELD_WEIGHTS, SearchIndex, tokenize
+
+
+# Estimated tokens the DB context may take per chat turn
+CONTEXT_TOKENS = int(os.environ.get('AION_CHAT_CONTEXT_TOKENS', '3000'))
+# Best matches considered per collection
+MAX_MATCHES = int(os.environ.get('AION_CHAT_CONTEXT_MATCHES', '10'))
+# Recent activities considered (from the activity log)
+MAX_ACTIVITIES = 5
+# Longest text a single field may contribute
+MAX_FIELD_CHARS = 300
+
+# Fields of each collection the chat model may see
+PROJECTIONS = {
+    'candidates': ('id', 'name', 'position', 'job_id', 'status', 'email', 'phone', 'skills', 'experience',
+                   'education', 'certifications', 'match_score', 'interview_score', 'intervier',
+                   'applied_date', 'interview_date', 'hired_date', 'onboarding_status', 'probation_status',
+                   'performance_rating', 'final_salary', 'salary_currency'),
+    'jobs': ('job_id', 'job_title', 'department', 'job_location', 'job_type', 'seniority_level',
+             'salary_range', 'status', 'job_openings', 'posted_at', 'job_requirements'),
+    'users': ('username', 'email', 'role', 'department', 'phone'),
+    'notifications': ('id', 'type', 'message', 'candidate_name', 'position', 'status', 'for_role',
+                      'priority', 'timestamp'),
+    'activities': ('timestamp', 'activity_type', 'description', 'user'),
+}
+# Fields the context index matches questions against, and their weights
+CONTEXT_WEIGHTS = {
+    'candidates': dict(FIELD_WEIGHTS['candidates'], id=2.0, status=1.0, job_id=1.0),
+    'jobs': dict(FIELD_WEIGHTS['jobs'], job_id=2.0, status=1.0),
+    'users': {'username': 3.0, 'email': 1.0, 'role': 2.0, 'department': 1.5},
+    'notifications': {'candidate_name': 3.0, 'position': 2.0, 'message': 1.0, 'type': 1.0, 'status': 1.0},
+}
+# Question words that say nothing about which records are meant
+STOPWORDS = frozenset('''
+    about after all also and any are can could did does for from give has have how into list many me
+    much our show tell than that the their them then there these they this those was were what when
+    where which who whom why will with would you your
+    applicant applicants candidate candidates job jobs people person
+'''.split())
+
+
+def json_size(value: Any) -> int:
+    """Characters of a value as sent to the model"""
+    return len(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count of a JSON value (about four characters per token, as in ChatHistory)"""
+    return json_size(value) // 4
+
+
+def project(collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """The record's PROJECTIONS fields that are set, long text shortened"""
+    projected = {}
+    for field in PROJECTIONS[collection]:
+        value = record.get(field)
+        if value in (None, '', [], {}):
+            continue
+        if not isinstance(value, (int, float, bool)):
+            text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+            if len(text) > MAX_FIELD_CHARS:
+                value = text[:MAX_FIELD_CHARS] + '…'
+        projected[field] = value
+    return projected
+
+
+def query_terms(question: str) -> List[str]:
+    """Tokens of the question worth matching: no stopwords, no one/two letter words"""
+    return [token for token in tokenize(question)
+            if token not in STOPWORDS and (len(token) > 2 or token.isdigit())]
+
+
+class ChatContextRetriever:
+    def __init__(self, repo=repository, index: Optional[SearchIndex] = None, activity_log=None):
+        self.repo = repo
+        self.index = index or SearchIndex(repo, CONTEXT_WEIGHTS)
+        self.activity_log = activity_log  # None: the global activity_logger, imported on use
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'records': 0, 'omitted': 0}
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts the model needs for overview questions, whatever matched"""
+        summary: Dict[str, Any] = {name: len(self.repo.load(name)) for name in COLLECTIONS}
+        for name in ('candidates', 'jobs'):
+            statuses = Counter(str(r.get('status') or 'Unknown') for r in self.repo.load(name) if isinstance(r, dict))
+            summary[f'{name}_by_status'] = dict(statuses.most_common())
+        return summary
+
+    def matches(self, terms: List[str]) -> List[Tuple[float, str, Dict[str, Any]]]:
+        """(score, collection, record) of the best matches in every collection, best first"""
+        if not terms:
+            return []
+        query = ' '.join(terms)
+        found = []
+        for name in CONTEXT_WEIGHTS:
+            for record in self.index.search(name, query, per_page=MAX_MATCHES, match_all=False)['results']:
+                found.append((record.pop('_score'), name, record))
+        return sorted(found, key=lambda match: -match[0])
+
+    def activities(self, terms: List[str]) -> List[Dict[str, Any]]:
+        """Latest activities mentioning any of the terms (the latest few if none do)"""
+        try:
+            activity_log = self.activity_log
+            if activity_log is None:
+                from activity_logger import activity_logger as activity_log
+            recent = activity_log.get_recent_activities(limit=50, days=7)
+        except Exception as e:
+            print(f"⚠️ Could not fetch activities for chat context: {e}")
+            return []
+        wanted = set(terms)
+        matching = [a for a in recent if wanted & set(tokenize([a.get('description'), a.get('user')]))]
+        return (matching or recent)[:MAX_ACTIVITIES]
+
+    def context(self, question: str, budget: int = CONTEXT_TOKENS) -> Dict[str, Any]:
+        """DB context for one chat question, within budget (estimated tokens)"""
+        terms = query_terms(question)
+        context: Dict[str, Any] = {'summary': self.summary()}
+        # Counted in characters, as json.dumps lays the context out, keeping room for 'omitted'
+        used, limit = json_size(context), budget * 4 - len(', "omitted": 10000')
+        packed = omitted = 0
+
+        ranked = [(name, record) for _, name, record in self.matches(terms)]
+        ranked += [('activities', activity) for activity in self.activities(terms)]
+        for name, record in ranked:
+            projected = project(name, record)
+            cost = json_size(projected) + 2  # ", " before it
+            if name not in context:
+                cost += json_size(name) + 4  # ', "name": []' with the first record
+            if used + cost > limit:
+                omitted += 1
+                continue
+            context.setdefault(name, []).append(projected)
+            used += cost
+            packed += 1
+        if omitted:
+            context['omitted'] = omitted
+
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['records'] += packed
+            self.stats['omitted'] += omitted
+        return context
+
+
+# Global chat context retriever
+chat_context = ChatContextRetriever()
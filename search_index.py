@@ -0,0 +1,191 @@
+"""
+Full-Text Search Index for AION HR System
+Tokenized inverted index over jobs and candidates behind the /search route.
+
+Only the fields in FIELD_WEIGHTS are indexed (never transcripts or status
+history), and matches are ranked with BM25 over the weighted term counts. Every
+query term also matches as a prefix, which is what type-ahead needs. The index is
+kept current through the repository listener: a single record update re-indexes
+that record, while full saves and reloads rebuild the collection on next search.
+"""
+
+import bisect
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from repository import COLLECTIONS, repository
+
+
+# Indexed fields and their weight in a document's term counts
+FIELD_WEIGHTS = {
+    'jobs': {'job_title': 3.0, 'department': 1.5, 'job_location': 1.0,
+             'job_type': 0.5, 'job_requirements': 0.5},
+    'candidates': {'name': 3.0, 'position': 2.0, 'skills': 2.0, 'department': 1.5, 'email': 1.0},
+}
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Prefix-only matches rank below exact ones
+PREFIX_FACTOR = 0.7
+# Most vocabulary terms a single query term may expand to
+MAX_EXPANSIONS = 50
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(value: Any) -> List[str]:
+    """Lowercase alphanumeric tokens of a value; lists (e.g. skills) are tokenized item by item"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [token for item in value for token in tokenize(item)]
+    return TOKEN_PATTERN.findall(str(value).lower())
+
+
+class _CollectionIndex:
+    """Postings for one collection; documents are positions in the collection list"""
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+        self.records: List[Any] = []
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.vocabulary: List[str] = []  # sorted, for prefix ranges
+        self.doc_terms: Dict[int, Dict[str, float]] = {}
+        self.doc_length: Dict[int, float] = {}
+        self.total_length = 0.0
+
+    def add(self, position: int, record: Any):
+        if not isinstance(record, dict):
+            return
+        terms: Counter = Counter()
+        for field, weight in self.weights.items():
+            for token in tokenize(record.get(field)):
+                terms[token] += weight
+        self.doc_terms[position] = dict(terms)
+        self.doc_length[position] = sum(terms.values())
+        self.total_length += self.doc_length[position]
+        for term, tf in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            postings[position] = tf
+
+    def remove(self, position: int):
+        for term in self.doc_terms.pop(position, {}):
+            postings = self.postings[term]
+            postings.pop(position, None)
+            if not postings:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+        self.total_length -= self.doc_length.pop(position, 0.0)
+
+    def expand(self, token: str) -> List[str]:
+        """Vocabulary terms starting with token, the exact term first"""
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + '\uffff', lo=start)
+        return self.vocabulary[start:min(end, start + MAX_EXPANSIONS)]
+
+    def score(self, tokens: List[str], match_all: bool = True) -> Dict[int, float]:
+        """BM25 score of every document matching all tokens (each exactly or as a prefix),
+        or any of them with match_all=False"""
+        n = len(self.doc_terms)
+        if not n or not tokens:
+            return {}
+        avg_length = self.total_length / n or 1.0
+        scores: Dict[int, float] = {}
+        for i, token in enumerate(tokens):
+            token_scores: Dict[int, float] = {}
+            for term in self.expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                factor = 1.0 if term == token else PREFIX_FACTOR
+                for position, tf in postings.items():
+                    norm = K1 * (1 - B + B * self.doc_length[position] / avg_length)
+                    value = factor * idf * tf * (K1 + 1) / (tf + norm)
+                    if value > token_scores.get(position, 0.0):
+                        token_scores[position] = value
+            if i == 0:
+                scores = token_scores
+            elif match_all:
+                scores = {p: s + token_scores[p] for p, s in scores.items() if p in token_scores}
+            else:
+                for position, value in token_scores.items():
+                    scores[position] = scores.get(position, 0.0) + value
+            if not scores and match_all:
+                break
+        return scores
+
+
+class SearchIndex:
+    def __init__(self, repo=repository, weights: Dict[str, Dict[str, float]] = FIELD_WEIGHTS):
+        self.repo = repo
+        self.weights = weights
+        self.lock = threading.Lock()
+        self._indexes: Dict[str, _CollectionIndex] = {}
+        self._stale = set(weights)
+        self._generation = Counter()
+        self.stats = {'rebuilds': 0, 'updates': 0}
+        repo.subscribe(self._on_change)
+
+    def _on_change(self, key: str, data: List[Any], changed):
+        name = next((n for n in self.weights if COLLECTIONS[n] == key), None)
+        if name is None:
+            return
+        with self.lock:
+            self._generation[name] += 1
+            index = self._indexes.get(name)
+            if changed is None or name in self._stale or index is None:
+                self._stale.add(name)
+                return
+            position, _ = changed
+            index.records = data
+            index.remove(position)
+            index.add(position, data[position])
+            self.stats['updates'] += 1
+
+    def _refresh(self, name: str):
+        for attempt in range(3):
+            with self.lock:
+                generation = self._generation[name]
+            records = self.repo.load(name)  # revalidates, so other processes' writes arrive
+            with self.lock:
+                if name not in self._stale:
+                    return
+                if self._generation[name] != generation and attempt < 2:
+                    continue  # changed while loading; index the newer list
+                index = _CollectionIndex(self.weights[name])
+                index.records = records
+                for position, record in enumerate(records):
+                    index.add(position, record)
+                self._indexes[name] = index
+                self._stale.discard(name)
+                self.stats['rebuilds'] += 1
+                return
+
+    def search(self, name: str, query: str, page: int = 1, per_page: int = 20,
+               match_all: bool = True) -> Dict[str, Any]:
+        """One page of ranked matches: {'results', 'total', 'page', 'per_page', 'has_next'}"""
+        self._refresh(name)
+        page, per_page = max(1, page), max(1, per_page)
+        with self.lock:
+            index = self._indexes[name]
+            scores = index.score(tokenize(query), match_all)
+            ranked: List[Tuple[int, float]] = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            start = (page - 1) * per_page
+            results = [dict(index.records[position], _score=round(score, 4))
+                       for position, score in ranked[start:start + per_page]]
+        return {
+            'results': results,
+            'total': len(ranked),
+            'page': page,
+            'per_page': per_page,
+            'has_next': start + per_page < len(ranked),
+        }
+
+
+# Global search index instance
+search_index = SearchIndex()
@@ -0,0 +1,221 @@
+"""
+SQLite Storage Engine for AION HR System
+Stores candidates, jobs, users and notifications as one row per record (WAL mode),
+with indexed status / job_id / applied_date / for_role columns for filtered queries.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DB_FILENAME = 'aion.sqlite3'
+
+# Field used to address a single record in each collection
+KEY_FIELDS = {
+    'candidates': 'id',
+    'jobs': 'job_id',
+    'users': 'username',
+    'notifications': 'id',
+}
+
+# Record fields copied into indexed columns
+INDEXED_FIELDS = ('status', 'job_id', 'applied_date', 'for_role')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    collection   TEXT    NOT NULL,
+    position     INTEGER NOT NULL,
+    pk           TEXT,
+    status       TEXT,
+    job_id       TEXT,
+    applied_date TEXT,
+    for_role     TEXT,
+    data         TEXT    NOT NULL,
+    PRIMARY KEY (collection, position)
+);
+CREATE INDEX IF NOT EXISTS idx_records_pk ON records (collection, pk);
+CREATE INDEX IF NOT EXISTS idx_records_status ON records (collection, status);
+CREATE INDEX IF NOT EXISTS idx_records_job_id ON records (collection, job_id);
+CREATE INDEX IF NOT EXISTS idx_records_applied_date ON records (collection, applied_date);
+CREATE INDEX IF NOT EXISTS idx_records_for_role ON records (collection, for_role);
+CREATE TABLE IF NOT EXISTS collection_versions (
+    collection TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL
+);
+"""
+
+
+def _text(value: Any) -> Optional[str]:
+    """Normalise an indexed value to text so '3' and 3 match the same rows"""
+    if value is None:
+        return None
+    return str(value)
+
+
+class SqliteStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not shareable"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._connect().executescript(SCHEMA)
+
+    def _row_values(self, collection: str, position: int, record: Any) -> tuple:
+        fields = record if isinstance(record, dict) else {}
+        return (
+            collection,
+            position,
+            _text(fields.get(KEY_FIELDS.get(collection, 'id'))),
+            *(_text(fields.get(name)) for name in INDEXED_FIELDS),
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    def _bump_version(self, conn: sqlite3.Connection, collection: str):
+        conn.execute(
+            "INSERT INTO collection_versions (collection, version) VALUES (?, 1) "
+            "ON CONFLICT(collection) DO UPDATE SET version = version + 1",
+            (collection,)
+        )
+
+    def version(self, collection: str) -> int:
+        """Change counter of a collection; bumped by every committed write from any process"""
+        row = self._connect().execute(
+            "SELECT version FROM collection_versions WHERE collection = ?", (collection,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def load_collection(self, collection: str) -> List[Any]:
+        """Return all records of a collection in their original order"""
+        rows = self._connect().execute(
+            "SELECT data FROM records WHERE collection = ? ORDER BY position", (collection,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def save_collection(self, collection: str, records: List[Any]) -> int:
+        """
+        Store a full collection, writing only the rows whose content changed.
+        Returns the number of rows written or deleted.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            existing = dict(conn.execute(
+                "SELECT position, data FROM records WHERE collection = ?", (collection,)
+            ).fetchall())
+            changed = 0
+            for position, record in enumerate(records):
+                values = self._row_values(collection, position, record)
+                if existing.get(position) != values[-1]:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO records "
+                        "(collection, position, pk, status, job_id, applied_date, for_role, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        values
+                    )
+                    changed += 1
+            removed = conn.execute(
+                "DELETE FROM records WHERE collection = ? AND position >= ?", (collection, len(records))
+            ).rowcount
+            changed += removed
+            if changed:
+                self._bump_version(conn, collection)
+            conn.execute('COMMIT')
+            return changed
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def update_record(self, collection: str, key: Any, changes: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Merge changes into the first record whose key field equals key, as a single-row write.
+        Returns (position, updated record), or None when no record matched.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                "SELECT position, data FROM records WHERE collection = ? AND pk = ? ORDER BY position LIMIT 1",
+                (collection, _text(key))
+            ).fetchone()
+            if row is None:
+                conn.execute('ROLLBACK')
+                return None
+            position, data = row
+            record = json.loads(data)
+            record.update(changes)
+            values = self._row_values(collection, position, record)
+            conn.execute(
+                "UPDATE records SET pk = ?, status = ?, job_id = ?, applied_date = ?, for_role = ?, data = ? "
+                "WHERE collection = ? AND position = ?",
+                values[2:] + (collection, position)
+            )
+            self._bump_version(conn, collection)
+            conn.execute('COMMIT')
+            return position, record
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def query(self, collection: str, **filters) -> List[Any]:
+        """Indexed lookup, e.g. query('candidates', status='Hired', job_id='3')"""
+        clauses = ['collection = ?']
+        params: List[Any] = [collection]
+        for name, value in filters.items():
+            if name not in INDEXED_FIELDS:
+                raise ValueError(f"'{name}' is not an indexed field")
+            clauses.append(f'{name} = ?')
+            params.append(_text(value))
+        rows = self._connect().execute(
+            f"SELECT data FROM records WHERE {' AND '.join(clauses)} ORDER BY position", params
+        )
+        return [json.loads(data) for (data,) in rows]
+
+
+def migrate_json_to_sqlite(db_folder: Optional[str] = None, overwrite: bool = False) -> Dict[str, int]:
+    """
+    One-shot migration of the JSON collections into db/aion.sqlite3.
+    Once the database file exists the repository uses it automatically.
+    """
+    from repository import COLLECTIONS
+
+    db_folder = db_folder or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db')
+    db_path = os.path.join(db_folder, DB_FILENAME)
+    if os.path.exists(db_path) and not overwrite:
+        print(f"⚠️ {db_path} already exists - pass overwrite=True to migrate again")
+        return {}
+    store = SqliteStore(db_path)
+    counts = {}
+    for collection, filename in COLLECTIONS.items():
+        records = []
+        file_path = os.path.join(db_folder, filename)
+        if os.path.exists(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                try:
+                    records = json.load(f)
+                except json.JSONDecodeError:
+                    records = []
+        store.save_collection(collection, records)
+        counts[collection] = len(records)
+    print(f"✅ Migrated {counts} into {db_path}")
+    return counts
+
+
+if __name__ == "__main__":
+    # Run migration if called directly
+    import sys
+    migrate_json_to_sqlite(overwrite='--overwrite' in sys.argv)
@@ -0,0 +1,73 @@
+// Analytics Charts JavaScript
+// Draws analytics charts in the browser from /api/analytics/<metric>/series with Chart.js
+// (load https://cdn.jsdelivr.net/npm/chart.js first, as dashboard.html does).
+// The endpoint answers 304 while the data is unchanged, so redrawing is cheap.
+
+const ANALYTICS_COLORS = ['#1976d2', '#43a047', '#ff9800', '#e53935', '#8e24aa', '#00897b'];
+
+async function fetchAnalyticsSeries(metric) {
+    const response = await fetch(`/api/analytics/${encodeURIComponent(metric)}/series`);
+    if (!response.ok) {
+        throw new Error(`Failed to fetch ${metric} series, status: ${response.status}`);
+    }
+    return response.json();
+}
+
+function analyticsDataset(dataset, index, kind, labelCount) {
+    const color = ANALYTICS_COLORS[index % ANALYTICS_COLORS.length];
+    if (kind === 'pie') {
+        const colors = Array.from({ length: labelCount }, (_, i) => ANALYTICS_COLORS[i % ANALYTICS_COLORS.length]);
+        return { label: dataset.label, data: dataset.data, backgroundColor: colors };
+    }
+    return {
+        label: dataset.label,
+        data: dataset.data,
+        borderColor: color,
+        backgroundColor: kind === 'bar' ? color + 'b3' : color + '1a',
+        fill: false,
+        tension: 0.3
+    };
+}
+
+// Renders every panel of a metric's chart into container; returns the Chart instances
+async function renderAnalyticsChart(container, metric) {
+    if (typeof container === 'string') {
+        container = document.getElementById(container);
+    }
+    if (!container) {
+        console.error('Analytics chart container not found');
+        return [];
+    }
+    container.innerHTML = '';
+    let series;
+    try {
+        series = await fetchAnalyticsSeries(metric);
+    } catch (error) {
+        console.error('Error fetching analytics series:', error);
+        container.textContent = 'Chart data not available';
+        return [];
+    }
+    if (!series.chart) {
+        container.textContent = (series.insights || []).join(' ') || 'No data available';
+        return [];
+    }
+    return series.chart.panels.map(panel => {
+        const canvas = document.createElement('canvas');
+        container.appendChild(canvas);
+        return new Chart(canvas.getContext('2d'), {
+            type: panel.kind,
+            data: {
+                labels: panel.labels,
+                datasets: panel.datasets.map((dataset, i) => analyticsDataset(dataset, i, panel.kind, panel.labels.length))
+            },
+            options: {
+                responsive: true,
+                plugins: {
+                    legend: { display: panel.datasets.length > 1 || panel.kind === 'pie' },
+                    title: { display: true, text: panel.title }
+                },
+                scales: panel.kind === 'pie' ? {} : { y: { beginAtZero: true } }
+            }
+        });
+    });
+}
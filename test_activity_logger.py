@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the segmented activity log and the batched event log
+Checks legacy migration, day segments, indexes, the query helpers and event batching
+"""
+
+import sys
+import os
+import json
+import datetime
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from activity_logger import ActivityLogger
+from event_log import EventLog
+
+
+def test_legacy_migration_and_queries():
+    """The old activity_log.json is split into day segments and queried newest first"""
+    print("🔍 Testing activity log migration...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        old_day = (datetime.datetime.now() - datetime.timedelta(days=30)).strftime('%Y-%m-%d')
+        legacy = [
+            {'id': f'act_{n}', 'timestamp': f'{old_day} 10:00:0{n}', 'date': old_day,
+             'activity_type': 'chat_interaction', 'user': 'asha', 'description': f'old {n}'}
+            for n in range(3)
+        ]
+        with open(os.path.join(db_folder, 'activity_log.json'), 'w') as f:
+            json.dump(legacy, f)
+
+        logger = ActivityLogger(db_folder)
+        logger.log_activity('job_posted', 'Job posted', user='ben')
+        logger.log_activity('analytics_view', 'Viewed analytics', user='asha')
+
+        segments = sorted(os.listdir(os.path.join(db_folder, 'activity_log')))
+        assert f'{old_day}.jsonl' in segments and len([s for s in segments if s.endswith('.jsonl')]) == 2
+
+        assert [a['description'] for a in logger.get_todays_activities()] == ['Viewed analytics', 'Job posted']
+        assert len(logger.get_recent_activities(limit=50, days=7)) == 2
+        assert [a['description'] for a in logger.get_activities_by_type('chat_interaction', 2)] == ['old 2', 'old 1']
+        assert [a['activity_type'] for a in logger.get_activities_by_user('asha')] == ['analytics_view'] + ['chat_interaction'] * 3
+
+        # Another process sees appends it did not write, and indexes survive a flush
+        other = ActivityLogger(db_folder)
+        logger.log_activity('job_posted', 'Second job', user='ben')
+        logger.flush_indexes()
+        assert other.get_todays_activities()[0]['description'] == 'Second job'
+        today = datetime.datetime.now().strftime('%Y-%m-%d')
+        with open(os.path.join(db_folder, 'activity_log', f'{today}.index.json')) as f:
+            index = json.load(f)
+        assert index['count'] == 3 and index['types']['job_posted'] == 2
+    print("✅ Activity log segments working")
+
+
+def test_event_log_batches():
+    """Bursts of events from many threads become a few appends and nothing is lost"""
+    print("🔍 Testing batched event log...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        with open(os.path.join(db_folder, 'log.json'), 'w') as f:
+            json.dump([{'type': 'legacy', 'timestamp': '2025-01-01 09:00:00'}], f)
+        event_log = EventLog(db_folder, queue_size=10, flush_interval=0.05)
+
+        def burst(n):
+            for i in range(25):
+                event_log.submit({'type': 'job', 'description': f'{n}-{i}'})
+        threads = [threading.Thread(target=burst, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        events = event_log.events()
+        assert events[0]['type'] == 'legacy' and len(events) == 101
+        assert event_log.stats['events'] == 100 and event_log.stats['batches'] < 100
+
+        # Events still queued at shutdown are written out
+        event_log.submit({'type': 'late'})
+        event_log.close()
+        with open(os.path.join(db_folder, 'log.jsonl')) as f:
+            assert json.loads(f.read().splitlines()[-1])['type'] == 'late'
+    print("✅ Batched event log working")
+
+
+if __name__ == "__main__":
+    test_legacy_migration_and_queries()
+    test_event_log_batches()
@@ -0,0 +1,773 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared JSON repository
+Checks cache hits, change detection and private copies for updates
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import journal
+import datetime
+import threading
+import time
+from locking import ConflictError
+from repository import JsonRepository
+from job_status import JobStatusView
+from dashboard_metrics import DashboardMetrics
+from search_index import SearchIndex
+from event_index import EventIndex
+from models import RecordModels, Status, latest_decisions
+
+
+def test_repository_cache():
+    """Repeated loads reuse the parsed data until the file changes"""
+    print("🔍 Testing shared repository cache...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        with open(os.path.join(db_folder, 'candidates.json'), 'w') as f:
+            json.dump([{'id': 1, 'status': 'New'}], f)
+
+        first = repo.load('candidates')
+        second = repo.load('candidates')
+        assert first is second
+        assert repo.stats['loads'] == 1 and repo.stats['hits'] == 1
+
+        # An external write is picked up on the next load
+        with open(os.path.join(db_folder, 'candidates.json'), 'w') as f:
+            json.dump([{'id': 1, 'status': 'Hired'}, {'id': 2, 'status': 'New'}], f)
+        os.utime(os.path.join(db_folder, 'candidates.json'), ns=(1, 1))
+        reloaded = repo.load('candidates')
+        assert len(reloaded) == 2 and reloaded[0]['status'] == 'Hired'
+    print("✅ Cache and change detection working")
+
+
+def test_repository_update_and_defaults():
+    """load_for_update returns a private copy and save refreshes the cache"""
+    print("🔍 Testing repository updates...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        # Missing and empty files fall back to the default
+        assert repo.load('jobs') == []
+        open(os.path.join(db_folder, 'log.json'), 'w').close()
+        assert repo.load('log.json') == []
+
+        repo.save('jobs', [{'job_id': '1', 'status': 'Open'}])
+        jobs = repo.load_for_update('jobs')
+        jobs[0]['status'] = 'Closed'
+        assert repo.load('jobs')[0]['status'] == 'Open'
+
+        version = repo.version('jobs')
+        repo.save('jobs', jobs)
+        assert repo.version('jobs') > version
+        assert repo.load('jobs')[0]['status'] == 'Closed'
+        with open(os.path.join(db_folder, 'jobs.json')) as f:
+            assert json.load(f)[0]['status'] == 'Closed'
+    print("✅ Updates and defaults working")
+
+
+def test_journaled_updates():
+    """Record updates go to the journal, survive a reload and are compacted into the file"""
+    print("🔍 Testing journaled record updates...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('candidates', [{'id': 1, 'status': 'New'}, {'id': 2, 'status': 'New'}])
+        base_path = os.path.join(db_folder, 'candidates.json')
+        with open(base_path) as f:
+            base_before = f.read()
+
+        assert repo.update_record('candidates', 'id', 2, {'status': 'Hired'})
+        assert not repo.update_record('candidates', 'id', 7, {'status': 'Hired'})
+        with open(base_path) as f:
+            assert f.read() == base_before
+        assert os.path.exists(base_path + '.journal')
+
+        # A fresh repository (another process) replays the journal, ignoring a torn tail
+        with open(base_path + '.journal', 'a') as f:
+            f.write('{"key_field": "id", "ke')
+        other = JsonRepository(db_folder)
+        assert [c['status'] for c in other.load('candidates')] == ['New', 'Hired']
+        assert other.update_record('candidates', 'id', 1, {'status': 'Shortlisted'})
+        assert [c['status'] for c in repo.load('candidates')] == ['Shortlisted', 'Hired']
+
+        # Compaction folds the journal into the base file
+        repo.compact('candidates')
+        assert not os.path.exists(base_path + '.journal')
+        with open(base_path) as f:
+            assert [c['status'] for c in json.load(f)] == ['Shortlisted', 'Hired']
+
+        # Updates past the threshold trigger compaction on their own
+        for n in range(journal.COMPACT_AFTER):
+            repo.update_record('candidates', 'id', 1, {'score': n})
+        assert not os.path.exists(base_path + '.journal')
+        assert JsonRepository(db_folder).load('candidates')[0]['score'] == journal.COMPACT_AFTER - 1
+    print("✅ Journaled updates working")
+
+
+def test_compare_and_swap():
+    """Stale writes are rejected and concurrent mutations are retried, not lost"""
+    print("🔍 Testing compare-and-swap updates...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('candidates', [{'id': 1, 'status': 'New', 'notes': []}])
+
+        snapshot = dict(repo.load('candidates')[0])
+        repo.compare_and_swap('candidates', 'id', 1, snapshot, {**snapshot, 'status': 'Shortlisted'})
+        assert repo.load('candidates')[0]['_version'] == 1
+        try:
+            repo.compare_and_swap('candidates', 'id', 1, snapshot, {**snapshot, 'status': 'Rejected'})
+            assert False, "stale write was accepted"
+        except ConflictError:
+            pass
+
+        # Another process (separate repository) mutating in parallel
+        other = JsonRepository(db_folder)
+        def add_notes(repo, prefix):
+            for n in range(10):
+                repo.mutate_record('candidates', 'id', 1, lambda c: c['notes'].append(f"{prefix}{n}"), attempts=50)
+        threads = [threading.Thread(target=add_notes, args=(r, p)) for r, p in ((repo, 'a'), (other, 'b'))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        candidate = JsonRepository(db_folder).load('candidates')[0]
+        assert len(candidate['notes']) == 20 and candidate['_version'] == 21
+        assert repo.mutate_record('candidates', 'id', 9, lambda c: None) is None
+
+        # Appends through mutate_records never reuse an id
+        repo.mutate_records('candidates', lambda cs: cs.append({'id': len(cs) + 1}))
+        assert [c['id'] for c in other.load('candidates')] == [1, 2]
+    print("✅ Compare-and-swap working")
+
+
+def test_secondary_indexes():
+    """find/count use indexes that follow single-record updates and full saves"""
+    print("🔍 Testing secondary indexes...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('candidates', [
+            {'id': 1, 'job_id': '1', 'status': 'New'},
+            {'id': 2, 'job_id': 1, 'status': 'Hired'},
+            {'id': 3, 'job_id': '2', 'status': 'hired'},
+        ])
+        assert [c['id'] for c in repo.find('candidates', 'job_id', 1)] == [1, 2]
+        assert repo.count('candidates', 'status', 'Hired') == 2
+        assert repo.find_one('candidates', 'id', '3')['job_id'] == '2'
+
+        # Index is patched in place, keeping collection order
+        repo.update_record('candidates', 'id', 1, {'status': 'Hired'})
+        assert 'status' in repo._indexes['candidates.json']
+        assert [c['id'] for c in repo.find('candidates', 'status', 'hired')] == [1, 2, 3]
+        assert repo.find('candidates', 'status', 'new') == []
+        assert repo.find_one('candidates', 'id', 1)['status'] == 'Hired'
+
+        repo.save('candidates', repo.load_for_update('candidates') + [{'id': 4, 'job_id': '2', 'status': 'New'}])
+        assert [c['id'] for c in repo.find('candidates', 'job_id', '2')] == [3, 4]
+    print("✅ Secondary indexes working")
+
+
+def test_job_status_view():
+    """Job statuses follow candidate updates and lead-time expiry without writing jobs.json"""
+    print("🔍 Testing materialized job status view...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        now = datetime.datetime.now()
+        repo.save('jobs', [
+            {'job_id': '1', 'job_openings': '1', 'job_lead_time': '30', 'posted_at': now.strftime('%Y-%m-%d %H:%M:%S')},
+            {'job_id': '2', 'job_openings': '2', 'job_lead_time': '10',
+             'posted_at': (now - datetime.timedelta(days=20)).strftime('%Y-%m-%d %H:%M:%S')},
+        ])
+        repo.save('candidates', [{'id': 1, 'job_id': '1', 'status': 'New'}, {'id': 2, 'job_id': '2', 'status': 'New'}])
+        view = JobStatusView(repo)
+        assert view.get('1')['status'] == 'Open' and view.get(2)['status'] == 'Closed'
+        assert view.open_vacancies() == 1 and view.closed_vacancies() == 2
+        jobs_version = repo.version('jobs')
+
+        # Hiring the only opening closes job 1 by recomputing just that job
+        rebuilds = view.stats['rebuilds']
+        repo.update_record('candidates', 'id', 1, {'status': 'Hired'})
+        assert view.get('1')['status'] == 'Closed' and view.get('1')['vacancies_remaining'] == 0
+        assert view.stats['rebuilds'] == rebuilds
+        assert repo.version('jobs') == jobs_version
+
+        # Reaching the lead-time boundary expires an open job with no data change
+        almost_due = datetime.datetime.now() - datetime.timedelta(days=30) + datetime.timedelta(seconds=2)
+        repo.update_record('candidates', 'id', 1, {'status': 'New'})
+        repo.update_record('jobs', 'job_id', '1', {'posted_at': almost_due.strftime('%Y-%m-%d %H:%M:%S')})
+        assert view.get('1')['status'] == 'Open'
+        time.sleep(2.1)
+        assert view.get('1')['status'] == 'Closed'
+    print("✅ Job status view working")
+
+
+def test_dashboard_rollups():
+    """Incrementally maintained rollups match a full rebuild"""
+    print("🔍 Testing dashboard rollups...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        today = datetime.date.today()
+        day = lambda n: (today - datetime.timedelta(days=n)).strftime('%Y-%m-%d')
+        repo.save('jobs', [
+            {'job_id': '1', 'job_openings': '3', 'job_lead_time': '30', 'posted_at': f"{day(1)} 09:00:00"},
+            {'job_id': '2', 'job_openings': '1', 'job_lead_time': '5', 'posted_at': f"{day(20)} 09:00:00"},
+        ])
+        repo.save('candidates', [
+            {'id': 1, 'job_id': '1', 'status': 'New', 'applied_date': day(0)},
+            {'id': 2, 'job_id': '2', 'status': 'Shortlisted', 'applied_date': day(2)},
+            {'id': 3, 'job_id': '1', 'status': 'Hired', 'applied_date': day(3), 'date_of_joining': day(1)},
+        ])
+        metrics = DashboardMetrics(repo, JobStatusView(repo))
+        series = metrics.series()
+        assert series['active_applicants']['day'][-1] == 1 and series['pending_closed_jobs']['day'][-3] == 1
+        assert series['overall_vacancies']['day'][-2] == 3 and sum(series['active_vacancies']['day']) == 3
+        assert metrics.totals()['radar_data'] == [3, 1, 0, 0, 1]
+
+        repo.update_record('candidates', 'id', 1, {'status': 'Hired', 'date_of_joining': day(0)})
+        repo.update_record('candidates', 'id', 2, {'status': 'Rejected'})
+        assert metrics.stats['rebuilds'] == 1 and metrics.stats['updates'] == 2
+        rebuilt = DashboardMetrics(repo, JobStatusView(repo))
+        assert metrics.series() == rebuilt.series()
+        assert metrics.totals() == rebuilt.totals() and metrics.totals()['total_hired'] == 2
+    print("✅ Dashboard rollups working")
+
+
+def test_versioned_response_cache():
+    """Contexts are rebuilt only when the version moves; validators follow the content"""
+    print("🔍 Testing versioned response cache...")
+    from response_cache import VersionedResponseCache
+
+    cache = VersionedResponseCache(max_entries=2)
+    builds = []
+    def build():
+        builds.append(1)
+        return {'total': 5}
+
+    first = cache.get(('HR', 'ann'), 1, build)
+    assert cache.get(('HR', 'ann'), 1, build) is first and len(builds) == 1
+    # New version, same content: rebuilt, but the validators stay put
+    second = cache.get(('HR', 'ann'), 2, build)
+    assert len(builds) == 2 and second['etag'] == first['etag']
+    assert second['last_modified'] == first['last_modified']
+    changed = cache.get(('HR', 'ann'), 3, lambda: {'total': 6})
+    assert changed['etag'] != first['etag']
+    cache.get(('CEO', 'bob'), 3, build)
+    cache.get(('', ''), 3, build)
+    assert ('HR', 'ann') not in cache._entries  # least recently used goes first
+    print("✅ Versioned response cache working")
+
+
+def test_search_index():
+    """Ranked prefix search, kept current by single-record updates"""
+    print("🔍 Testing search index...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('candidates', [
+            {'id': 1, 'name': 'Kevin Flores', 'position': 'Piping Designer', 'skills': ['AutoCAD']},
+            {'id': 2, 'name': 'Rekha Piper', 'position': 'Document Controller', 'skills': []},
+            {'id': 3, 'name': 'Ann Lee', 'position': 'SP3D Admin', 'skills': ['Piping Design'],
+             'interview_transcript': 'talked about piping for an hour'},
+        ])
+        index = SearchIndex(repo)
+        result = index.search('candidates', 'pip')
+        assert [c['id'] for c in result['results']] == [2, 1, 3]  # name outweighs position and skills
+        assert index.search('candidates', 'hour')['total'] == 0  # transcripts are not indexed
+        assert [c['id'] for c in index.search('candidates', 'piping des')['results']] == [1, 3]
+        page = index.search('candidates', 'pip', page=2, per_page=2)
+        assert [c['id'] for c in page['results']] == [3] and page['total'] == 3 and not page['has_next']
+
+        repo.update_record('candidates', 'id', 2, {'name': 'Rekha Huang'})
+        assert [c['id'] for c in index.search('candidates', 'pip')['results']] == [1, 3]
+        assert index.search('candidates', 'huang')['results'][0]['id'] == 2
+        assert index.stats['rebuilds'] == 1 and index.stats['updates'] == 1
+    print("✅ Search index working")
+
+
+def test_event_index():
+    """Upcoming feed, range queries and single-record maintenance"""
+    print("🔍 Testing event index...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        now = datetime.datetime(2030, 1, 10, 12, 0)
+        repo.save('candidates', [
+            {'id': 1, 'name': 'A', 'interview_date': '2030-01-12', 'interview_time': '10:00', 'intervier': 'Sam'},
+            {'id': 2, 'name': 'B', 'status': 'Selected', 'applied_date': '2029-12-01'},
+            {'id': 3, 'name': 'C', 'interview_date': '2030-01-05', 'interviewer': 'Sam'},
+        ])
+        repo.save('jobs', [{'job_id': '7', 'job_title': 'Designer', 'posted_at': '2030-01-11 09:00:00'}])
+        repo.save('notifications', [{'title': 'Review', 'date': '2030-01-20'}])
+        index = EventIndex(repo)
+        feed = index.upcoming(now=now)
+        assert [e['type'] for e in feed] == ['Approval', 'Job', 'Interview', 'Notification']
+        assert [e['candidate_id'] for e in index.next(5, interviewer='sam', now=now)] == [1]
+        window = index.between(datetime.datetime(2030, 1, 1), datetime.datetime(2030, 1, 12), event_type='Interview')
+        assert [e['candidate_id'] for e in window] == [3]
+
+        repo.update_record('candidates', 'id', 3, {'interview_date': '2030-01-15'})
+        assert [e['candidate_id'] for e in index.next(5, event_type='Interview', now=now)] == [1, 3]
+        repo.update_record('candidates', 'id', 2, {'status': 'Hired'})
+        assert [e['type'] for e in index.upcoming(limit=2, now=now)] == ['Job', 'Interview']
+        assert index.stats['rebuilds'] == 3 and index.stats['updates'] == 2
+    print("✅ Event index working")
+
+
+def test_record_models():
+    """Typed records parse dates once, intern statuses and follow single-record updates"""
+    print("🔍 Testing typed record models...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('candidates', [
+            {'id': 1, 'status': ' hired ', 'applied_date': '2025-03-01', 'hired_date': '2025-04-15',
+             'offered_salary': '12,000', 'interview_transcript': 'long text'},
+            {'id': 2, 'status': 'Something Else', 'applied_date': 'not a date'},
+        ])
+        repo.save('jobs', [{'job_id': 7, 'status': 'Open', 'posted_at': '2025-03-01 09:30:00', 'job_openings': '2'}])
+        models = RecordModels(repo)
+        first, second = models.candidates()
+        assert first.status is Status.HIRED and first.status == 'Hired' and second.status is Status.OTHER
+        assert (first.hired - first.applied).days == 45 and second.applied is None
+        assert first.salary == 12000.0 and first.transcript == 'long text'
+        assert not hasattr(first, '__dict__')  # slots
+        job = models.jobs()[0]
+        assert job.job_id == '7' and job.status == 'open' and job.openings == 2
+        assert job.posted_at == datetime.datetime(2025, 3, 1, 9, 30)
+
+        before = models.candidates()
+        repo.update_record('candidates', 'id', 2, {'status': 'Shortlisted'})
+        assert models.candidates()[1].status is Status.SHORTLISTED
+        assert before[1].status is Status.OTHER  # lists already handed out are not changed
+        assert models.stats['updates'] == 1
+
+        repo.save('notifications', [
+            {'id': 1, 'candidate_id': 2, 'for_role': 'Discipline Manager', 'approved_by': 'dm',
+             'status': 'On Hold', 'timestamp': '2025-03-02T08:00:00'},
+            {'id': 2, 'candidate_id': '2', 'for_role': 'Discipline Manager', 'approved_by': 'dm',
+             'status': 'Approved', 'timestamp': '2025-03-02 09:00:00'},
+            {'id': 3, 'candidate_id': 2, 'for_role': 'Discipline Manager', 'status': 'Pending'},
+        ])
+        notifications = models.notifications()
+        assert notifications[1].timestamp == datetime.datetime(2025, 3, 2, 9) and notifications[2].timestamp is None
+        decisions = latest_decisions(notifications)
+        assert list(decisions) == [('2', 'Discipline Manager', 'dm')]  # ids match as strings; undecided skipped
+        assert decisions['2', 'Discipline Manager', 'dm'].status == 'Approved'
+    print("✅ Typed record models working")
+
+
+def test_analytics_snapshot():
+    """Column arrays match the records and are rebuilt only on data changes"""
+    print("🔍 Testing analytics snapshot...")
+    from analytics_snapshot import AnalyticsSnapshots, MISSING_DAY, count_by_month, month_label
+
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('jobs', [{'job_id': '1', 'department': 'Piping'}, {'job_id': '2', 'department': 'Civil'}])
+        repo.save('candidates', [
+            {'id': 1, 'job_id': '1', 'status': 'Hired', 'applied_date': '2025-03-01', 'hired_date': '2025-03-21'},
+            {'id': 2, 'job_id': '1', 'status': 'New', 'applied_date': '2025-03-15'},
+            {'id': 3, 'job_id': '2', 'status': 'Hired', 'applied_date': '2025-04-02', 'hired_date': '2025-04-12'},
+        ])
+        snapshots = AnalyticsSnapshots(repo, RecordModels(repo))
+        snap = snapshots.get()
+        hired = snap.has_status(Status.HIRED)
+        assert hired.tolist() == [True, False, True]
+        ids, totals, (hires,) = count_by_month(snap.applied, [hired])
+        assert [month_label(m) for m in ids] == ['2025-03', '2025-04']
+        assert totals.tolist() == [2, 1] and hires.tolist() == [1, 1]
+        assert [snap.department_labels[d] for d in snap.department] == ['Piping', 'Piping', 'Civil']
+        assert snap.hired[1] == MISSING_DAY and (snap.hired - snap.applied)[hired].tolist() == [20, 10]
+        assert snapshots.get() is snap and snapshots.stats['builds'] == 1
+
+        repo.update_record('candidates', 'id', 2, {'status': 'Hired', 'hired_date': '2025-03-30'})
+        assert int(snapshots.get().has_status(Status.HIRED).sum()) == 3 and snapshots.stats['builds'] == 2
+    print("✅ Analytics snapshot working")
+
+
+def test_chart_cache():
+    """Charts are rendered once per (type, series, size, dpi) and evicted least recently used"""
+    print("🔍 Testing chart cache...")
+    import time
+    from chart_cache import ChartCache
+
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ChartCache(folder)
+        draws = []
+
+        def draw(fig):
+            draws.append(1)
+            fig.subplots().plot([1, 2, 3], [2, 1, 3])
+
+        first = cache.render('trend', {'y': [2, 1, 3]}, draw, (4, 3), 'thumbnail')
+        assert os.path.exists(first) and os.path.basename(first).startswith('trend-')
+        assert cache.render('trend', {'y': [2, 1, 3]}, draw, (4, 3), 'thumbnail') == first and len(draws) == 1
+        screen = cache.render('trend', {'y': [2, 1, 3]}, draw, (4, 3), 'screen')
+        other = cache.render('trend', {'y': [3, 1, 2]}, draw, (4, 3), 'thumbnail')
+        assert len({first, screen, other}) == 3 and len(draws) == 3
+        assert cache.stats == {'hits': 1, 'misses': 3, 'evictions': 0}
+        try:
+            cache.render('trend', {}, draw, (4, 3), 'poster')
+            assert False, "unknown preset accepted"
+        except ValueError:
+            pass
+
+        # Only room for the newest chart: the least recently used ones go first
+        old = time.time() - 60
+        for i, path in enumerate([screen, first, other]):
+            os.utime(path, (old + i, old + i))
+        cache.max_bytes = os.path.getsize(other) + os.path.getsize(first)
+        newest = cache.render('bars', {'y': [1]}, draw, (4, 3), 'thumbnail')
+        assert not os.path.exists(screen) and os.path.exists(newest)
+        assert cache.stats['evictions'] >= 1
+    print("✅ Chart cache working")
+
+
+def test_chart_service():
+    """Chart specs render in worker processes (or inline), once per spec"""
+    print("🔍 Testing chart service...")
+    from chart_cache import ChartCache
+    from chart_service import ChartService
+
+    series = {'labels': ['Hired', 'Rejected'], 'values': [3, 5]}
+    with tempfile.TemporaryDirectory() as folder:
+        inline = ChartService(ChartCache(folder), max_workers=0)
+        path = inline.render('pie_chart', series, (4, 4), 'thumbnail')
+        assert path and os.path.exists(path)
+        assert inline.render('pie_chart', series, (4, 4), 'thumbnail') == path
+        assert inline.stats['inline'] == 1 and inline.stats['hits'] == 1
+        try:
+            inline.submit('no_such_chart', {})
+            assert False, "unknown chart type accepted"
+        except ValueError:
+            pass
+
+        pooled = ChartService(ChartCache(folder), max_workers=1, max_pending=4, timeout=60)
+        try:
+            other = {'months': ['2025-01', '2025-02'], 'counts': [1, 4]}
+            futures = [pooled.submit('hiring_trend', other, (4, 3), 'thumbnail') for _ in range(3)]
+            paths = {f.result(60) for f in futures}
+            assert len(paths) == 1 and os.path.exists(paths.pop())
+            assert pooled.stats['jobs'] == 1 and pooled.stats['joined'] + pooled.stats['hits'] == 2
+            # Rendered by the worker into the shared folder, so this is a hit
+            assert pooled.render('pie_chart', series, (4, 4), 'thumbnail') == path
+        finally:
+            pooled.shutdown()
+    print("✅ Chart service working")
+
+
+def test_chart_panels():
+    """Every chart type has Chart.js panels built from the same series as its PNG"""
+    print("🔍 Testing chart panels...")
+    from charts import DRAWERS, PANELS, chart_panels
+
+    assert set(PANELS) == set(DRAWERS)
+    series = {'departments': ['Civil', 'Piping'], 'interview_rates': [50.0, 25.0], 'avg_days': [7, 12]}
+    panels = chart_panels('department_interview_efficiency', series)
+    assert [p['kind'] for p in panels] == ['bar', 'bar']
+    assert panels[0]['labels'] == ['Civil', 'Piping']
+    assert panels[1]['datasets'] == [{'label': 'Days', 'data': [7, 12]}]
+    print("✅ Chart panels working")
+
+
+def test_report_pipeline():
+    """The comprehensive report streams as valid JSON and reuses shared results"""
+    print("🔍 Testing report pipeline...")
+    import io
+    import chart_cache
+    from analytics_engine import REPORT_SECTIONS, HRAnalyticsEngine
+    from chart_service import chart_service
+
+    engine = HRAnalyticsEngine()
+    saved = chart_cache.chart_cache.folder, chart_service.max_workers
+    with tempfile.TemporaryDirectory() as folder:
+        chart_cache.chart_cache.folder, chart_service.max_workers = folder, 0
+        engine.db_folder = folder
+        try:
+            buffer = io.StringIO()
+            report = engine.stream_report(buffer)
+            streamed = json.loads(buffer.getvalue())
+            sections = [section for section, _, _ in REPORT_SECTIONS]
+            assert list(report) == ['generated_at'] + sections
+            assert sorted(streamed) == sorted(report)
+            # Nine analyses plus the shared aggregates, each computed once
+            assert engine.stats['misses'] == len(sections) + 1
+
+            written = engine.generate_comprehensive_report()
+            with open(os.path.join(folder, 'hr_analytics_report.json')) as f:
+                assert sorted(json.load(f)) == sorted(written)
+            assert engine.stats['misses'] == len(sections) + 1
+            paths = [written[s]['chart_path'] for s in sections if written[s].get('chart_path')]
+            assert paths and all(os.path.exists(path) for path in paths)
+        finally:
+            chart_cache.chart_cache.folder, chart_service.max_workers = saved
+    print("✅ Report pipeline working")
+
+
+def imported_tool_schema(fn):
+    """OpenAI schema of an imported function, from its signature and type hints"""
+    import inspect
+    from typing import get_type_hints
+    openai_types = {int: "integer", float: "number", bool: "boolean", list: "array", dict: "object"}
+    type_hints = get_type_hints(fn)
+    params = {name: openai_types.get(type_hints.get(name, str), "string") for name in inspect.signature(fn).parameters}
+    return {
+        "type": "function",
+        "function": {
+            "name": fn.__name__,
+            "description": fn.__doc__ or f"Call {fn.__name__}",
+            "parameters": {
+                "type": "object",
+                "properties": {param: {"type": kind} for param, kind in params.items()},
+                "required": list(params)
+            } if params else {"type": "object", "properties": {}}
+        }
+    }
+
+
+def test_tool_registry():
+    """Tool schemas come from the source; tools.py is imported on the first call"""
+    print("🔍 Testing tool registry...")
+    import import_report
+    from tool_registry import ToolRegistry
+
+    registry = ToolRegistry()
+    schemas = registry.schemas()
+    assert registry.stats == {'parses': 1, 'imports': 0, 'calls': 0, 'errors': 0, 'timeouts': 0}
+    assert 'greet' in registry and '_chart_link' not in registry
+    assert 'enhanced_monthly_data' not in registry  # returns data, not text
+    assert registry.call('greet', {'name': 'Ada'}) and registry.stats['imports'] == 1
+    assert schemas == [imported_tool_schema(registry.function(name)) for name in registry.names()]
+    assert registry.schemas() is schemas and registry.stats['parses'] == 1
+
+    rows = import_report.import_times('tool_registry')
+    assert rows and not {row.name.split('.')[0] for row in rows} & set(import_report.HEAVY_MODULES)
+    print("✅ Tool registry working")
+
+
+def test_chat_context():
+    """Chat context holds the matching records' projected fields, within the budget"""
+    print("🔍 Testing chat context retrieval...")
+    from activity_logger import ActivityLogger
+    from retrieval import ChatContextRetriever, estimate_tokens
+
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('jobs', [{'job_id': '1', 'job_title': 'Piping Engineer', 'department': 'Piping', 'status': 'Open'},
+                           {'job_id': '2', 'job_title': 'Civil Designer', 'department': 'Civil', 'status': 'Closed'}])
+        repo.save('candidates', [
+            {'id': i, 'name': f'Person {i}', 'position': 'Civil Designer', 'status': 'New',
+             'interview_transcript': 'x' * 5000, 'skills': ['AutoCAD']} for i in range(1, 40)
+        ] + [{'id': 40, 'name': 'Maria Lopez', 'position': 'Piping Engineer', 'status': 'Hired',
+              'interview_transcript': 'long transcript', 'ai_interview_report': {'score': 9}}])
+        repo.save('users', [{'username': 'hr_manager', 'role': 'HR Manager', 'password': 'secret'}])
+
+        retriever = ChatContextRetriever(repo, activity_log=ActivityLogger(db_folder))
+        context = retriever.context("What is Maria's status?", budget=400)
+        assert context['summary']['candidates'] == 40 and context['summary']['jobs_by_status'] == {'Open': 1, 'Closed': 1}
+        assert context['candidates'][0] == {'id': 40, 'name': 'Maria Lopez', 'position': 'Piping Engineer',
+                                            'status': 'Hired'}
+        assert 'jobs' not in context and 'users' not in context
+
+        context = retriever.context('civil designers', budget=250)
+        assert estimate_tokens(context) <= 250 and context['omitted'] > 0
+        assert all('interview_transcript' not in c for c in context['candidates'])
+        assert context['jobs'][0]['job_id'] == '2'
+        assert 'password' not in json.dumps(retriever.context('hr manager'))
+    print("✅ Chat context retrieval working")
+
+
+def test_db_digest():
+    """The digest is rebuilt only on data changes and reused from disk by a new instance"""
+    print("🔍 Testing DB digest...")
+    from db_digest import DbDigest
+
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('jobs', [{'job_id': '1', 'job_title': 'Piping Engineer', 'department': 'Piping', 'status': 'Open'}])
+        repo.save('candidates', [
+            {'id': 1, 'name': 'Maria Lopez', 'job_id': '1', 'status': 'Hired', 'match_score': 8,
+             'interview_transcript': 'TRANSCRIPT', 'skills': ['PDMS', 'SP3D']},
+            {'id': 2, 'name': 'Omar Ali', 'job_id': '1', 'status': 'New', 'match_score': 6},
+        ])
+        digest = DbDigest(repo)
+        text = digest.text()
+        assert 'Maria Lopez' in text and 'TRANSCRIPT' not in text
+        assert '- 1 | Piping Engineer | Piping | Open |  |  | 2: Hired 1, New 1' in text
+        assert '- Piping | 1 | 2: Hired 1, New 1 | 7.0' in text
+        assert digest.text() is text and digest.stats == {'hits': 1, 'builds': 1, 'disk_hits': 0}
+
+        other = DbDigest(repo)
+        assert other.text() == text and other.stats['disk_hits'] == 1
+
+        repo.update_record('candidates', 'id', 2, {'status': 'Rejected'})
+        assert 'Rejected' in digest.text() and digest.stats['builds'] == 2
+    print("✅ DB digest working")
+
+
+def test_llm_cache():
+    """Deterministic completions are served from the cache until they expire or are evicted"""
+    print("🔍 Testing LLM response cache...")
+    from llm_cache import LlmCache, LlmClient, cache_key
+
+    messages = [{'role': 'user', 'content': 'Extract the job description'}]
+    with tempfile.TemporaryDirectory() as db_folder:
+        cache = LlmCache(os.path.join(db_folder, 'llm.sqlite3'), ttl=60, max_bytes=1000)
+        key = cache_key('gpt-4o', messages, 0)
+        assert key != cache_key('gpt-4o', messages, 0, data_version=2) != cache_key('gpt-4o', messages, 0.7)
+        assert cache.get(key) is None
+        cache.put(key, 'gpt-4o', 'Piping Engineer, 5 years')
+
+        client = LlmClient(cache)
+        assert client.chat(messages) == 'Piping Engineer, 5 years'  # no API call
+        assert client.stats == {'calls': 0, 'cached': 1, 'errors': 0}
+
+        # Least recently used entries go first once the cache outgrows max_bytes
+        for i in range(3):
+            time.sleep(0.01)
+            cache.put(f'k{i}', 'gpt-4o', 'x' * 400)
+        assert cache.get('k2') and cache.get(key) is None and cache.stats['evictions'] >= 2
+        assert client.metrics()['cache']['bytes'] <= 1000
+
+        cache.ttl = 0
+        time.sleep(0.01)
+        assert cache.get('k2') is None and cache.stats['expired'] >= 1
+    print("✅ LLM response cache working")
+
+def test_concurrent_tool_calls():
+    """A reply's tool calls run at once; each result keeps its position, slow calls time out"""
+    print("🔍 Testing concurrent tool calls...")
+    from tool_registry import ToolRegistry
+
+    source = (
+        "import time\n"
+        "def nap(seconds: float) -> str:\n"
+        "    \"\"\"Sleep for a while\"\"\"\n"
+        "    time.sleep(seconds)\n"
+        "    return f'slept {seconds}'\n"
+        "def fail() -> str:\n"
+        "    \"\"\"Always fails\"\"\"\n"
+        "    raise ValueError('boom')\n"
+    )
+    with tempfile.TemporaryDirectory() as folder:
+        with open(os.path.join(folder, 'nap_tools.py'), 'w') as f:
+            f.write(source)
+        sys.path.insert(0, folder)
+        try:
+            registry = ToolRegistry('nap_tools', os.path.join(folder, 'nap_tools.py'))
+            start = time.perf_counter()
+            runs = dict(registry.run_all([('nap', {'seconds': 0.3}), ('nap', {'seconds': 0.3}), ('fail', {})]))
+            assert time.perf_counter() - start < 0.55  # as long as the slowest call, not the sum
+            assert runs[0].result == runs[1].result == 'slept 0.3'
+            assert isinstance(runs[2].error, ValueError) and registry.stats['errors'] == 1
+            assert registry.timings['nap']['calls'] == 2 and registry.timings['nap']['max_s'] >= 0.3
+
+            [(position, run)] = list(registry.run_all([('nap', {'seconds': 0.5})], timeout=0.1))
+            assert position == 0 and isinstance(run.error, TimeoutError) and registry.stats['timeouts'] == 1
+        finally:
+            sys.path.remove(folder)
+            sys.modules.pop('nap_tools', None)
+    print("✅ Concurrent tool calls working")
+
+def test_app_imports_stay_light():
+    """Modules app.py imports at startup load neither tools.py nor NumPy"""
+    print("🔍 Testing app startup imports...")
+    import ast
+    import import_report
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    startup = {node.module for node in tree.body if isinstance(node, ast.ImportFrom)}
+    startup |= {alias.name for node in tree.body if isinstance(node, ast.Import) for alias in node.names}
+    assert not startup & {'tools', 'analytics_engine', 'analytics_series'}
+
+    heavy = {'tools', 'numpy', 'analytics_engine'} | set(import_report.HEAVY_MODULES)
+    # app.py's own modules (Aion and data need Flask, so they are covered through what they import)
+    for module in ('repository', 'journal', 'locking', 'job_status', 'response_cache', 'search_index', 'models',
+                   'db_digest', 'llm_cache', 'retrieval', 'tool_registry', 'chart_service'):
+        loaded = {row.name.split('.')[0] for row in import_report.import_times(module)}
+        assert not loaded & heavy, (module, loaded & heavy)
+    assert 'tools' not in {row.name.split('.')[0] for row in import_report.import_times('analytics_series')}
+    print("✅ App startup imports light")
+
+def test_key_matching():
+    """Updates match keys like find() does: '2' finds id 2, and the update survives a reload"""
+    print("🔍 Testing record key matching...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        repo = JsonRepository(db_folder)
+        repo.save('candidates', [{'id': 1, 'status': 'New'}, {'id': 2, 'status': 'New'}])
+
+        assert repo.find_one('candidates', 'id', '2')['id'] == 2
+        assert repo.update_record('candidates', 'id', '2', {'status': 'Hired'})
+        assert JsonRepository(db_folder).load('candidates')[1] == {'id': 2, 'status': 'Hired'}  # journal replay
+
+        stored = repo.mutate_record('candidates', 'id', '1', lambda c: c.update(status='Interview'))
+        assert stored is not None and stored['id'] == 1
+        assert [c['status'] for c in JsonRepository(db_folder).load('candidates')] == ['Interview', 'Hired']
+        assert repo.mutate_record('candidates', 'id', '3', lambda c: None) is None
+    print("✅ Record key matching working")
+
+def test_chat_stream():
+    """Replies formatted chunk by chunk match format_reply; streamed tool calls are rebuilt"""
+    print("🔍 Testing chat streaming...")
+    import random
+    from chat_stream import ReplyFormatter, completion_events, format_reply
+
+    reply = ("Here is the *summary*:\n- item *one*\n- item two\n\n1. first\n2. second\nDone\n"
+             "![Trend](db/charts/trend.png)\nLast line")
+    rng = random.Random(7)
+    for _ in range(50):
+        formatter, html, position = ReplyFormatter(), '', 0
+        while position < len(reply):
+            size = rng.randint(1, 6)
+            html += formatter.feed(reply[position:position + size])
+            position += size
+        assert (html + formatter.finish()).rstrip('<br>') == format_reply(reply)
+    assert '<b>summary</b>' in format_reply(reply) and format_reply(reply).count('<ul') == 2
+
+    def create(stream=False, **kwargs):
+        assert stream and kwargs['model'] == 'gpt-4o'
+        deltas = [
+            {'tool_calls': [{'index': 0, 'id': 'call_a', 'function': {'name': 'get_', 'arguments': ''}}]},
+            {'tool_calls': [{'index': 0, 'function': {'name': 'time', 'arguments': '{"city": '}}]},
+            {'tool_calls': [{'index': 1, 'id': 'call_b', 'function': {'name': 'greet', 'arguments': '{}'}}]},
+            {'tool_calls': [{'index': 0, 'function': {'arguments': '"Paris"}'}}]},
+        ]
+        return iter([{'choices': [{'delta': delta}]} for delta in deltas] + [{'choices': []}])
+
+    events = completion_events(create, True, model='gpt-4o', messages=[])
+    try:
+        while True:
+            assert next(events)[0] == 'delta'
+    except StopIteration as done:
+        message = done.value
+    assert message['content'] is None
+    assert [(c['id'], c['function']['name'], c['function']['arguments']) for c in message['tool_calls']] == [
+        ('call_a', 'get_time', '{"city": "Paris"}'), ('call_b', 'greet', '{}')]
+    print("✅ Chat streaming working")
+
+
+if __name__ == "__main__":
+    test_repository_cache()
+    test_repository_update_and_defaults()
+    test_journaled_updates()
+    test_compare_and_swap()
+    test_secondary_indexes()
+    test_job_status_view()
+    test_dashboard_rollups()
+    test_versioned_response_cache()
+    test_search_index()
+    test_event_index()
+    test_record_models()
+    test_analytics_snapshot()
+    test_chart_cache()
+    test_chart_service()
+    test_chart_panels()
+    test_report_pipeline()
+    test_tool_registry()
+    test_chat_context()
+    test_db_digest()
+    test_llm_cache()
+    test_concurrent_tool_calls()
+    test_app_imports_stay_light()
+    test_key_matching()
+    test_chat_stream()
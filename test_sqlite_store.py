@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite storage engine
+Migrates sample JSON collections and checks single-row updates and indexed queries
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from repository import JsonRepository
+from sqlite_store import SqliteStore, migrate_json_to_sqlite, DB_FILENAME
+
+
+def test_migration_and_queries():
+    """Migrated collections keep their order and answer indexed queries"""
+    print("🔍 Testing SQLite migration...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        candidates = [
+            {'id': 1, 'name': 'Asha', 'status': 'Hired', 'job_id': '1', 'applied_date': '2025-01-10'},
+            {'id': 2, 'name': 'Ben', 'status': 'New', 'job_id': '1', 'applied_date': '2025-02-01'},
+            {'id': 3, 'name': 'Chen', 'status': 'Hired', 'job_id': '2', 'applied_date': '2025-02-03'},
+        ]
+        with open(os.path.join(db_folder, 'candidates.json'), 'w') as f:
+            json.dump(candidates, f)
+
+        counts = migrate_json_to_sqlite(db_folder)
+        assert counts['candidates'] == 3 and counts['jobs'] == 0
+
+        store = SqliteStore(os.path.join(db_folder, DB_FILENAME))
+        assert store.load_collection('candidates') == candidates
+        assert [c['id'] for c in store.query('candidates', status='Hired')] == [1, 3]
+        assert [c['id'] for c in store.query('candidates', job_id=1, status='New')] == [2]
+
+        # Only the changed row is rewritten
+        candidates[1]['status'] = 'Shortlisted'
+        assert store.save_collection('candidates', candidates) == 1
+        assert store.save_collection('candidates', candidates[:2]) == 1
+        assert len(store.load_collection('candidates')) == 2
+    print("✅ Migration and indexed queries working")
+
+
+def test_repository_on_sqlite():
+    """The repository serves the same API from SQLite once a database exists"""
+    print("🔍 Testing repository on SQLite...")
+    with tempfile.TemporaryDirectory() as db_folder:
+        migrate_json_to_sqlite(db_folder)
+        repo = JsonRepository(db_folder)
+        assert repo.store is not None
+
+        repo.save('candidates', [{'id': 1, 'status': 'New'}, {'id': 2, 'status': 'New'}])
+        assert repo.load('candidates') is repo.load('candidates')
+
+        assert repo.update_record('candidates', 'id', 2, {'status': 'Hired'})
+        assert not repo.update_record('candidates', 'id', 9, {'status': 'Hired'})
+        assert repo.load('candidates')[1]['status'] == 'Hired'
+        assert [c['id'] for c in repo.query('candidates', status='Hired')] == [2]
+
+        # Updates by other fields go through the store too, not the journal of the
+        # JSON file left over from before the migration
+        with open(repo.path('candidates'), 'w') as f:
+            json.dump([], f)
+        assert repo.update_record('candidates', 'id', '1', {'email': 'one@example.com'})
+        assert repo.update_record('candidates', 'email', 'ONE@example.com', {'status': 'Interview'})
+        assert repo.load('candidates')[0] == {'id': 1, 'status': 'Interview', 'email': 'one@example.com'}
+        assert not os.path.exists(repo.path('candidates') + '.journal')
+
+        # A second repository (another process) sees the same data
+        other = JsonRepository(db_folder)
+        assert other.load('candidates')[1]['status'] == 'Hired'
+        assert other.load('candidates')[0]['status'] == 'Interview'
+    print("✅ Repository on SQLite working")
+
+
+if __name__ == "__main__":
+    test_migration_and_queries()
+    test_repository_on_sqlite()
@@ -0,0 +1,166 @@
+"""
+Tool Registry for AION HR System
+OpenAI tool schemas for the chat tools in tools.py, without importing tools.py.
+
+tools.py pulls in NumPy, matplotlib and the analytics stack, which used to be
+paid by every process on startup just to describe the tools to the model. The
+schemas are built from the source instead (names, docstrings and parameter
+annotations, read with ast) and tools.py is imported on the first tool call.
+Tools are the public functions of tools.py that return text or are unannotated;
+helpers returning data (e.g. enhanced_*_data) are not offered to the model.
+
+The tool calls of one model reply are independent of each other, so run_all()
+runs them at once on a bounded thread pool (TOOL_WORKERS) and gives up on a
+call after TOOL_TIMEOUT_S. Time taken per tool is kept in timings.
+"""
+
+import ast
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# Threads running tool calls, shared by all chat turns
+TOOL_WORKERS = int(os.environ.get('AION_TOOL_WORKERS', '4'))
+# Seconds a tool call may take before the chat goes on without it
+TOOL_TIMEOUT_S = float(os.environ.get('AION_TOOL_TIMEOUT_S', '60'))
+
+# Annotation (as written in the source) -> JSON schema type; anything else is a string
+OPENAI_TYPES = {'int': 'integer', 'float': 'number', 'bool': 'boolean', 'list': 'array', 'dict': 'object'}
+
+
+def _schema(name: str, doc: Optional[str], params: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": doc or f"Call {name}",
+            "parameters": {
+                "type": "object",
+                "properties": {param: {"type": kind} for param, kind in params.items()},
+                "required": list(params)
+            } if params else {"type": "object", "properties": {}}
+        }
+    }
+
+
+def _annotation_type(node: Optional[ast.expr]) -> str:
+    return OPENAI_TYPES.get(node.id, "string") if isinstance(node, ast.Name) else "string"
+
+
+def _is_tool(node: ast.FunctionDef) -> bool:
+    returns = node.returns
+    return not node.name.startswith('_') and (returns is None or isinstance(returns, ast.Name) and returns.id == 'str')
+
+
+class ToolRun(NamedTuple):
+    name: str
+    result: Any
+    error: Optional[Exception]  # what the tool raised; TimeoutError if it ran out of time
+    seconds: float
+
+
+class ToolRegistry:
+    def __init__(self, module: str = 'tools', source: Optional[str] = None):
+        self.module = module
+        self.source = source or os.path.join(os.path.dirname(os.path.abspath(__file__)), f'{module}.py')
+        self.lock = threading.Lock()
+        self._schemas: Optional[List[Dict[str, Any]]] = None
+        self._mtime: Optional[float] = None
+        self._module: Optional[ModuleType] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.stats = {'parses': 0, 'imports': 0, 'calls': 0, 'errors': 0, 'timeouts': 0}
+        self.timings: Dict[str, Dict[str, float]] = {}  # tool -> calls, total_s, max_s
+
+    def schemas(self) -> List[Dict[str, Any]]:
+        """Tool schemas in definition order, re-read only when the source file changes"""
+        mtime = os.path.getmtime(self.source)
+        with self.lock:
+            if self._schemas is None or mtime != self._mtime:
+                with open(self.source, encoding='utf-8') as f:
+                    tree = ast.parse(f.read(), filename=self.source)
+                self._schemas = [
+                    _schema(node.name, ast.get_docstring(node, clean=False),
+                            {arg.arg: _annotation_type(arg.annotation) for arg in node.args.args})
+                    for node in tree.body if isinstance(node, ast.FunctionDef) and _is_tool(node)
+                ]
+                self._mtime = mtime
+                self.stats['parses'] += 1
+            return self._schemas
+
+    def names(self) -> List[str]:
+        return [schema['function']['name'] for schema in self.schemas()]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names()
+
+    def function(self, name: str) -> Callable:
+        """The tool's function; imports the tools module on first use. KeyError for non-tools"""
+        if name not in self:
+            raise KeyError(name)
+        if self._module is None:
+            module = importlib.import_module(self.module)  # thread-safe; a no-op once imported
+            with self.lock:
+                if self._module is None:
+                    self._module = module
+                    self.stats['imports'] += 1
+        return getattr(self._module, name)
+
+    def call(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Run a tool by name with the model's (already decoded) arguments"""
+        function = self.function(name)
+        with self.lock:
+            self.stats['calls'] += 1
+        return function(**arguments)
+
+    def _timed(self, name: str, arguments: Dict[str, Any]) -> ToolRun:
+        start = time.perf_counter()
+        try:
+            result, error = self.call(name, arguments), None
+        except Exception as e:
+            result, error = None, e
+        seconds = time.perf_counter() - start
+        with self.lock:
+            timing = self.timings.setdefault(name, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0})
+            timing['calls'] += 1
+            timing['total_s'] += seconds
+            timing['max_s'] = max(timing['max_s'], seconds)
+            if error is not None:
+                self.stats['errors'] += 1
+        return ToolRun(name, result, error, seconds)
+
+    def run_all(self, calls: Sequence[Tuple[str, Dict[str, Any]]],
+                timeout: float = TOOL_TIMEOUT_S) -> Iterator[Tuple[int, ToolRun]]:
+        """Runs (name, arguments) calls concurrently, yielding (position, run) as each one finishes.
+
+        Calls not finished timeout seconds after they were submitted yield a TimeoutError
+        run; one that already started keeps its worker until it returns.
+        """
+        with self.lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max(1, TOOL_WORKERS), thread_name_prefix='tool')
+            pool = self._pool
+        futures = {pool.submit(self._timed, name, arguments): index
+                   for index, (name, arguments) in enumerate(calls)}
+        deadline = time.monotonic() + timeout
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, max(0, deadline - time.monotonic()), FIRST_COMPLETED)
+            if not finished:
+                break
+            for future in finished:
+                yield futures[future], future.result()
+        for future in pending:
+            future.cancel()
+            name = calls[futures[future]][0]
+            with self.lock:
+                self.stats['timeouts'] += 1
+            yield futures[future], ToolRun(name, None, TimeoutError(f"no result within {timeout:g}s"), timeout)
+
+
+# Global tool registry instance
+tool_registry = ToolRegistry()
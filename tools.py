@@ -5,13 +5,13 @@ from typing import Dict, List, Any
 import os
 import json
 import numpy as np
-# Configure matplotlib to use non-interactive backend for web servers
-import matplotlib
-matplotlib.use('Agg')  # Use Anti-Grain Geometry backend (non-interactive)
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 
+from repository import repository
+from models import Status, record_models
+from analytics_snapshot import MISSING_DAY, analytics_snapshots, months
+from chart_service import chart_service
+
 # Import salary research module for market analysis
 try:
     from salary_research import salary_researcher
@@ -19,25 +19,16 @@ except ImportError:
     salary_researcher = None
 
 def load_json_data(filename):
-    """Load JSON data from the db folder"""
-    db_folder = os.path.join(os.path.dirname(__file__), 'db')
-    file_path = os.path.join(db_folder, filename)
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    return []
+    """Load JSON data from the db folder (shared repository cache, treat as read-only)"""
+    return repository.load(filename)
 
 # ========== REAL DATA ANALYTICS FUNCTIONS ==========
 
 def get_onboarding_insights() -> str:
     """Analyzes onboarding process based on real candidate data"""
     try:
-        candidates = load_json_data("candidates.json")
-        
-        hired_candidates = [c for c in candidates if c.get('status') == 'Hired']
+        # Typed records: dates are already parsed (see models.py)
+        hired_candidates = [c for c in record_models.candidates() if c.status == Status.HIRED]
         
         if not hired_candidates:
             return "🚀 **Onboarding Insights**: No hired candidates found for analysis"
@@ -62,22 +53,12 @@ def get_onboarding_insights() -> str:
             onboarding_analysis['departments'][dept] += 1
             
             # Calculate time from hiring to start (if available)
-            hired_date = candidate.get('hired_date')
-            start_date = candidate.get('start_date')
-            
-            if hired_date and start_date:
-                try:
-                    hired_dt = datetime.strptime(hired_date, '%Y-%m-%d')
-                    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                    days_diff = (start_dt - hired_dt).days
-                    total_days += days_diff
-                    valid_date_count += 1
-                except:
-                    pass
+            if candidate.hired and candidate.start:
+                total_days += (candidate.start - candidate.hired).days
+                valid_date_count += 1
             
             # Check onboarding status
-            onboarding_status = candidate.get('onboarding_status', 'pending')
-            if onboarding_status == 'completed':
+            if candidate.onboarding_status == 'completed':
                 onboarding_analysis['completed_onboarding'] += 1
             else:
                 onboarding_analysis['pending_onboarding'] += 1
@@ -225,23 +206,15 @@ def get_probation_insights() -> str:
 def get_salary_trend_insights() -> str:
     """Analyzes salary trends using real data with market comparison"""
     try:
-        candidates = load_json_data("candidates.json")
-        
         # Extract salary data with dates
         salary_data = []
-        for candidate in candidates:
-            if candidate.get('offered_salary') and candidate.get('hired_date'):
-                try:
-                    salary = float(candidate['offered_salary'])
-                    date = datetime.strptime(candidate['hired_date'], '%Y-%m-%d')
-                    position = candidate.get('position', 'Unknown')
-                    salary_data.append({
-                        'salary': salary, 
-                        'date': date, 
-                        'position': position
-                    })
-                except:
-                    continue
+        for candidate in record_models.candidates():
+            if candidate.salary and candidate.hired:
+                salary_data.append({
+                    'salary': candidate.salary, 
+                    'date': candidate.hired, 
+                    'position': candidate.position or 'Unknown'
+                })
         
         if len(salary_data) < 2:
             return "💰 **Salary Trend Analysis**: No salary data available in candidate records. This is normal as salary information is often stored separately for privacy."
@@ -437,24 +410,21 @@ def get_hiring_success_rate_insight() -> str:
         if not candidates:
             return "📊 **Hiring Success Rate**: No candidate data available for analysis"
         
-        total_candidates = len(candidates)
-        hired_count = len([c for c in candidates if c.get('status') == 'Hired'])
+        records = record_models.candidates()
+        total_candidates = len(records)
+        hired_count = sum(1 for c in records if c.status == Status.HIRED)
         success_rate = (hired_count / total_candidates * 100) if total_candidates > 0 else 0
         
         # Monthly trend analysis
         monthly_data = {}
-        for candidate in candidates:
-            applied_date = candidate.get('applied_date')
-            if applied_date:
-                try:
-                    month_key = datetime.strptime(applied_date, '%Y-%m-%d').strftime('%Y-%m')
-                    if month_key not in monthly_data:
-                        monthly_data[month_key] = {'total': 0, 'hired': 0}
-                    monthly_data[month_key]['total'] += 1
-                    if candidate.get('status') == 'Hired':
-                        monthly_data[month_key]['hired'] += 1
-                except:
-                    continue
+        for candidate in records:
+            if candidate.applied:
+                month_key = candidate.applied.isoformat()[:7]
+                if month_key not in monthly_data:
+                    monthly_data[month_key] = {'total': 0, 'hired': 0}
+                monthly_data[month_key]['total'] += 1
+                if candidate.status == Status.HIRED:
+                    monthly_data[month_key]['hired'] += 1
         
         # Analysis
         if success_rate >= 75:
@@ -502,26 +472,19 @@ def get_hiring_success_rate_insight() -> str:
 def get_monthly_hiring_insights() -> str:
     """Analyzes monthly hiring patterns using real data"""
     try:
-        candidates = load_json_data("candidates.json")
-        
         monthly_stats = {}
-        for candidate in candidates:
-            applied_date = candidate.get('applied_date')
-            if applied_date:
-                try:
-                    month_key = datetime.strptime(applied_date, '%Y-%m-%d').strftime('%Y-%m')
-                    month_name = datetime.strptime(month_key, '%Y-%m').strftime('%B %Y')
-                    
-                    if month_name not in monthly_stats:
-                        monthly_stats[month_name] = {'applications': 0, 'hired': 0, 'interviews': 0}
-                    
-                    monthly_stats[month_name]['applications'] += 1
-                    if candidate.get('status') == 'Hired':
-                        monthly_stats[month_name]['hired'] += 1
-                    if candidate.get('status') in ['Interviewed', 'Hired']:
-                        monthly_stats[month_name]['interviews'] += 1
-                except:
-                    continue
+        for candidate in record_models.candidates():
+            if candidate.applied:
+                month_name = candidate.applied.strftime('%B %Y')
+                
+                if month_name not in monthly_stats:
+                    monthly_stats[month_name] = {'applications': 0, 'hired': 0, 'interviews': 0}
+                
+                monthly_stats[month_name]['applications'] += 1
+                if candidate.status == Status.HIRED:
+                    monthly_stats[month_name]['hired'] += 1
+                if candidate.status in (Status.INTERVIEWED, Status.HIRED):
+                    monthly_stats[month_name]['interviews'] += 1
         
         if not monthly_stats:
             return "📅 **Monthly Hiring Insights**: No application data available for analysis"
@@ -703,25 +666,31 @@ def get_top_performers_insights() -> str:
 
 # ========== CHART CREATION FUNCTIONS ==========
 
+def _chart_link(path: str) -> str:
+    """Cached chart path relative to the app folder, for markdown image links (db/charts/...)"""
+    return os.path.relpath(path, os.path.dirname(os.path.abspath(__file__))).replace(os.sep, '/')
+
 def create_line_chart(data: dict, filename: str, title: str, xlabel: str, ylabel: str) -> str:
     """Creates a line chart and saves it to the db folder"""
     try:
-        plt.figure(figsize=(10, 6))
+        # A Figure of its own rather than pyplot's global one: tool calls run concurrently
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         
         dates = list(data.keys())
         values = list(data.values())
         
-        plt.plot(dates, values, marker='o', linewidth=2, markersize=6)
-        plt.title(title, fontsize=14, fontweight='bold')
-        plt.xlabel(xlabel)
-        plt.ylabel(ylabel)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.grid(True, alpha=0.3)
+        ax.plot(dates, values, marker='o', linewidth=2, markersize=6)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.tick_params(axis='x', labelrotation=45)
+        fig.tight_layout()
+        ax.grid(True, alpha=0.3)
         
         filepath = os.path.join("./db", filename)
-        plt.savefig(filepath, dpi=150, bbox_inches='tight')
-        plt.close()
+        fig.savefig(filepath, dpi=150, bbox_inches='tight')
         
         return f"Chart saved: {filename}"
         
@@ -731,8 +700,6 @@ def create_line_chart(data: dict, filename: str, title: str, xlabel: str, ylabel
 def create_pie_chart(data: Any) -> str:
     """Creates a pie chart based on the provided data"""
     try:
-        plt.figure(figsize=(8, 8))
-        
         if isinstance(data, dict):
             labels = list(data.keys())
             values = list(data.values())
@@ -742,14 +709,12 @@ def create_pie_chart(data: Any) -> str:
         else:
             return "⚠️ Invalid data format for pie chart"
         
-        plt.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
-        plt.title('Distribution Analysis', fontsize=14, fontweight='bold')
+        chart = chart_service.render('pie_chart', {'labels': labels, 'values': values}, (8, 8))
+        if chart is None:
+            return "⚠️ Pie chart could not be rendered right now, please try again"
+        filepath = _chart_link(chart)
         
-        filepath = os.path.join("./db", "pie_chart.png")
-        plt.savefig(filepath, dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        return f"📊 Pie chart created: ![Pie Chart](./db/pie_chart.png)"
+        return f"📊 Pie chart created: ![Pie Chart](./{filepath})"
         
     except Exception as e:
         return f"⚠️ Error creating pie chart: {e}"
@@ -769,161 +734,139 @@ def get_time(city: str = "UTC") -> str:
 
 # ========== ENHANCED ANALYTICS FUNCTIONS ==========
 
+def enhanced_hiring_success_rate_data() -> Dict[str, Any]:
+    """Hiring success rate with the candidate status breakdown"""
+    snap = analytics_snapshots.get()
+    
+    # Status breakdown
+    counts = np.bincount(snap.status_text, minlength=len(snap.status_text_labels))
+    status_counts = dict(zip(snap.status_text_labels, counts.tolist()))
+    total_candidates = snap.n
+    hired_count = int(snap.has_status(Status.HIRED).sum())
+    
+    # Calculate success rate
+    success_rate = (hired_count / total_candidates * 100) if total_candidates > 0 else 0
+    
+    # Determine performance status
+    if success_rate < 15:
+        performance = "CRITICAL"
+    elif success_rate < 25:
+        performance = "NEEDS IMPROVEMENT"
+    elif success_rate < 40:
+        performance = "GOOD"
+    else:
+        performance = "EXCELLENT"
+    
+    return {'success_rate': success_rate, 'performance': performance, 'hired': hired_count,
+            'total_candidates': total_candidates, 'status_counts': status_counts}
+
 def get_enhanced_hiring_success_rate() -> str:
     """Get comprehensive hiring success rate analysis with detailed breakdown"""
     try:
-        candidates = load_json_data("candidates.json")
-        
-        # Status breakdown
-        status_counts = {}
-        total_candidates = len(candidates)
-        hired_count = 0
-        
-        for candidate in candidates:
-            status = candidate.get('status', 'Unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
-            if status == 'Hired':
-                hired_count += 1
-        
-        # Calculate success rate
-        success_rate = (hired_count / total_candidates * 100) if total_candidates > 0 else 0
-        
-        # Determine performance status
-        if success_rate < 15:
-            performance = "CRITICAL"
-        elif success_rate < 25:
-            performance = "NEEDS IMPROVEMENT"
-        elif success_rate < 40:
-            performance = "GOOD"
-        else:
-            performance = "EXCELLENT"
-        
-        return f"Hiring Success Rate: {success_rate:.1f}% ({performance}) - {hired_count} hired out of {total_candidates} total candidates. Breakdown: {', '.join([f'{k}: {v}' for k, v in status_counts.items()])}"
+        data = enhanced_hiring_success_rate_data()
+        return f"Hiring Success Rate: {data['success_rate']:.1f}% ({data['performance']}) - {data['hired']} hired out of {data['total_candidates']} total candidates. Breakdown: {', '.join([f'{k}: {v}' for k, v in data['status_counts'].items()])}"
     
     except Exception as e:
         return f"Error calculating hiring success rate: {str(e)}"
 
+def enhanced_monthly_data() -> Dict[str, Any]:
+    """Applications and hires per calendar month, with the best and worst hiring month"""
+    snap = analytics_snapshots.get()
+    month_names = [datetime(2000, m, 1).strftime('%B') for m in range(1, 13)]
+    
+    # Monthly hiring breakdown (by calendar month)
+    applied_months = months(snap.applied)
+    applied_counts = np.bincount(applied_months[applied_months >= 0] % 12, minlength=12)
+    hired_months = months(snap.hired)[snap.has_status(Status.HIRED)]
+    hired_counts = np.bincount(hired_months[hired_months >= 0] % 12, minlength=12)
+    monthly_applied = {month_names[m]: int(n) for m, n in enumerate(applied_counts) if n}
+    monthly_hired = {month_names[m]: int(n) for m, n in enumerate(hired_counts) if n}
+    
+    # Find best and worst months
+    best_month = max(monthly_hired.items(), key=lambda x: x[1]) if monthly_hired else ("None", 0)
+    worst_month = min(monthly_hired.items(), key=lambda x: x[1]) if monthly_hired else ("None", 0)
+    
+    return {'monthly_applied': monthly_applied, 'monthly_hired': monthly_hired,
+            'best_month': best_month, 'worst_month': worst_month}
+
 def get_enhanced_monthly_insights() -> str:
     """Get detailed monthly hiring trends and patterns"""
-    from collections import defaultdict
     
     try:
-        candidates = load_json_data("candidates.json")
-        
-        # Monthly hiring breakdown
-        monthly_hired = defaultdict(int)
-        monthly_applied = defaultdict(int)
-        
-        for candidate in candidates:
-            # Applied date analysis
-            if candidate.get('applied_date'):
-                try:
-                    applied_month = datetime.strptime(candidate['applied_date'], '%Y-%m-%d').strftime('%B')
-                    monthly_applied[applied_month] += 1
-                except:
-                    pass
-            
-            # Hired date analysis
-            if candidate.get('status') == 'Hired' and candidate.get('hired_date'):
-                try:
-                    hired_month = datetime.strptime(candidate['hired_date'], '%Y-%m-%d').strftime('%B')
-                    monthly_hired[hired_month] += 1
-                except:
-                    pass
-        
-        # Find best and worst months
-        best_month = max(monthly_hired.items(), key=lambda x: x[1]) if monthly_hired else ("None", 0)
-        worst_month = min(monthly_hired.items(), key=lambda x: x[1]) if monthly_hired else ("None", 0)
+        data = enhanced_monthly_data()
+        best_month, worst_month = data['best_month'], data['worst_month']
         
         insights = f"Monthly Hiring Insights: Best month: {best_month[0]} ({best_month[1]} hires), Worst month: {worst_month[0]} ({worst_month[1]} hires). "
-        insights += f"Applications per month: {dict(monthly_applied)}"
+        insights += f"Applications per month: {dict(data['monthly_applied'])}"
         
         return insights
     
     except Exception as e:
         return f"Error analyzing monthly insights: {str(e)}"
 
+def enhanced_department_data() -> Dict[str, Any]:
+    """Average days to hire per department, with the fastest and slowest department"""
+    snap = analytics_snapshots.get()
+    
+    # Time to hire per department (department of the candidate's job)
+    timed = snap.has_status(Status.HIRED) & (snap.applied != MISSING_DAY) & (snap.hired != MISSING_DAY)
+    size = len(snap.department_labels)
+    days = np.bincount(snap.department[timed], weights=(snap.hired - snap.applied)[timed], minlength=size)
+    counts = np.bincount(snap.department[timed], minlength=size)
+    
+    # Calculate averages and find fastest/slowest
+    dept_performance = {name: float(days[code] / counts[code])
+                        for code, name in enumerate(snap.department_labels) if counts[code]}
+    
+    return {
+        'days_to_hire': dept_performance,
+        'fastest': min(dept_performance.items(), key=lambda x: x[1]) if dept_performance else None,
+        'slowest': max(dept_performance.items(), key=lambda x: x[1]) if dept_performance else None,
+    }
+
 def get_enhanced_department_insights() -> str:
     """Get department-specific interview efficiency and performance metrics"""
-    from collections import defaultdict
     
     try:
-        candidates = load_json_data("candidates.json")
-        jobs = load_json_data("jobs.json")
-        
-        # Create job lookup
-        job_lookup = {job['job_id']: job for job in jobs}
-        
-        # Department performance tracking
-        dept_metrics = defaultdict(lambda: {'total': 0, 'hired': 0, 'avg_time': 0, 'times': []})
-        
-        for candidate in candidates:
-            job_id = candidate.get('job_id', '1')
-            job = job_lookup.get(job_id, {})
-            department = job.get('department', 'Unknown')
-            
-            dept_metrics[department]['total'] += 1
-            
-            if candidate.get('status') == 'Hired':
-                dept_metrics[department]['hired'] += 1
-                
-                # Calculate time to hire
-                if candidate.get('applied_date') and candidate.get('hired_date'):
-                    try:
-                        applied = datetime.strptime(candidate['applied_date'], '%Y-%m-%d')
-                        hired = datetime.strptime(candidate['hired_date'], '%Y-%m-%d')
-                        days_to_hire = (hired - applied).days
-                        dept_metrics[department]['times'].append(days_to_hire)
-                    except:
-                        pass
-        
-        # Calculate averages and find fastest/slowest
-        dept_performance = {}
-        for dept, metrics in dept_metrics.items():
-            if metrics['times']:
-                avg_time = sum(metrics['times']) / len(metrics['times'])
-                dept_performance[dept] = avg_time
+        data = enhanced_department_data()
+        fastest_dept, slowest_dept = data['fastest'], data['slowest']
         
-        if dept_performance:
-            fastest_dept = min(dept_performance.items(), key=lambda x: x[1])
-            slowest_dept = max(dept_performance.items(), key=lambda x: x[1])
-            
-            return f"Department Interview Efficiency: Fastest: {fastest_dept[0]} ({fastest_dept[1]:.1f} days avg), Slowest: {slowest_dept[0]} ({slowest_dept[1]:.1f} days avg). Performance by dept: {dict(dept_performance)}"
+        if data['days_to_hire']:
+            return f"Department Interview Efficiency: Fastest: {fastest_dept[0]} ({fastest_dept[1]:.1f} days avg), Slowest: {slowest_dept[0]} ({slowest_dept[1]:.1f} days avg). Performance by dept: {dict(data['days_to_hire'])}"
         else:
             return "Department Interview Efficiency: Insufficient data for timing analysis"
     
     except Exception as e:
         return f"Error analyzing department insights: {str(e)}"
 
+def enhanced_hiring_predictions_data() -> Dict[str, Any]:
+    """Average time to hire and the projected time to hire 20 employees (None without history)"""
+    snap = analytics_snapshots.get()
+    hired = snap.has_status(Status.HIRED)
+    
+    # Calculate average time to hire
+    timed = hired & (snap.applied != MISSING_DAY) & (snap.hired != MISSING_DAY)
+    hiring_times = (snap.hired - snap.applied)[timed]
+    avg_days = float(hiring_times.mean()) if len(hiring_times) else None
+    
+    return {
+        'avg_days_to_hire': avg_days,
+        'avg_months_to_hire': avg_days / 30 if avg_days is not None else None,
+        'months_to_hire_20': 20 * avg_days / 30 if avg_days is not None else None,
+        'hired': int(hired.sum()),
+    }
+
 def get_enhanced_hiring_predictions() -> str:
     """Get predictive insights for future hiring needs and timelines"""
-    from collections import defaultdict
-    from datetime import timedelta
     
     try:
-        candidates = load_json_data("candidates.json")
-        jobs = load_json_data("jobs.json")
+        data = enhanced_hiring_predictions_data()
         
-        # Calculate average time to hire
-        hiring_times = []
-        for candidate in candidates:
-            if candidate.get('status') == 'Hired' and candidate.get('applied_date') and candidate.get('hired_date'):
-                try:
-                    applied = datetime.strptime(candidate['applied_date'], '%Y-%m-%d')
-                    hired = datetime.strptime(candidate['hired_date'], '%Y-%m-%d')
-                    days_to_hire = (hired - applied).days
-                    hiring_times.append(days_to_hire)
-                except:
-                    pass
-        
-        if hiring_times:
-            avg_days = sum(hiring_times) / len(hiring_times)
-            avg_months = avg_days / 30
-            
+        if data['avg_days_to_hire'] is not None:
             # Predict time to hire X employees
-            prediction_text = f"Hiring Predictions: Average time to hire: {avg_days:.1f} days ({avg_months:.1f} months). "
-            prediction_text += f"To hire 20 employees at current pace: {20 * avg_months:.1f} months. "
-            prediction_text += f"Current hiring velocity: {len([c for c in candidates if c.get('status') == 'Hired'])} hired total"
+            prediction_text = f"Hiring Predictions: Average time to hire: {data['avg_days_to_hire']:.1f} days ({data['avg_months_to_hire']:.1f} months). "
+            prediction_text += f"To hire 20 employees at current pace: {data['months_to_hire_20']:.1f} months. "
+            prediction_text += f"Current hiring velocity: {data['hired']} hired total"
             
             return prediction_text
         else:
@@ -932,69 +875,75 @@ def get_enhanced_hiring_predictions() -> str:
     except Exception as e:
         return f"Error generating hiring predictions: {str(e)}"
 
+def enhanced_top_performers_data() -> Dict[str, Any]:
+    """Hires and status updates per team member, with the top hirer"""
+    snap = analytics_snapshots.get()
+    
+    # Track performance by status updaters
+    size = len(snap.updater_labels)
+    updates = np.bincount(snap.updater, minlength=size)
+    hires = np.bincount(snap.updater[snap.has_status(Status.HIRED)], minlength=size)
+    updater_performance = {updater: {'hires': int(hires[code]), 'updates': int(updates[code])}
+                           for code, updater in enumerate(snap.updater_labels)}
+    
+    # Find top performer
+    top_performer = ("Unknown", 0)
+    for updater, metrics in updater_performance.items():
+        if metrics['hires'] > top_performer[1] and updater != 'System (CV Upload)':
+            top_performer = (updater, metrics['hires'])
+    
+    return {'performance': updater_performance, 'top_performer': top_performer}
+
 def get_enhanced_top_performers() -> str:
     """Get insights on top performing team members and peak hiring periods"""
-    from collections import defaultdict
     
     try:
-        candidates = load_json_data("candidates.json")
-        
-        # Track performance by status updaters
-        updater_performance = defaultdict(lambda: {'hires': 0, 'updates': 0})
-        
-        for candidate in candidates:
-            updater = candidate.get('status_updated_by', 'Unknown')
-            updater_performance[updater]['updates'] += 1
-            
-            if candidate.get('status') == 'Hired':
-                updater_performance[updater]['hires'] += 1
-        
-        # Find top performer
-        top_performer = ("Unknown", 0)
-        for updater, metrics in updater_performance.items():
-            if metrics['hires'] > top_performer[1] and updater != 'System (CV Upload)':
-                top_performer = (updater, metrics['hires'])
-        
-        return f"Top Performers: Top hirer: {top_performer[0]} ({top_performer[1]} successful hires). Performance breakdown: {dict(updater_performance)}"
+        data = enhanced_top_performers_data()
+        top_performer = data['top_performer']
+        return f"Top Performers: Top hirer: {top_performer[0]} ({top_performer[1]} successful hires). Performance breakdown: {dict(data['performance'])}"
     
     except Exception as e:
         return f"Error analyzing top performers: {str(e)}"
 
+def enhanced_salary_trends_data() -> Dict[str, Any]:
+    """Final salary statistics of hired candidates and their market positioning (empty without data)"""
+    from statistics import mean, median
+    
+    candidates = load_json_data("candidates.json")
+    
+    # Collect salary data for hired candidates
+    salaries = []
+    market_comparisons = []
+    
+    for candidate in candidates:
+        if candidate.get('status') == 'Hired' and candidate.get('final_salary'):
+            salaries.append(candidate['final_salary'])
+            
+            if candidate.get('market_comparison', {}).get('competitiveness'):
+                market_comparisons.append(candidate['market_comparison']['competitiveness'])
+    
+    if not salaries:
+        return {}
+    return {
+        'average': mean(salaries),
+        'median': median(salaries),
+        'min': min(salaries),
+        'max': max(salaries),
+        # Market competitiveness
+        'above_market': market_comparisons.count('Above Market'),
+        'at_market': market_comparisons.count('Market Rate'),
+        'below_market': market_comparisons.count('Below Market'),
+    }
+
 def get_enhanced_salary_trends() -> str:
     """Get comprehensive salary trend analysis with market positioning"""
-    from statistics import mean, median
     
     try:
-        candidates = load_json_data("candidates.json")
-        
-        # Collect salary data for hired candidates
-        salaries = []
-        market_comparisons = []
-        benefits = []
+        data = enhanced_salary_trends_data()
         
-        for candidate in candidates:
-            if candidate.get('status') == 'Hired' and candidate.get('final_salary'):
-                salaries.append(candidate['final_salary'])
-                
-                if candidate.get('benefits_package'):
-                    benefits.append(candidate['benefits_package'])
-                
-                if candidate.get('market_comparison', {}).get('competitiveness'):
-                    market_comparisons.append(candidate['market_comparison']['competitiveness'])
-        
-        if salaries:
-            avg_salary = mean(salaries)
-            median_salary = median(salaries)
-            min_salary = min(salaries)
-            max_salary = max(salaries)
-            
-            # Market competitiveness
-            above_market = market_comparisons.count('Above Market')
-            below_market = market_comparisons.count('Below Market')
-            at_market = market_comparisons.count('Market Rate')
-            
-            trend_text = f"Salary Trends: Average offered: ${avg_salary:,.0f}, Median: ${median_salary:,.0f}, Range: ${min_salary:,.0f}-${max_salary:,.0f}. "
-            trend_text += f"Market positioning: {above_market} above market, {at_market} at market, {below_market} below market rates"
+        if data:
+            trend_text = f"Salary Trends: Average offered: ${data['average']:,.0f}, Median: ${data['median']:,.0f}, Range: ${data['min']:,.0f}-${data['max']:,.0f}. "
+            trend_text += f"Market positioning: {data['above_market']} above market, {data['at_market']} at market, {data['below_market']} below market rates"
             
             return trend_text
         else:
@@ -1003,34 +952,41 @@ def get_enhanced_salary_trends() -> str:
     except Exception as e:
         return f"Error analyzing salary trends: {str(e)}"
 
+def enhanced_onboarding_data() -> Dict[str, Any]:
+    """Onboarding status counts of hired candidates and the share delayed"""
+    from collections import defaultdict
+    
+    candidates = load_json_data("candidates.json")
+    
+    # Onboarding status analysis
+    onboarding_status = defaultdict(int)
+    completion_delays = []
+    
+    for candidate in candidates:
+        if candidate.get('status') == 'Hired':
+            status = candidate.get('onboarding_status', 'Unknown')
+            onboarding_status[status] += 1
+            
+            # Check for delays
+            if status == 'Delayed':
+                completion_delays.append(candidate.get('name', 'Unknown'))
+    
+    # Identify bottlenecks
+    total_hired = sum(onboarding_status.values())
+    delayed_pct = (onboarding_status['Delayed'] / total_hired * 100) if total_hired > 0 else 0
+    
+    return {'status_counts': dict(onboarding_status), 'delayed_pct': delayed_pct, 'delayed': completion_delays}
+
 def get_enhanced_onboarding_insights() -> str:
     """Get detailed onboarding process analysis and bottleneck identification"""
-    from collections import defaultdict
     
     try:
-        candidates = load_json_data("candidates.json")
-        
-        # Onboarding status analysis
-        onboarding_status = defaultdict(int)
-        completion_delays = []
-        
-        for candidate in candidates:
-            if candidate.get('status') == 'Hired':
-                status = candidate.get('onboarding_status', 'Unknown')
-                onboarding_status[status] += 1
-                
-                # Check for delays
-                if status == 'Delayed':
-                    completion_delays.append(candidate.get('name', 'Unknown'))
+        data = enhanced_onboarding_data()
         
-        # Identify bottlenecks
-        total_hired = sum(onboarding_status.values())
-        delayed_pct = (onboarding_status['Delayed'] / total_hired * 100) if total_hired > 0 else 0
+        insights = f"Onboarding Insights: Status breakdown: {data['status_counts']}. "
+        insights += f"Delay rate: {data['delayed_pct']:.1f}%. "
         
-        insights = f"Onboarding Insights: Status breakdown: {dict(onboarding_status)}. "
-        insights += f"Delay rate: {delayed_pct:.1f}%. "
-        
-        if delayed_pct > 20:
+        if data['delayed_pct'] > 20:
             insights += "Bottleneck: High delay rate indicates process inefficiencies"
         else:
             insights += "Onboarding process performing well"
@@ -1040,97 +996,116 @@ def get_enhanced_onboarding_insights() -> str:
     except Exception as e:
         return f"Error analyzing onboarding insights: {str(e)}"
 
+def enhanced_probation_data() -> Dict[str, Any]:
+    """Probation outcomes per department, with the department that has the lowest pass rate"""
+    from collections import defaultdict
+    
+    candidates = load_json_data("candidates.json")
+    jobs = load_json_data("jobs.json")
+    
+    # Create job lookup
+    job_lookup = {job['job_id']: job for job in jobs}
+    
+    # Probation analysis by department
+    dept_probation = defaultdict(lambda: {'total': 0, 'passed': 0, 'under_review': 0, 'ratings': []})
+    
+    for candidate in candidates:
+        if candidate.get('status') == 'Hired' and candidate.get('probation_status'):
+            job_id = candidate.get('job_id', '1')
+            job = job_lookup.get(job_id, {})
+            department = job.get('department', 'Unknown')
+            
+            probation_status = candidate.get('probation_status')
+            performance_rating = candidate.get('performance_rating')
+            
+            dept_probation[department]['total'] += 1
+            
+            if probation_status == 'Passed':
+                dept_probation[department]['passed'] += 1
+            elif probation_status == 'Under Review':
+                dept_probation[department]['under_review'] += 1
+            
+            if performance_rating:
+                dept_probation[department]['ratings'].append(performance_rating)
+    
+    # Find department needing improvement
+    worst_dept = None
+    worst_pass_rate = 100
+    
+    for dept, metrics in dept_probation.items():
+        if metrics['total'] > 0:
+            pass_rate = (metrics['passed'] / metrics['total']) * 100
+            if pass_rate < worst_pass_rate:
+                worst_pass_rate = pass_rate
+                worst_dept = dept
+    
+    return {'departments': dict(dept_probation), 'worst_department': worst_dept, 'worst_pass_rate': worst_pass_rate}
+
 def get_enhanced_probation_insights() -> str:
     """Get probation period performance analysis and improvement areas"""
-    from collections import defaultdict
     
     try:
-        candidates = load_json_data("candidates.json")
-        jobs = load_json_data("jobs.json")
+        data = enhanced_probation_data()
         
-        # Create job lookup
-        job_lookup = {job['job_id']: job for job in jobs}
-        
-        # Probation analysis by department
-        dept_probation = defaultdict(lambda: {'total': 0, 'passed': 0, 'under_review': 0, 'ratings': []})
-        
-        for candidate in candidates:
-            if candidate.get('status') == 'Hired' and candidate.get('probation_status'):
-                job_id = candidate.get('job_id', '1')
-                job = job_lookup.get(job_id, {})
-                department = job.get('department', 'Unknown')
-                
-                probation_status = candidate.get('probation_status')
-                performance_rating = candidate.get('performance_rating')
-                
-                dept_probation[department]['total'] += 1
-                
-                if probation_status == 'Passed':
-                    dept_probation[department]['passed'] += 1
-                elif probation_status == 'Under Review':
-                    dept_probation[department]['under_review'] += 1
-                
-                if performance_rating:
-                    dept_probation[department]['ratings'].append(performance_rating)
-        
-        # Find department needing improvement
-        worst_dept = None
-        worst_pass_rate = 100
-        
-        for dept, metrics in dept_probation.items():
-            if metrics['total'] > 0:
-                pass_rate = (metrics['passed'] / metrics['total']) * 100
-                if pass_rate < worst_pass_rate:
-                    worst_pass_rate = pass_rate
-                    worst_dept = dept
-        
-        insights = f"Probation Insights: Department performance: {dict(dept_probation)}. "
-        if worst_dept:
-            insights += f"Needs improvement: {worst_dept} (pass rate: {worst_pass_rate:.1f}%)"
+        insights = f"Probation Insights: Department performance: {data['departments']}. "
+        if data['worst_department']:
+            insights += f"Needs improvement: {data['worst_department']} (pass rate: {data['worst_pass_rate']:.1f}%)"
         
         return insights
     
     except Exception as e:
         return f"Error analyzing probation insights: {str(e)}"
 
+def enhanced_market_salary_data() -> Dict[str, Any]:
+    """Our offers against market averages for hired candidates (empty without data)"""
+    from statistics import mean
+    
+    candidates = load_json_data("candidates.json")
+    
+    # Analyze market positioning
+    our_salaries = []
+    market_salaries = []
+    competitiveness_breakdown = {'Above Market': 0, 'Market Rate': 0, 'Below Market': 0}
+    
+    for candidate in candidates:
+        if candidate.get('status') == 'Hired' and candidate.get('market_comparison'):
+            market_data = candidate['market_comparison']
+            
+            our_salaries.append(market_data.get('our_offer', 0))
+            market_salaries.append(market_data.get('market_average', 0))
+            
+            competitiveness = market_data.get('competitiveness', 'Unknown')
+            if competitiveness in competitiveness_breakdown:
+                competitiveness_breakdown[competitiveness] += 1
+    
+    if not (our_salaries and market_salaries):
+        return {}
+    our_avg = mean(our_salaries)
+    market_avg = mean(market_salaries)
+    
+    # Overall competitiveness
+    total_positions = sum(competitiveness_breakdown.values())
+    return {
+        'our_average': our_avg,
+        'market_average': market_avg,
+        'difference_pct': ((our_avg - market_avg) / market_avg) * 100,
+        'breakdown': competitiveness_breakdown,
+        'above_market_pct': (competitiveness_breakdown['Above Market'] / total_positions) * 100,
+    }
+
 def get_enhanced_market_salary_comparison() -> str:
     """Get comprehensive market salary comparison with competitiveness analysis"""
-    from statistics import mean
     
     try:
-        candidates = load_json_data("candidates.json")
+        data = enhanced_market_salary_data()
         
-        # Analyze market positioning
-        our_salaries = []
-        market_salaries = []
-        competitiveness_breakdown = {'Above Market': 0, 'Market Rate': 0, 'Below Market': 0}
-        
-        for candidate in candidates:
-            if candidate.get('status') == 'Hired' and candidate.get('market_comparison'):
-                market_data = candidate['market_comparison']
-                
-                our_salaries.append(market_data.get('our_offer', 0))
-                market_salaries.append(market_data.get('market_average', 0))
-                
-                competitiveness = market_data.get('competitiveness', 'Unknown')
-                if competitiveness in competitiveness_breakdown:
-                    competitiveness_breakdown[competitiveness] += 1
-        
-        if our_salaries and market_salaries:
-            our_avg = mean(our_salaries)
-            market_avg = mean(market_salaries)
-            difference = ((our_avg - market_avg) / market_avg) * 100
-            
-            # Overall competitiveness
-            total_positions = sum(competitiveness_breakdown.values())
-            above_market_pct = (competitiveness_breakdown['Above Market'] / total_positions) * 100
+        if data:
+            comparison_text = f"Market Salary Comparison: Our average: ${data['our_average']:,.0f}, Market average: ${data['market_average']:,.0f} "
+            comparison_text += f"({data['difference_pct']:+.1f}% vs market). Breakdown: {data['breakdown']}. "
             
-            comparison_text = f"Market Salary Comparison: Our average: ${our_avg:,.0f}, Market average: ${market_avg:,.0f} "
-            comparison_text += f"({difference:+.1f}% vs market). Breakdown: {competitiveness_breakdown}. "
-            
-            if above_market_pct > 50:
+            if data['above_market_pct'] > 50:
                 comparison_text += "Our salaries are competitive with market rates"
-            elif above_market_pct < 30:
+            elif data['above_market_pct'] < 30:
                 comparison_text += "Our salaries are below market - may impact talent acquisition"
             else:
                 comparison_text += "Mixed competitiveness - some positions above/below market"
@@ -1142,6 +1117,19 @@ def get_enhanced_market_salary_comparison() -> str:
     except Exception as e:
         return f"Error analyzing market salary comparison: {str(e)}"
 
+# Data behind each get_enhanced_* tool, by analytics metric (served by /api/analytics/<metric>/series)
+ENHANCED_DATA = {
+    'hiring_success_rate': enhanced_hiring_success_rate_data,
+    'monthly_hiring': enhanced_monthly_data,
+    'department_efficiency': enhanced_department_data,
+    'hiring_prediction': enhanced_hiring_predictions_data,
+    'top_performers': enhanced_top_performers_data,
+    'salary_trends': enhanced_salary_trends_data,
+    'onboarding': enhanced_onboarding_data,
+    'probation': enhanced_probation_data,
+    'market_salary': enhanced_market_salary_data,
+}
+
 def comprehensive_hiring_analysis() -> str:
     """Get complete hiring analysis including all metrics, visualizations, and market insights"""
     try:
@@ -1177,43 +1165,32 @@ def comprehensive_hiring_analysis() -> str:
     except Exception as e:
         return f"Error generating comprehensive analysis: {str(e)}"
 
+def get_database_digest() -> str:
+    """Compact digest of the whole HR database: totals, jobs and departments with applicants per status, one line per candidate and pending notifications. Use for system-wide questions that DB_CONTEXT does not cover."""
+    from db_digest import db_digest
+    return db_digest.text()
+
 def create_hiring_trend_chart() -> str:
     """Create hiring trend visualization"""
-    import matplotlib.pyplot as plt
     from collections import defaultdict
     from datetime import timedelta
     
     try:
-        candidates = load_json_data("candidates.json")
-        
         # Monthly hiring data
         monthly_data = defaultdict(int)
         
-        for candidate in candidates:
-            if candidate.get('status') == 'Hired' and candidate.get('hired_date'):
-                try:
-                    hired_date = datetime.strptime(candidate['hired_date'], '%Y-%m-%d')
-                    month_key = hired_date.strftime('%Y-%m')
-                    monthly_data[month_key] += 1
-                except:
-                    pass
+        for candidate in record_models.candidates():
+            if candidate.status == Status.HIRED and candidate.hired:
+                monthly_data[candidate.hired.isoformat()[:7]] += 1
         
         if monthly_data:
             months = sorted(monthly_data.keys())
             counts = [monthly_data[month] for month in months]
             
-            plt.figure(figsize=(12, 6))
-            plt.plot(months, counts, marker='o', linewidth=2, markersize=8)
-            plt.title('Monthly Hiring Trends', fontsize=16, fontweight='bold')
-            plt.xlabel('Month', fontsize=12)
-            plt.ylabel('Number of Hires', fontsize=12)
-            plt.xticks(rotation=45)
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
-            
-            filepath = 'db/monthly_hiring_trends.png'
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
-            plt.close()
+            chart = chart_service.render('hiring_trend', {'months': months, 'counts': counts}, (12, 6))
+            if chart is None:
+                return "Hiring trend chart could not be rendered right now, please try again"
+            filepath = _chart_link(chart)
             
             return f"Monthly hiring trends chart created: ![Monthly Hiring Trends]({filepath})"
         else: